@@ -0,0 +1,40 @@
+"""Сравнение кодеков JSON на дампе выдачи hh.ru из 2000 вакансий.
+
+Запуск из корня проекта: python -m benchmarks.bench_codec [количество] [повторов]
+"""
+
+import sys
+import timeit
+
+from benchmarks.bench_vacancy_memory import make_raw_items
+from src.codec import CODECS, make_codec
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    items = make_raw_items(count)
+    # Одна страница выдачи в формате ответа api.hh.ru
+    page = {"items": items, "found": count, "pages": 1, "page": 0, "per_page": count}
+
+    print(f"Вакансий: {count}, повторов: {repeat}")
+    for name in CODECS:
+        try:
+            codec = make_codec(name)
+        except ValueError as e:
+            print(f"{name:8}: {e}")
+            continue
+        raw = codec.dumps(page)
+        pretty = codec.dumps(page, pretty=True)
+        loads = min(timeit.repeat(lambda: codec.loads(raw), number=1, repeat=repeat))
+        dumps = min(timeit.repeat(lambda: codec.dumps(page), number=1, repeat=repeat))
+        dumps_pretty = min(timeit.repeat(lambda: codec.dumps(page, pretty=True), number=1, repeat=repeat))
+        print(
+            f"{name:8}: loads {loads * 1000:7.2f} мс, dumps {dumps * 1000:7.2f} мс, "
+            f"dumps с отступами {dumps_pretty * 1000:7.2f} мс, "
+            f"размер {len(raw) / 1024:.0f} / {len(pretty) / 1024:.0f} КБ"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Время создания 100 тысяч вакансий: по одной через конструктор и пачкой через Vacancy.from_records.
+
+Для сравнения показан и прежний путь VacancyMixin, печатавший repr каждого объекта (вывод идет в os.devnull,
+в терминал он еще медленнее).
+
+Запуск из корня проекта: python -m benchmarks.bench_vacancy_build [количество]
+"""
+
+import contextlib
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from benchmarks.bench_vacancy_memory import make_raw_items
+from src.vacancy import Vacancy
+
+
+def make_records(count: int) -> List[Dict[str, Any]]:
+    """Записи в формате хранилища (Vacancy.to_dict)."""
+    return [vacancy.to_dict() for vacancy in Vacancy.cast_to_object_iter(make_raw_items(count))]
+
+
+def build_one_by_one(records: List[Dict[str, Any]]) -> list:
+    return [Vacancy(**record) for record in records]
+
+
+def build_with_print(records: List[Dict[str, Any]]) -> list:
+    """Прежнее поведение: print(repr(self)) на каждый объект."""
+    vacancies = []
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        for record in records:
+            vacancy = Vacancy(**record)
+            print(
+                f"{vacancy.__class__.__name__}({vacancy.id}, {vacancy.name}, {vacancy.area}, {vacancy.salary}, "
+                f"{vacancy.description}, {vacancy.snippet})"
+            )
+            vacancies.append(vacancy)
+    return vacancies
+
+
+def timed(build: Callable[[List[Dict[str, Any]]], list], records: List[Dict[str, Any]], repeat: int = 3) -> float:
+    """Лучшее время из repeat запусков."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = build(records)
+        best = min(best, time.perf_counter() - started)
+        del result
+    return best
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    records = make_records(count)
+    print(f"Вакансий: {count}")
+    for title, build in (
+        ("По одной + print(repr)", build_with_print),
+        ("По одной (Vacancy(**record))", build_one_by_one),
+        ("Пачкой (Vacancy.from_records)", Vacancy.from_records),
+    ):
+        print(f"{title:32}: {timed(build, records):6.3f} с")
+
+
+if __name__ == "__main__":
+    main()
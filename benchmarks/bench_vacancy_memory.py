@@ -0,0 +1,77 @@
+"""Сравнение памяти на одну вакансию: Vacancy и CompactVacancy.
+
+Запуск из корня проекта: python -m benchmarks.bench_vacancy_memory [количество]
+"""
+
+import gc
+import random
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from src.compact_vacancy import CompactVacancy
+from src.vacancy import Vacancy
+
+AREAS = [("1", "Москва"), ("2", "Санкт-Петербург"), ("4", "Новосибирск"), ("88", "Казань"), ("160", "Алматы")]
+CURRENCIES = ["RUR", "RUR", "RUR", "USD", "EUR", "KZT"]
+
+
+def make_raw_items(count: int) -> List[Dict[str, Any]]:
+    """Вакансии в формате ответа api.hh.ru; строки регионов и валют создаются заново, как при разборе JSON."""
+    rnd = random.Random(42)
+    items = []
+    for i in range(count):
+        area_id, area_name = rnd.choice(AREAS)
+        salary_from = rnd.choice([None, rnd.randrange(30_000, 300_000, 5_000)])
+        items.append(
+            {
+                "id": str(90_000_000 + i),
+                "name": f"Python разработчик {i % 97}",
+                "area": {
+                    "id": "".join(area_id),
+                    "name": "".join(area_name),
+                    "url": f"https://api.hh.ru/areas/{area_id}",
+                },
+                "alternate_url": f"https://hh.ru/vacancy/{90_000_000 + i}",
+                "salary": {
+                    "from": salary_from,
+                    "to": rnd.choice([None, (salary_from or 50_000) + 50_000]),
+                    "currency": "".join(rnd.choice(CURRENCIES)),
+                    "gross": False,
+                },
+                "snippet": {
+                    "requirement": "Опыт коммерческой разработки на <highlighttext>Python</highlighttext> от 3 лет.",
+                    "responsibility": "Разработка и поддержка сервисов, участие в код-ревью.",
+                },
+            }
+        )
+    return items
+
+
+def measure(factory: Callable[[List[Dict[str, Any]]], list], count: int) -> float:
+    """Байт на объект, которые остаются занятыми после того, как исходные словари hh.ru освобождены."""
+    gc.collect()
+    tracemalloc.start()
+    items = make_raw_items(count)
+    objects = factory(items)
+    del items
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = retained / len(objects)
+    del objects
+    return result
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    regular = measure(Vacancy.cast_to_object_list, count)
+    compact = measure(CompactVacancy.cast_to_object_list, count)
+    print(f"Вакансий: {count}")
+    print(f"Vacancy:        {regular:8.1f} байт на вакансию")
+    print(f"CompactVacancy: {compact:8.1f} байт на вакансию")
+    print(f"Экономия:       {100 * (1 - compact / regular):8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,21 @@
 import sys
 
-from src.hh_api import HeadHunterAPI
+from src.hh_api import HeadHunterAPI, PageFetchError
+from src.http_cache import ResponseCache
 from src.json_saver import JSONSaver
+from src.projection import STORE_FIELDS
+from src.rate_limit import TokenBucket
 from src.vacancy import Vacancy
 
 
 def user_interaction() -> None:
     """Взаимодействие с пользователем для управления вакансиями."""
-    hh_api = HeadHunterAPI()
-    json_saver = JSONSaver("vacancies.json")
+    # Повторный поиск в течение 10 минут берет страницы из кэша, позже - перепроверяет их на сервере
+    cache = ResponseCache(HeadHunterAPI.get_data_file_path("http_cache"), ttl=600)
+    # Не больше 10 запросов в секунду на все потоки, при 429 и 5xx запрос повторяется с паузой
+    hh_api = HeadHunterAPI(max_workers=5, cache=cache, rate_limiter=TokenBucket(rate=10))
+    # В файл пишутся только поля, по которым работает меню, без отступов
+    json_saver = JSONSaver("vacancies.json", fields=STORE_FIELDS, compact=True)
 
     # Загружаем все вакансии из файла перед началом взаимодействия с пользователем
     vacancies = json_saver.load_vacancies()
@@ -27,13 +34,27 @@ def user_interaction() -> None:
 
         if option == "1":
             keyword = input("Введите ключевое слово для поиска: ")
-            hh_vacancies = hh_api.get_vacancies(keyword)
-            vacancies_list = Vacancy.cast_to_object_list(hh_vacancies)
-            json_saver.add_vacancies(vacancies_list)
-            for vacancy in vacancies_list:
-                # json_saver.add_vacancy(vacancy)
-                print(vacancy)
-            print(f"Добавлено {len(vacancies_list)} вакансий по запросу '{keyword}'.")
+            # Вакансии выводятся и сохраняются постранично, по мере получения
+            vacancies_stream = Vacancy.cast_to_object_iter(hh_api.iter_vacancies(keyword), fields=STORE_FIELDS)
+            try:
+                for vacancy in json_saver.add_vacancies_stream(vacancies_stream):
+                    print(vacancy)
+            except PageFetchError as e:
+                print(f"Выгрузка прервана, результат неполный: {e}")
+            report = json_saver.last_report
+            print(
+                f"По запросу '{keyword}' добавлено {report['inserted']} вакансий, обновлено {report['updated']}, "
+                f"пропущено дубликатов {report['skipped']}."
+            )
+            metrics = hh_api.get_metrics()
+            print(
+                f"Запросов к hh.ru: {metrics['requests']}, получено байт: {metrics['bytes_received']}, "
+                f"соединений открыто: {metrics['connections_opened']}, "
+                f"переиспользовано: {metrics['connections_reused']}, "
+                f"страниц из кэша: {metrics['cache_hits']}, не изменилось (304): {metrics['not_modified']}, "
+                f"ответов 429: {metrics['throttled']}, повторов: {metrics['retried']}, "
+                f"не получено: {metrics['failed']}."
+            )
             sys.exit()
 
         elif option == "2":
@@ -52,21 +73,8 @@ def user_interaction() -> None:
                 print("Нет сохраненных вакансий.")
                 continue
 
-            # Определяем функцию для извлечения зарплаты из объекта вакансии
-            def get_salary(vacancy: Vacancy) -> int:
-                salary = vacancy._salary
-                if isinstance(salary, dict):
-                    # Если salary - это словарь, извлекаем значение из поля 'from' и 'to'
-                    salary_from_ = salary.get("from", 0) or 0
-                    salary_to_ = salary.get("to", 0) or 0
-                    return max(salary_from_, salary_to_) # Используем максимальное значение из 'from' и 'to'      if salary_from_ is not None else 0
-                elif isinstance(salary, (int, float)):
-                    # Если salary - это уже число
-                    return salary
-                return 0
-
-            # Сортировка вакансий по убыванию зарплаты
-            top_vacancies = sorted(vacancies, key=get_salary, reverse=True)[:n]
+            # Топ по верхней границе зарплаты из отсортированного индекса хранилища
+            top_vacancies = json_saver.get_top_vacancies(n, rank="max")
             for vacancy in top_vacancies:
                 json_saver.add_vacancy(vacancy)
                 print(vacancy)
@@ -77,28 +85,12 @@ def user_interaction() -> None:
             # Загрузка вакансий с hh.ru
             # hh_vacancies = hh_api.get_vacancies(keyword)
             # vacancies = Vacancy.cast_to_object_list(hh_vacancies)
-            # Загрузка вакансий из файла
-            vacancies = json_saver.load_vacancies()
-            if not vacancies:
+            if not json_saver.load_vacancies():
                 print("Нет сохраненных вакансий.")
                 continue
-            filtered_vacancies = []
-            for vacancy in vacancies:
-
-                # Собираем все текстовые данные для поиска
-                searchable_text = ""
-                if vacancy.description:
-                    searchable_text += vacancy.description.lower()
-                if vacancy.snippet:
-                    snippet = vacancy.snippet
-                    if "requirement" in snippet and snippet["requirement"]:
-                        searchable_text += " " + snippet["requirement"].lower()
-                    if "responsibility" in snippet and snippet["responsibility"]:
-                        searchable_text += " " + snippet["responsibility"].lower()
-
-                # Проверяем наличие ключевого слова
-                if keyword in searchable_text:
-                    filtered_vacancies.append(vacancy)
+            # Поиск по полнотекстовому индексу хранилища, каждое слово ищется как начало слова
+            query = " ".join(word if word.endswith("*") else word + "*" for word in keyword.split())
+            filtered_vacancies = json_saver.search_vacancies(query)
             if filtered_vacancies:
                 for vacancy in filtered_vacancies:
                     json_saver.add_vacancy(vacancy)  # добавила, проверить работу
@@ -113,12 +105,8 @@ def user_interaction() -> None:
             salary_to = int(input("до: "))
             # hh_vacancies = hh_api.get_vacancies("")
             # vacancies_list = Vacancy.cast_to_object_list(hh_vacancies)
-            vacancies_list = json_saver.load_vacancies()
-            filtered_vacancies = [
-                vacancy
-                for vacancy in vacancies_list
-                if isinstance(vacancy.salary, int) and salary_from <= vacancy.salary <= salary_to
-            ]
+            # Индекс диапазонов учитывает и одно число, и вилку (от, до)
+            filtered_vacancies = json_saver.get_vacancies_by_salary(salary_from, salary_to, mode="contains")
 
             if filtered_vacancies:
                 for vacancy in filtered_vacancies:
@@ -130,8 +118,7 @@ def user_interaction() -> None:
 
         elif option == "5":
             vacancy_id = input("Введите ID вакансии для удаления: ")
-            vacancies = json_saver.load_vacancies()
-            vacancy_to_delete = next((vacancy for vacancy in vacancies if vacancy.id == vacancy_id), None)
+            vacancy_to_delete = json_saver.get_vacancy(vacancy_id)
             if vacancy_to_delete:
                 json_saver.delete_vacancy(vacancy_to_delete)
                 print(f"Вакансия с ID {vacancy_id} удалена.")
@@ -141,8 +128,7 @@ def user_interaction() -> None:
 
         elif option == "6":
             vacancy_id = input("Введите ID вакансии для добавления: ")
-            vacancies = json_saver.load_vacancies()
-            vacancy_to_add = next((vacancy for vacancy in vacancies if vacancy.id == vacancy_id), None)
+            vacancy_to_add = json_saver.get_vacancy(vacancy_id)
             if vacancy_to_add:
                 json_saver.add_vacancy(vacancy_to_add)
                 print(f"Вакансия с ID {vacancy_id} добавлена.")
@@ -0,0 +1,170 @@
+import argparse
+import logging
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from src.api import JobAPI
+from src.json_saver import JSONSaver
+from src.projection import STORE_FIELDS
+from src.providers import make_provider
+from src.vacancy import Vacancy
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_url(url: str) -> str:
+    """URL для сравнения: без схемы, www, параметров и завершающего слэша, в нижнем регистре; "" - не URL."""
+    parts = urlsplit(url.strip().lower())
+    if not parts.netloc:
+        return ""
+    host = parts.netloc[4:] if parts.netloc.startswith("www.") else parts.netloc
+    return host + parts.path.rstrip("/")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Название или работодатель для сравнения: нижний регистр, ё как е, только буквы и цифры через пробел."""
+    return " ".join(re.findall(r"\w+", (text or "").lower().replace("ё", "е")))
+
+
+class Aggregator:
+    """
+    Поиск по нескольким источникам вакансий (JobAPI) одновременно.
+
+    Запрос отправляется всем источникам параллельно, каждому в своем потоке, поэтому общее время определяется
+    самым медленным источником, а не суммой. Записи каждого источника приводятся к Vacancy его методом
+    to_vacancy (в дополнительном поле source - имя источника) и отдаются общим потоком по мере готовности
+    источников. Повторно опубликованная вакансия пропускается: совпадение по URL или по названию вместе
+    с работодателем (без учета регистра и знаков препинания); остается версия источника, ответившего первым.
+
+    Ошибка или таймаут одного источника не прерывает поиск: они записываются в stats, остальные источники
+    обрабатываются как обычно. Некорректная запись источника тоже пропускается (stats["invalid"], в журнал).
+    """
+
+    def __init__(self, providers: Dict[str, JobAPI], timeout: Optional[float] = None) -> None:
+        if not providers:
+            raise ValueError("Нужен хотя бы один источник вакансий")
+        self.providers = providers
+        self.timeout = timeout
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def _dedup_keys(vacancy: Vacancy) -> List[Tuple[str, ...]]:
+        keys: List[Tuple[str, ...]] = []
+        url = normalize_url(vacancy.url)
+        if url:
+            keys.append(("url", url))
+        employer = normalize_text(vacancy.kwargs.get("employer"))
+        if employer:
+            keys.append(("title", normalize_text(vacancy.name), employer))
+        return keys
+
+    @staticmethod
+    def _fetch(provider: JobAPI, keyword: str) -> Tuple[List[Any], float]:
+        started = time.perf_counter()
+        items: List[Any] = list(provider.get_vacancies(keyword) or [])
+        return items, time.perf_counter() - started
+
+    def _merge(self, name: str, items: List[Any], seen: Set[Tuple[str, ...]]) -> Iterator[Vacancy]:
+        provider = self.providers[name]
+        stats = self.stats[name]
+        stats["found"] = len(items)
+        for item in items:
+            try:
+                vacancy = provider.to_vacancy(item)
+                vacancy.kwargs["source"] = name
+                keys = self._dedup_keys(vacancy)
+            except Exception as e:
+                # Запись не в формате источника (нет полей, другие типы) пропускается, остальные обрабатываются
+                logger.warning("Источник %s: запись пропущена - %r", name, e)
+                stats["invalid"] += 1
+                continue
+            if any(key in seen for key in keys):
+                stats["duplicates"] += 1
+                continue
+            seen.update(keys)
+            stats["unique"] += 1
+            yield vacancy
+
+    def iter_search(self, keyword: str) -> Iterator[Vacancy]:
+        """Вакансии всех источников без повторов, по мере ответа источников."""
+        self.stats = {
+            name: {"found": 0, "unique": 0, "duplicates": 0, "invalid": 0, "seconds": None, "error": None}
+            for name in self.providers
+        }
+        seen: Set[Tuple[str, ...]] = set()
+        deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+        executor = ThreadPoolExecutor(max_workers=len(self.providers))
+        try:
+            pending: Dict[Future, str] = {
+                executor.submit(self._fetch, provider, keyword): name for name, provider in self.providers.items()
+            }
+            while pending:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                if not done:
+                    for name in pending.values():
+                        self.stats[name]["error"] = f"нет ответа за {self.timeout} с"
+                    return
+                for future in done:
+                    name = pending.pop(future)
+                    try:
+                        items, seconds = future.result()
+                    except Exception as e:
+                        self.stats[name]["error"] = str(e)
+                        continue
+                    self.stats[name]["seconds"] = round(seconds, 3)
+                    yield from self._merge(name, items, seen)
+        finally:
+            # Не ждем зависшие источники: их потоки завершатся сами, результат уже не нужен
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def search(self, keyword: str) -> List[Vacancy]:
+        return list(self.iter_search(keyword))
+
+    @staticmethod
+    def format_stats(name: str, stats: Dict[str, Any]) -> str:
+        if stats["error"] is not None:
+            return f"{name}: ошибка - {stats['error']}"
+        return (
+            f"{name}: найдено {stats['found']}, новых {stats['unique']}, повторов {stats['duplicates']}, "
+            f"{stats['seconds']:.2f} с"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Поиск вакансий сразу в нескольких источниках")
+    parser.add_argument("keyword", help="ключевое слово")
+    parser.add_argument(
+        "--provider",
+        action="append",
+        dest="providers",
+        help="источник: hh, superjob или file:путь к JSON файлу (можно несколько раз; по умолчанию hh)",
+    )
+    parser.add_argument("--store", default="vacancies.json", help="файл хранилища в data/")
+    parser.add_argument("--timeout", type=float, help="предельное время ожидания источников, с")
+    args = parser.parse_args(argv)
+
+    aggregator = Aggregator({spec: make_provider(spec) for spec in args.providers or ["hh"]}, timeout=args.timeout)
+    saver = JSONSaver(args.store, fields=STORE_FIELDS, compact=True)
+    started = time.perf_counter()
+    try:
+        for _ in saver.add_vacancies_stream(aggregator.iter_search(args.keyword)):
+            pass
+    finally:
+        for provider in aggregator.providers.values():
+            if hasattr(provider, "close"):
+                provider.close()
+    for name, stats in aggregator.stats.items():
+        print(aggregator.format_stats(name, stats))
+    report = saver.last_report
+    print(
+        f"Всего {time.perf_counter() - started:.2f} с. Хранилище: добавлено {report['inserted']}, "
+        f"обновлено {report['updated']}, без изменений {report['skipped']}."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,16 @@
 from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+from src.vacancy import Vacancy
 
 
 class JobAPI(ABC):
     @abstractmethod
-    def get_vacancies(self, keyword: str) -> None:
-        pass
+    def get_vacancies(self, keyword: str) -> List[Any]:
+        """Записи выдачи источника по ключевому слову (их разбирает to_vacancy)."""
+
+    def to_vacancy(self, item: Dict[str, Any]) -> Vacancy:
+        """Вакансия из записи выдачи (по умолчанию в формате hh.ru); работодатель - в поле employer."""
+        vacancy = next(Vacancy.cast_to_object_iter([item]))
+        vacancy.kwargs["employer"] = (item.get("employer") or {}).get("name")
+        return vacancy
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+import httpx
+
+from src.codec import JSONCodec, get_codec
+from src.hh_api import PageFetchError, check_status, count_pages
+from src.rate_limit import RetryPolicy, TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHeadHunterAPI:
+    """
+    Асинхронная выгрузка вакансий с hh.ru по api на asyncio и httpx.AsyncClient.
+
+    Все запросы клиента идут через один пул соединений, а одновременно выполняется не больше
+    max_concurrency запросов страниц - и в одном поиске, и во всех поисках, запущенных на клиенте
+    параллельно (search_many, asyncio.gather). Страницы поиска запрашиваются задачами и отдаются
+    в исходном порядке; при прерывании выгрузки (отмена, таймаут, закрытие итератора) незавершенные
+    задачи отменяются. Повторы при 429, 5xx и сбоях соединения - как у HeadHunterAPI; страница, не полученная
+    после всех повторов, прерывает выгрузку исключением PageFetchError. Так же, как у HeadHunterAPI, ошибкой
+    считается и окончательный отказ (например, 403) на странице, которая по pages/found есть в выдаче.
+
+    Методы выгрузки - корутины, поэтому клиент не наследует синхронный интерфейс JobAPI.
+    """
+
+    MAX_PAGES = 1000
+    PER_PAGE = 100
+
+    def __init__(
+        self,
+        max_concurrency: int = 5,
+        url: str = "https://api.hh.ru/vacancies",
+        timeout: float = 10.0,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry: Optional[RetryPolicy] = None,
+        codec: Optional[JSONCodec] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        """Определение ресурса и параметров для api.
+
+        max_concurrency - сколько страниц можно запрашивать одновременно на весь клиент.
+        timeout - таймаут одного запроса (соединение, чтение, запись), с.
+        rate_limiter - ограничитель частоты; ожидание токена не блокирует цикл событий.
+        retry - повтор запросов при 429, 5xx и сбоях соединения; по умолчанию RetryPolicy().
+        codec - разбор ответов JSON; по умолчанию общий кодек get_codec().
+        transport - транспорт httpx (для тестов), по умолчанию сетевой.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency должен быть не меньше 1")
+        self.__url = url
+        self.__params = {"text": "", "page": 0, "per_page": self.PER_PAGE}
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.codec = codec
+        self.__client = httpx.AsyncClient(
+            headers={"User-Agent": "HH-User-Agent"},
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+            transport=transport,
+        )
+        self.__semaphore = asyncio.Semaphore(max_concurrency)
+        self.__metrics = {"requests": 0, "bytes_received": 0, "throttled": 0, "retried": 0, "failed": 0}
+        self.__rate_limit_wait = 0.0
+        self.__in_flight = 0
+        self.__max_in_flight = 0
+
+    async def close(self) -> None:
+        """Закрывает клиент и его соединения"""
+        await self.__client.aclose()
+
+    async def __aenter__(self) -> "AsyncHeadHunterAPI":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Статистика запросов: отправлено, получено байт, ответов 429, повторов, запросов без успеха после всех
+        повторов, секунд ожидания в ограничителе частоты и наибольшее число одновременных запросов"""
+        return {
+            **self.__metrics,
+            "rate_limit_wait": round(self.__rate_limit_wait, 3),
+            "max_in_flight": self.__max_in_flight,
+        }
+
+    async def _get(self, params: Dict[str, Any]) -> httpx.Response:
+        """GET запрос к api с ограничением частоты и числа одновременных запросов и повторами"""
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.__rate_limit_wait += await self.rate_limiter.acquire_async()
+            try:
+                async with self.__semaphore:
+                    self.__in_flight += 1
+                    self.__max_in_flight = max(self.__max_in_flight, self.__in_flight)
+                    try:
+                        response = await self.__client.get(self.__url, params=params)
+                    finally:
+                        self.__in_flight -= 1
+            except httpx.TransportError:
+                if attempt >= self.retry.max_retries:
+                    self.__metrics["failed"] += 1
+                    raise
+                await self._wait_before_retry(attempt)
+                attempt += 1
+                continue
+
+            self.__metrics["requests"] += 1
+            self.__metrics["bytes_received"] += len(response.content)
+            if response.status_code == 429:
+                self.__metrics["throttled"] += 1
+            if self.retry.should_retry(response.status_code, attempt):
+                await self._wait_before_retry(attempt, response)
+                attempt += 1
+                continue
+            if response.status_code in self.retry.statuses:
+                self.__metrics["failed"] += 1
+                error = PageFetchError(params.get("page"), response.status_code, attempt + 1)
+                logger.warning("%s", error)
+                raise error
+            return response
+
+    async def _wait_before_retry(self, attempt: int, response: Optional[httpx.Response] = None) -> None:
+        """Пауза перед повтором; ответ 429 приостанавливает общий ограничитель"""
+        self.__metrics["retried"] += 1
+        if response is None:
+            delay = self.retry.wait_time(attempt)
+        else:
+            delay = self.retry.wait_time(
+                attempt, response.status_code, response.headers.get("Retry-After"), self.rate_limiter
+            )
+        if delay:
+            await asyncio.sleep(delay)
+
+    async def _fetch_page(
+        self, keyword_vac: str, page: int, filters: Optional[Dict[str, Any]] = None, required: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Запрос одной страницы выдачи; None, если сервер ответил окончательной ошибкой (конец выдачи).
+
+        required - страница заведомо есть в выдаче (по pages/found), и окончательная ошибка на ней дает
+        PageFetchError, а не молча обрезает выдачу."""
+        response = await self._get(dict(self.__params, text=keyword_vac, page=page, **(filters or {})))
+        if not check_status(response.status_code, page, required):
+            return None
+        data: Dict[str, Any] = (self.codec or get_codec()).loads(response.content)
+        return data
+
+    async def get_vacancies(
+        self, keyword_vac: str, area: Optional[str] = None, timeout: Optional[float] = None
+    ) -> List[Any]:
+        """Выгрузка вакансий по запросу; timeout - предельное время всей выгрузки, с (asyncio.TimeoutError)"""
+        return await asyncio.wait_for(self._collect(keyword_vac, area), timeout)
+
+    async def _collect(self, keyword_vac: str, area: Optional[str]) -> List[Any]:
+        return [vacancy async for vacancy in self.iter_vacancies(keyword_vac, area)]
+
+    async def search_many(
+        self, keywords: Iterable[str], area: Optional[str] = None, timeout: Optional[float] = None
+    ) -> Dict[str, List[Any]]:
+        """Несколько поисков одновременно на одном цикле событий; результат по каждому ключевому слову"""
+        keywords = list(dict.fromkeys(keywords))
+        results = await asyncio.gather(*(self.get_vacancies(keyword, area, timeout) for keyword in keywords))
+        return dict(zip(keywords, results))
+
+    async def iter_vacancies(
+        self, keyword_vac: str, area: Optional[str] = None, date_from: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Потоковая выгрузка: вакансии отдаются по мере получения страниц, в исходном порядке.
+
+        date_from - только вакансии, опубликованные не раньше этой даты (ISO 8601).
+        """
+        filters = {name: value for name, value in (("area", area), ("date_from", date_from)) if value is not None}
+        async for items in self._iter_pages(keyword_vac, filters):
+            for vacancy in items:
+                yield vacancy
+
+    async def _iter_pages(
+        self, keyword_vac: str, filters: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Страницы выдачи в исходном порядке до последней (по pages/found) или первой пустой.
+
+        Неполученная страница прерывает выгрузку исключением, поэтому обычное завершение итератора означает,
+        что выдача прочитана полностью."""
+        first_page = await self._fetch_page(keyword_vac, 0, filters)
+        if first_page is None or not first_page.get("items"):
+            return
+        yield first_page["items"]
+
+        pages = count_pages(first_page, self.PER_PAGE, self.MAX_PAGES)
+        if pages is None:
+            # Без pages/found число страниц неизвестно - читаем до первой пустой
+            for page in range(1, self.MAX_PAGES):
+                data = await self._fetch_page(keyword_vac, page, filters)
+                if data is None or not data.get("items"):
+                    return
+                yield data["items"]
+            return
+
+        # Задачи на все страницы сразу: одновременность ограничивает общий семафор клиента
+        tasks = [
+            asyncio.ensure_future(self._fetch_page(keyword_vac, page, filters, required=True))
+            for page in range(1, pages)
+        ]
+        try:
+            for task in tasks:
+                data = await task
+                if data is None or not data.get("items"):
+                    return
+                yield data["items"]
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
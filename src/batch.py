@@ -0,0 +1,165 @@
+import argparse
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import requests
+
+from src.hh_api import HeadHunterAPI, PageFetchError
+from src.http_cache import ResponseCache
+from src.json_saver import JSONSaver
+from src.projection import STORE_FIELDS
+from src.rate_limit import TokenBucket
+from src.vacancy import Vacancy
+from src.watermark import WatermarkStore
+
+Query = Tuple[str, Optional[str]]
+
+
+def read_queries(path: str) -> List[Query]:
+    """
+    Читает запросы из файла: по одному на строку, "ключевое слово" или "ключевое слово;id региона".
+
+    Пустые строки и строки, начинающиеся с #, пропускаются; повторяющиеся запросы выполняются один раз.
+    """
+    queries: List[Query] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            keyword, _, area = line.partition(";")
+            query = (keyword.strip(), area.strip() or None)
+            if query[0] and query not in queries:
+                queries.append(query)
+    return queries
+
+
+class BatchCollector:
+    """
+    Пакетная выгрузка по списку запросов в одно хранилище.
+
+    Все запросы идут через один клиент HeadHunterAPI, то есть через общий пул соединений, кэш и
+    ограничитель частоты. Вакансия, найденная несколькими запросами, записывается один раз (по id),
+    а весь пакет пишется одним проходом add_vacancies_stream. Статистика по каждому запросу
+    (время, найдено, новых в пакете, повторов) доступна в stats. В режиме incremental каждый запрос
+    выгружает только вакансии новее своей отметки (HeadHunterAPI.iter_new_vacancies); отметки
+    сохраняются после записи пакета в хранилище.
+    """
+
+    def __init__(self, hh_api: HeadHunterAPI, saver: JSONSaver, incremental: bool = False) -> None:
+        self.hh_api = hh_api
+        self.saver = saver
+        self.incremental = incremental
+        self.stats: List[Dict[str, Any]] = []
+        self._seen: Set[Any] = set()
+        self._watermarks: Dict[Query, str] = {}
+
+    def _collect_query(self, keyword: str, area: Optional[str]) -> Iterator[Vacancy]:
+        """Вакансии одного запроса, не встречавшиеся в пакете раньше."""
+        stats: Dict[str, Any] = {
+            "keyword": keyword,
+            "area": area,
+            "found": 0,
+            "unique": 0,
+            "duplicates": 0,
+            "seconds": 0.0,
+            "error": None,
+        }
+        self.stats.append(stats)
+        started = time.perf_counter()
+        try:
+            if self.incremental:
+                source = self.hh_api.iter_new_vacancies(keyword, area, pending=self._watermarks)
+            else:
+                source = self.hh_api.iter_vacancies(keyword, area)
+            for vacancy in Vacancy.cast_to_object_iter(source, self.saver.fields):
+                stats["found"] += 1
+                if vacancy.id in self._seen:
+                    stats["duplicates"] += 1
+                    continue
+                self._seen.add(vacancy.id)
+                stats["unique"] += 1
+                # Время записи в хранилище не входит во время запроса
+                stats["seconds"] += time.perf_counter() - started
+                yield vacancy
+                started = time.perf_counter()
+        except (PageFetchError, requests.RequestException) as e:
+            # Неполная выгрузка или сбой соединения одного запроса не прерывает пакет: ошибка попадает в stats
+            stats["error"] = str(e)
+        stats["seconds"] += time.perf_counter() - started
+        print(self.format_stats(stats))
+
+    def _collect(self, queries: Iterable[Query]) -> Iterator[Vacancy]:
+        for keyword, area in queries:
+            yield from self._collect_query(keyword, area)
+
+    def run(self, queries: Iterable[Query]) -> Dict[str, int]:
+        """Выполняет запросы и сохраняет вакансии; возвращает отчет хранилища (inserted/updated/skipped)."""
+        self.stats = []
+        self._seen = set()
+        self._watermarks = {}
+        for _ in self.saver.add_vacancies_stream(self._collect(queries)):
+            pass
+        # Отметки сдвигаются только после того, как вакансии записаны в хранилище
+        if self._watermarks and self.hh_api.watermarks is not None:
+            self.hh_api.watermarks.update(self._watermarks)
+        return self.saver.last_report
+
+    @staticmethod
+    def format_stats(stats: Dict[str, Any]) -> str:
+        query = stats["keyword"] if stats["area"] is None else f"{stats['keyword']} (регион {stats['area']})"
+        if stats.get("error") is not None:
+            return f"{query}: выгрузка неполная, найдено {stats['found']} - {stats['error']}"
+        return (
+            f"{query}: найдено {stats['found']}, новых {stats['unique']}, повторов {stats['duplicates']}, "
+            f"{stats['seconds']:.2f} с"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Пакетная выгрузка вакансий hh.ru по списку запросов")
+    parser.add_argument("queries", help="файл с запросами: ключевое слово или ключевое слово;id региона на строку")
+    parser.add_argument("--store", default="vacancies.json", help="файл хранилища в data/")
+    parser.add_argument("--workers", type=int, default=5, help="одновременных запросов страниц")
+    parser.add_argument("--rate", type=float, default=10, help="запросов в секунду на весь пакет")
+    parser.add_argument("--url", default="https://api.hh.ru/vacancies", help="адрес api")
+    parser.add_argument(
+        "--incremental", action="store_true", help="только вакансии новее прошлой выгрузки (data/watermarks.json)"
+    )
+    parser.add_argument("--cache-ttl", type=float, default=600, help="время жизни кэша ответов, с (0 - без кэша)")
+    args = parser.parse_args(argv)
+
+    queries = read_queries(args.queries)
+    cache = ResponseCache(JSONSaver.get_data_file_path("http_cache"), ttl=args.cache_ttl) if args.cache_ttl else None
+    hh_api = HeadHunterAPI(
+        max_workers=args.workers,
+        url=args.url,
+        cache=cache,
+        rate_limiter=TokenBucket(rate=args.rate),
+        watermarks=WatermarkStore(JSONSaver.get_data_file_path("watermarks.json")),
+    )
+    saver = JSONSaver(args.store, fields=STORE_FIELDS, compact=True)
+    collector = BatchCollector(hh_api, saver, incremental=args.incremental)
+    started = time.perf_counter()
+    try:
+        report = collector.run(queries)
+    finally:
+        hh_api.close()
+
+    metrics = hh_api.get_metrics()
+    print(
+        f"Запросов в пакете: {len(queries)}, уникальных вакансий: {sum(s['unique'] for s in collector.stats)}, "
+        f"{time.perf_counter() - started:.2f} с."
+    )
+    print(
+        f"Хранилище: добавлено {report['inserted']}, обновлено {report['updated']}, "
+        f"без изменений {report['skipped']}."
+    )
+    print(
+        f"Запросов к hh.ru: {metrics['requests']}, страниц из кэша: {metrics['cache_hits']}, "
+        f"повторов: {metrics['retried']}, не получено: {metrics['failed']}."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Неинтерактивный интерфейс командной строки: python -m src.cli <команда> [параметры].
+
+Команды: fetch - выгрузка с hh.ru в хранилище, top - топ N по зарплате, search - поиск по описанию,
+range - вакансии по диапазону зарплат, delete - удаление по id, show - вакансия по id.
+Результат выводится в stdout в формате --format (json, csv или text); ошибки и сообщения хранилища и клиента
+API, которые те печатают сами, - в stderr, чтобы не смешиваться с результатом.
+
+Коды возврата: 0 - успешно, 1 - ничего не найдено, 2 - неверные параметры, 3 - ошибка выполнения.
+
+Модули хранилища и клиента API импортируются внутри команд: запросы к хранилищу не загружают requests,
+и запуск команды чтения занимает десятки миллисекунд.
+"""
+
+import argparse
+import sys
+from contextlib import redirect_stdout
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, TextIO, Tuple
+
+if TYPE_CHECKING:
+    from src.json_saver import JSONSaver
+    from src.vacancy import Vacancy
+
+EXIT_OK = 0
+EXIT_NOT_FOUND = 1
+EXIT_USAGE = 2
+EXIT_ERROR = 3
+
+# Столбцы CSV для вакансий; зарплата - в валюте вакансии, одно число дает равные границы
+CSV_COLUMNS = ("id", "name", "url", "salary_from", "salary_to", "currency", "area", "requirement", "responsibility")
+
+
+def _open_store(args: argparse.Namespace) -> "JSONSaver":
+    from src.json_saver import JSONSaver
+    from src.projection import STORE_FIELDS
+
+    return JSONSaver(args.store, fields=STORE_FIELDS, compact=True)
+
+
+def _find(saver: "JSONSaver", vacancy_id: str) -> Optional["Vacancy"]:
+    """Вакансия по id из командной строки: id в хранилище бывают и строками, и числами."""
+    vacancy = saver.get_vacancy(vacancy_id)
+    if vacancy is None and vacancy_id.isdigit():
+        vacancy = saver.get_vacancy(int(vacancy_id))
+    return vacancy
+
+
+def vacancy_row(vacancy: "Vacancy") -> Dict[str, Any]:
+    """Плоская запись вакансии для CSV."""
+    salary = vacancy.salary
+    if isinstance(salary, tuple):
+        salary_from, salary_to = salary
+    elif salary:
+        salary_from = salary_to = salary
+    else:
+        salary_from = salary_to = None
+    area = vacancy.area if isinstance(vacancy.area, dict) else {}
+    snippet = vacancy.snippet or {}
+    return {
+        "id": vacancy.id,
+        "name": vacancy.name,
+        "url": vacancy.url,
+        "salary_from": salary_from,
+        "salary_to": salary_to,
+        "currency": vacancy.currency,
+        "area": area.get("name"),
+        "requirement": snippet.get("requirement"),
+        "responsibility": snippet.get("responsibility"),
+    }
+
+
+def write_vacancies(vacancies: List["Vacancy"], output_format: str, out: TextIO) -> None:
+    """Выводит вакансии: json - массив записей to_dict, csv - столбцы CSV_COLUMNS, text - как в меню."""
+    if output_format == "json":
+        from src.codec import get_codec
+
+        out.write(get_codec().dumps([vacancy.to_dict() for vacancy in vacancies]).decode("utf-8") + "\n")
+    elif output_format == "csv":
+        import csv
+
+        writer = csv.DictWriter(out, fieldnames=CSV_COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(vacancy_row(vacancy) for vacancy in vacancies)
+    else:
+        for vacancy in vacancies:
+            out.write(f"{vacancy}\n\n")
+
+
+def write_result(result: Dict[str, Any], output_format: str, out: TextIO) -> None:
+    """Выводит результат команды, не возвращающей вакансии (отчет fetch, delete)."""
+    if output_format == "json":
+        from src.codec import get_codec
+
+        out.write(get_codec().dumps(result).decode("utf-8") + "\n")
+    elif output_format == "csv":
+        import csv
+
+        writer = csv.DictWriter(out, fieldnames=list(result), lineterminator="\n")
+        writer.writeheader()
+        writer.writerow(result)
+    else:
+        for key, value in result.items():
+            out.write(f"{key}: {value}\n")
+
+
+def _print_vacancies(vacancies: List["Vacancy"], args: argparse.Namespace) -> int:
+    write_vacancies(vacancies, args.format, args.out)
+    return EXIT_OK if vacancies else EXIT_NOT_FOUND
+
+
+def cmd_fetch(args: argparse.Namespace) -> int:
+    from src.hh_api import HeadHunterAPI, PageFetchError
+    from src.http_cache import ResponseCache
+    from src.projection import STORE_FIELDS
+    from src.rate_limit import TokenBucket
+    from src.vacancy import Vacancy
+    from src.watermark import WatermarkStore
+
+    cache = (
+        ResponseCache(HeadHunterAPI.get_data_file_path("http_cache"), ttl=args.cache_ttl) if args.cache_ttl else None
+    )
+    hh_api = HeadHunterAPI(
+        max_workers=args.workers,
+        url=args.url,
+        cache=cache,
+        rate_limiter=TokenBucket(rate=args.rate),
+        watermarks=WatermarkStore(HeadHunterAPI.get_data_file_path("watermarks.json")),
+    )
+    saver = _open_store(args)
+    error = None
+    watermarks: Dict[Tuple[str, Optional[str]], str] = {}
+    try:
+        if args.incremental:
+            source = hh_api.iter_new_vacancies(args.keyword, args.area, pending=watermarks)
+        else:
+            source = hh_api.iter_vacancies(args.keyword, args.area)
+        for _ in saver.add_vacancies_stream(Vacancy.cast_to_object_iter(source, STORE_FIELDS)):
+            pass
+        # Отметка сдвигается только после того, как вакансии записаны в хранилище
+        if watermarks and hh_api.watermarks is not None:
+            hh_api.watermarks.update(watermarks)
+    except PageFetchError as e:
+        # Полученные до сбоя вакансии уже в хранилище; выгрузка неполная - отчет с ошибкой и код EXIT_ERROR
+        error = str(e)
+    finally:
+        hh_api.close()
+    metrics = hh_api.get_metrics()
+    write_result(
+        {
+            "keyword": args.keyword,
+            "area": args.area,
+            **saver.last_report,
+            "requests": metrics["requests"],
+            "cache_hits": metrics["cache_hits"],
+            "retried": metrics["retried"],
+            "failed": metrics["failed"],
+            "error": error,
+        },
+        args.format,
+        args.out,
+    )
+    return EXIT_ERROR if error is not None or metrics["failed"] else EXIT_OK
+
+
+def cmd_top(args: argparse.Namespace) -> int:
+    return _print_vacancies(_open_store(args).get_top_vacancies(args.n, rank=args.rank), args)
+
+
+def cmd_search(args: argparse.Namespace) -> int:
+    words = args.words
+    if args.prefix:
+        words = [word if word.endswith("*") else word + "*" for word in words]
+    return _print_vacancies(_open_store(args).search_vacancies(" ".join(words).lower(), mode=args.mode), args)
+
+
+def cmd_range(args: argparse.Namespace) -> int:
+    vacancies = _open_store(args).get_vacancies_by_salary(args.salary_from, args.salary_to, mode=args.mode)
+    return _print_vacancies(vacancies, args)
+
+
+def cmd_show(args: argparse.Namespace) -> int:
+    vacancy = _find(_open_store(args), args.id)
+    if vacancy is None:
+        print(f"Вакансия с ID {args.id} не найдена.", file=sys.stderr)
+        return EXIT_NOT_FOUND
+    return _print_vacancies([vacancy], args)
+
+
+def cmd_delete(args: argparse.Namespace) -> int:
+    saver = _open_store(args)
+    vacancy = _find(saver, args.id)
+    if vacancy is None:
+        print(f"Вакансия с ID {args.id} не найдена.", file=sys.stderr)
+        return EXIT_NOT_FOUND
+    saver.delete_vacancy(vacancy)
+    write_result({"deleted": vacancy.id}, args.format, args.out)
+    return EXIT_OK
+
+
+def _non_negative(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError("ожидается неотрицательное число")
+    return number
+
+
+def _add_common_arguments(parser: argparse.ArgumentParser, defaults: bool) -> None:
+    """--store и --format принимаются и до команды, и после нее (top 10 --format csv).
+
+    У команд значений по умолчанию нет (SUPPRESS): параметр после команды заменяет указанный до нее,
+    а не указанный - не сбрасывает его."""
+    parser.add_argument(
+        "--store",
+        default="vacancies.json" if defaults else argparse.SUPPRESS,
+        help="файл хранилища в data/ (или абсолютный путь)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("json", "csv", "text"),
+        default="json" if defaults else argparse.SUPPRESS,
+        help="формат вывода",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Работа с вакансиями hh.ru без меню")
+    _add_common_arguments(parser, defaults=True)
+    commands = parser.add_subparsers(dest="command", required=True, metavar="команда")
+
+    fetch = commands.add_parser("fetch", help="выгрузить вакансии с hh.ru в хранилище")
+    fetch.add_argument("keyword", help="ключевое слово")
+    fetch.add_argument("--area", help="id региона")
+    fetch.add_argument("--workers", type=int, default=5, help="одновременных запросов страниц")
+    fetch.add_argument("--rate", type=float, default=10, help="запросов в секунду")
+    fetch.add_argument("--url", default="https://api.hh.ru/vacancies", help="адрес api")
+    fetch.add_argument("--cache-ttl", type=float, default=600, help="время жизни кэша ответов, с (0 - без кэша)")
+    fetch.add_argument("--incremental", action="store_true", help="только вакансии новее прошлой выгрузки")
+    fetch.set_defaults(handler=cmd_fetch)
+
+    top = commands.add_parser("top", help="топ N вакансий по зарплате")
+    top.add_argument("n", type=_non_negative, help="количество вакансий")
+    top.add_argument("--rank", choices=("max", "mid", "min"), default="max", help="граница зарплаты для ранжирования")
+    top.set_defaults(handler=cmd_top)
+
+    search = commands.add_parser("search", help="поиск по описанию вакансий")
+    search.add_argument("words", nargs="+", help="слова запроса (слово* - префикс)")
+    search.add_argument("--mode", choices=("and", "or"), default="and", help="все слова или хотя бы одно")
+    search.add_argument("--prefix", action="store_true", help="искать каждое слово как начало слова")
+    search.set_defaults(handler=cmd_search)
+
+    salary_range = commands.add_parser("range", help="вакансии по диапазону зарплат (в рублях)")
+    salary_range.add_argument("salary_from", type=float, help="от")
+    salary_range.add_argument("salary_to", type=float, help="до")
+    salary_range.add_argument(
+        "--mode",
+        choices=("contains", "overlaps"),
+        default="contains",
+        help="зарплата целиком в диапазоне или пересекается с ним",
+    )
+    salary_range.set_defaults(handler=cmd_range)
+
+    show = commands.add_parser("show", help="вакансия по id")
+    show.add_argument("id", help="id вакансии")
+    show.set_defaults(handler=cmd_show)
+
+    delete = commands.add_parser("delete", help="удалить вакансию по id")
+    delete.add_argument("id", help="id вакансии")
+    delete.set_defaults(handler=cmd_delete)
+
+    for command in (fetch, top, search, salary_range, show, delete):
+        _add_common_arguments(command, defaults=False)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Выполняет команду и возвращает код возврата."""
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as error:
+        return EXIT_USAGE if error.code else EXIT_OK
+    args.out = sys.stdout
+    try:
+        with redirect_stdout(sys.stderr):
+            return int(args.handler(args))
+    except (OSError, ValueError) as error:
+        print(f"Ошибка: {error}", file=sys.stderr)
+        return EXIT_ERROR
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import json
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson не установлен - работаем на стандартном json
+    orjson = None  # type: ignore[assignment]
+
+
+class JSONCodec:
+    """
+    Кодек JSON на стандартном модуле json.
+
+    dumps возвращает байты UTF-8 (без экранирования кириллицы): с отступами при pretty=True,
+    иначе в самой короткой форме без пробелов. loads принимает байты или строку.
+    """
+
+    name = "json"
+    # Исключение при разборе некорректного JSON (у orjson - подкласс json.JSONDecodeError)
+    DecodeError = json.JSONDecodeError
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any, pretty: bool = False) -> bytes:
+        if pretty:
+            return json.dumps(obj, ensure_ascii=False, indent=4).encode("utf-8")
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class OrjsonCodec(JSONCodec):
+    """Кодек на orjson (в разы быстрее json); отступ при pretty=True - 2 пробела, других orjson не умеет."""
+
+    name = "orjson"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any, pretty: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+
+CODECS = {"json": JSONCodec, "orjson": OrjsonCodec}
+
+_codec: Optional[JSONCodec] = None
+
+
+def make_codec(name: Optional[str] = None) -> JSONCodec:
+    """Кодек по имени; без имени - самый быстрый из установленных."""
+    if name is None:
+        name = "orjson" if orjson is not None else "json"
+    if name not in CODECS:
+        raise ValueError(f"Неизвестный кодек JSON: {name}")
+    if name == "orjson" and orjson is None:
+        raise ValueError("Кодек orjson недоступен: установите пакет orjson")
+    return CODECS[name]()
+
+
+def get_codec() -> JSONCodec:
+    """Кодек, которым пользуются клиент API и хранилища."""
+    global _codec
+    if _codec is None:
+        _codec = make_codec()
+    return _codec
+
+
+def set_codec(codec: Union[JSONCodec, str, None]) -> None:
+    """Заменяет кодек по умолчанию (объектом или по имени; None - снова выбрать автоматически)."""
+    global _codec
+    _codec = make_codec(codec) if codec is None or isinstance(codec, str) else codec
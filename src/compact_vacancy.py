@@ -0,0 +1,180 @@
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.vacancy import Vacancy
+
+
+class CompactVacancy:
+    """
+    Компактное представление вакансии для хранения больших выборок в памяти.
+
+    Вместо __dict__ используются __slots__, регион и краткое описание разложены по отдельным полям,
+    зарплата хранится двумя числами, а повторяющиеся строки (регион, валюта) интернируются.
+    Публичный интерфейс совпадает с Vacancy: id, name, url, salary, area, snippet, to_dict и сравнения.
+    """
+
+    __slots__ = (
+        "_id",
+        "_name",
+        "url",
+        "area_id",
+        "area_name",
+        "salary_from",
+        "salary_to",
+        "currency",
+        "_salary_base",
+        "description",
+        "requirement",
+        "responsibility",
+    )
+
+    def __init__(self, id, name, area, url, salary, description=None, snippet=None, currency=None, **kwargs) -> None:
+        if not isinstance(name, str) or not name:
+            raise ValueError("Название вакансии должно быть непустой строкой")
+        if not isinstance(url, str) or not url:
+            raise ValueError("URL должен быть непустой строкой")
+
+        area = area if isinstance(area, dict) else {}
+        snippet = snippet if isinstance(snippet, dict) else {}
+        self._id = id
+        self._name = name
+        self.url = url
+        self.area_id = self._intern(area.get("id"))
+        self.area_name = self._intern(area.get("name"))
+        self.salary_from, self.salary_to = self._salary_fields(salary)
+        if currency is None and isinstance(salary, dict):
+            currency = salary.get("currency")
+        self.currency = self._intern(currency)
+        self._salary_base = Vacancy._normalize_bounds(self.salary, currency)
+        self.description = description
+        self.requirement = snippet.get("requirement")
+        self.responsibility = snippet.get("responsibility")
+
+    @staticmethod
+    def _intern(value: Any) -> Any:
+        """Интернирует строку, чтобы одинаковые значения хранились в памяти один раз."""
+        return sys.intern(value) if isinstance(value, str) else value
+
+    @staticmethod
+    def _salary_fields(salary: Any) -> tuple:
+        """Раскладывает зарплату в формате hh.ru или Vacancy на два числа (0 - граница не указана)."""
+        if isinstance(salary, dict):
+            return salary.get("from") or 0, salary.get("to") or 0
+        if isinstance(salary, (list, tuple)) and len(salary) == 2:
+            return salary[0] or 0, salary[1] or 0
+        if isinstance(salary, (int, float)):
+            return salary, 0
+        return 0, 0
+
+    @property
+    def id(self) -> Any:
+        return self._id
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def salary(self) -> Any:
+        """Зарплата в том же виде, что и у Vacancy: (from, to), одно число или 0."""
+        if self.salary_from and self.salary_to:
+            return self.salary_from, self.salary_to
+        return self.salary_from or self.salary_to or 0
+
+    @property
+    def salary_bounds(self) -> Optional[Tuple[float, float]]:
+        """Границы зарплаты в рублях, как у Vacancy."""
+        return self._salary_base
+
+    @property
+    def area(self) -> Dict[str, Any]:
+        area = {}
+        if self.area_id is not None:
+            area["id"] = self.area_id
+        if self.area_name is not None:
+            area["name"] = self.area_name
+        return area
+
+    @property
+    def snippet(self) -> Dict[str, Any]:
+        snippet = {}
+        if self.requirement is not None:
+            snippet["requirement"] = self.requirement
+        if self.responsibility is not None:
+            snippet["responsibility"] = self.responsibility
+        return snippet
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._id}, {self._name}, {self.area}, {self.salary})"
+
+    def __str__(self) -> str:
+        """Возвращает строковое представление объекта вакансии."""
+        salary_str = f"{self.salary}" if self.salary else "Зарплата не указана"
+        return (
+            f"Вакансия: {self._name}\nСсылка: {self.url}\nЗарплата: {salary_str}\n"
+            f"Описание: {self.responsibility or 'Нет информации'}"
+        )
+
+    def __eq__(self, other: Any) -> Any:
+        """Сравнивает зарплату текущей вакансии с другой вакансией на равенство."""
+        if isinstance(other, (CompactVacancy, Vacancy)):
+            return (self.salary_bounds or (0, 0)) == (other.salary_bounds or (0, 0))
+        return NotImplemented
+
+    def __lt__(self, other: Any) -> Any:
+        """Сравнивает зарплату текущей вакансии с другой вакансией на меньше."""
+        if isinstance(other, (CompactVacancy, Vacancy)):
+            return (self.salary_bounds or (0, 0)) < (other.salary_bounds or (0, 0))
+        return NotImplemented
+
+    def __gt__(self, other: Any) -> Any:
+        """Сравнивает зарплату текущей вакансии с другой вакансией на больше."""
+        if isinstance(other, (CompactVacancy, Vacancy)):
+            return (self.salary_bounds or (0, 0)) > (other.salary_bounds or (0, 0))
+        return NotImplemented
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает словарное представление в формате Vacancy.to_dict."""
+        return {
+            "id": self._id,
+            "name": self._name,
+            "area": self.area,
+            "url": self.url,
+            "salary": self.salary,
+            "description": self.description,
+            "snippet": self.snippet,
+            **({"currency": self.currency} if self.currency else {}),
+        }
+
+    @classmethod
+    def from_vacancy(cls, vacancy: Vacancy) -> "CompactVacancy":
+        """Создает компактную копию объекта Vacancy."""
+        return cls(
+            id=vacancy.id,
+            name=vacancy.name,
+            area=vacancy.area,
+            url=vacancy.url,
+            salary=vacancy.salary,
+            description=vacancy.description,
+            snippet=vacancy.snippet,
+            currency=vacancy.currency,
+        )
+
+    @classmethod
+    def cast_to_object_iter(cls, vacancies: Iterable[Dict[str, Any]]) -> Iterator["CompactVacancy"]:
+        """Лениво преобразует вакансии в формате hh.ru в компактные объекты."""
+        for vacancy in vacancies:
+            yield cls(
+                id=vacancy.get("id", "Не указано"),
+                name=vacancy.get("name", "Не указано"),
+                area=vacancy.get("area", {}),
+                url=vacancy.get("alternate_url", "Не указано"),
+                salary=vacancy.get("salary", 0),
+                description=vacancy.get("description", "Не указано"),
+                snippet=vacancy.get("snippet", {}),
+            )
+
+    @classmethod
+    def cast_to_object_list(cls, vacancies: List[Dict[str, Any]]) -> List["CompactVacancy"]:
+        """Преобразует вакансии в формате hh.ru в список компактных объектов."""
+        return list(cls.cast_to_object_iter(vacancies))
@@ -0,0 +1,152 @@
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+from src.codec import get_codec
+from src.file_utils import atomic_write
+
+# Валюта, к которой приводятся все зарплаты (код hh.ru для рубля)
+BASE_CURRENCY = "RUR"
+
+# Примерные курсы для работы без сети: сколько рублей в одной единице валюты
+DEFAULT_RATES = {
+    "RUR": 1.0,
+    "USD": 90.0,
+    "EUR": 98.0,
+    "KZT": 0.19,
+    "UAH": 2.2,
+    "BYR": 28.0,
+    "UZS": 0.0072,
+    "AZN": 53.0,
+    "GEL": 33.0,
+    "KGS": 1.03,
+}
+
+
+class RateProvider(ABC):
+    """Источник курсов валют: словарь код валюты hh.ru -> рублей за единицу."""
+
+    @abstractmethod
+    def get_rates(self) -> Dict[str, float]:
+        pass
+
+
+class StaticRateProvider(RateProvider):
+    """Фиксированная таблица курсов, не требует сети."""
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None) -> None:
+        self.rates = dict(DEFAULT_RATES if rates is None else rates)
+
+    def get_rates(self) -> Dict[str, float]:
+        return dict(self.rates)
+
+
+class CBRRateProvider(RateProvider):
+    """Курсы ЦБ РФ с зеркала cbr-xml-daily.ru."""
+
+    # Коды ЦБ, которые на hh.ru записываются иначе
+    HH_CODES = {"BYN": "BYR"}
+
+    def __init__(self, url: str = "https://www.cbr-xml-daily.ru/daily_json.js", timeout: float = 10) -> None:
+        self.url = url
+        self.timeout = timeout
+
+    def get_rates(self) -> Dict[str, float]:
+        import requests
+
+        response = requests.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        rates = {BASE_CURRENCY: 1.0}
+        for code, valute in get_codec().loads(response.content)["Valute"].items():
+            rates[self.HH_CODES.get(code, code)] = valute["Value"] / valute["Nominal"]
+        return rates
+
+
+class CurrencyConverter:
+    """
+    Пересчет зарплат в базовую валюту.
+
+    Курсы берутся у провайдера и, если указан cache_file, кэшируются в файле на ttl секунд.
+    Если провайдер недоступен, используется устаревший кэш, а без него - встроенная таблица.
+    Неизвестная валюта пересчитывается по курсу 1.
+    """
+
+    def __init__(
+        self, provider: Optional[RateProvider] = None, cache_file: Optional[str] = None, ttl: float = 24 * 3600
+    ) -> None:
+        self.provider = provider or StaticRateProvider()
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self._rates: Optional[Dict[str, float]] = None
+        self._fetched_at = 0.0
+
+    def _read_cache(self) -> Optional[Tuple[float, Dict[str, float]]]:
+        """Время получения и курсы из файла кэша."""
+        if not self.cache_file:
+            return None
+        try:
+            with open(self.cache_file, "rb") as f:
+                data = get_codec().loads(f.read())
+            return float(data["fetched_at"]), {code: float(rate) for code, rate in data["rates"].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def _write_cache(self, rates: Dict[str, float]) -> None:
+        if not self.cache_file:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True)
+        data = {"fetched_at": self._fetched_at, "rates": rates}
+        atomic_write(self.cache_file, get_codec().dumps(data, pretty=True))
+
+    def get_rates(self) -> Dict[str, float]:
+        """Актуальная таблица курсов, обновляется не чаще раза в ttl секунд."""
+        now = time.time()
+        if self._rates is not None and now - self._fetched_at < self.ttl:
+            return self._rates
+        cached = self._read_cache()
+        if cached is not None and now - cached[0] < self.ttl:
+            self._fetched_at, self._rates = cached
+            return self._rates
+        try:
+            rates = self.provider.get_rates()
+        except Exception as e:
+            print(f"Не удалось обновить курсы валют: {e}")
+            if cached is not None:
+                self._fetched_at, self._rates = now, cached[1]
+            else:
+                self._fetched_at, self._rates = now, dict(DEFAULT_RATES)
+            return self._rates
+        self._fetched_at, self._rates = now, rates
+        self._write_cache(rates)
+        return rates
+
+    def rate(self, currency: Optional[str]) -> float:
+        """Рублей за единицу валюты; без валюты зарплата считается указанной в рублях."""
+        if not currency or currency == BASE_CURRENCY:
+            return 1.0
+        return self.get_rates().get(currency, 1.0)
+
+    def convert(self, amount: float, currency: Optional[str]) -> float:
+        """Сумма в базовой валюте."""
+        return amount * self.rate(currency)
+
+
+# Кэш курсов конвертера по умолчанию: data/rates.json в корне проекта, как остальные файлы данных
+DEFAULT_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "rates.json")
+
+_default_converter: Optional[CurrencyConverter] = None
+
+
+def get_default_converter() -> CurrencyConverter:
+    """Конвертер, которым вакансии приводят зарплату к рублям при создании; курсы кэшируются в data/rates.json."""
+    global _default_converter
+    if _default_converter is None:
+        _default_converter = CurrencyConverter(cache_file=DEFAULT_CACHE_FILE)
+    return _default_converter
+
+
+def set_default_converter(converter: CurrencyConverter) -> None:
+    """Заменяет конвертер по умолчанию (например, на курсы ЦБ с кэшем в data/)."""
+    global _default_converter
+    _default_converter = converter
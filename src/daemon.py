@@ -0,0 +1,240 @@
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from src.codec import get_codec
+from src.json_saver import JSONSaver
+from src.projection import STORE_FIELDS
+from src.salary_index import SalaryRangeIndex
+from src.text_index import InvertedIndex
+from src.vacancy import Vacancy
+
+Response = Tuple[int, Any]
+
+
+class StoreSnapshot:
+    """
+    Неизменяемый снимок хранилища с индексами: по id, отсортированные по зарплате списки для каждого
+    правила ранжирования, индекс диапазонов и полнотекстовый индекс.
+
+    Строится один раз на версию файла и после построения не меняется, поэтому запросы из разных потоков
+    читают его без блокировок. Полнотекстовый индекс держится только в памяти и на диск не пишется.
+    """
+
+    RANKS = ("max", "mid", "min")
+
+    def __init__(self, vacancies: List[Vacancy]) -> None:
+        self.by_id: Dict[Any, Vacancy] = {vacancy.id: vacancy for vacancy in vacancies}
+        self.top: Dict[str, List[Vacancy]] = {}
+        for rank in self.RANKS:
+            keyed = [(key, vacancy) for vacancy in vacancies if (key := vacancy.salary_key(rank)) is not None]
+            keyed.sort(key=lambda pair: pair[0], reverse=True)
+            self.top[rank] = [vacancy for _, vacancy in keyed]
+        self.ranges = SalaryRangeIndex(vacancies)
+        self.text = InvertedIndex.build(vacancies)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def get_top_vacancies(self, n: int, rank: str = "max") -> List[Vacancy]:
+        if rank not in self.top:
+            raise ValueError(f"Неизвестный способ ранжирования: {rank}")
+        return self.top[rank][:n]
+
+    def search_vacancies(self, query: str, mode: str = "and") -> List[Vacancy]:
+        return [self.by_id[vacancy_id] for vacancy_id in self.text.search(query, mode) if vacancy_id in self.by_id]
+
+
+class QueryDaemon:
+    """
+    Долгоживущий сервер запросов к хранилищу на localhost (HTTP, ответы в JSON).
+
+    Хранилище JSONSaver загружается один раз, и по нему строится снимок StoreSnapshot со всеми индексами.
+    Фоновый поток раз в poll_interval секунд проверяет время изменения и размер файла и, если файл изменился,
+    перечитывает его и строит новый снимок, а затем подменяет им старый. Запросы от нескольких клиентов
+    обслуживаются в отдельных потоках параллельно: каждый берет текущий снимок и читает его без блокировок,
+    пока новый снимок строится, запросы отвечают по предыдущему.
+
+    GET /top?n=10&rank=max, /search?q=python&mode=and, /range?from=100000&to=200000&mode=contains,
+    /vacancy/<id> и /health; у search и range необязательный limit - не больше limit вакансий в ответе.
+    Ошибка в параметрах - ответ 400, неизвестный путь или id - 404.
+    """
+
+    def __init__(
+        self, saver: JSONSaver, host: str = "127.0.0.1", port: int = 8765, poll_interval: float = 1.0
+    ) -> None:
+        self.saver = saver
+        self.poll_interval = poll_interval
+        self.requests = 0
+        self.reloads = 0
+        self.snapshot = StoreSnapshot([])
+        # Перечитывание хранилища (конструктор и фоновый поток) и счетчик запросов
+        self._reload_lock = threading.Lock()
+        self._counter_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._routes: Dict[str, Callable[[Dict[str, str]], Response]] = {
+            "/top": self._top,
+            "/search": self._search,
+            "/range": self._range,
+            "/health": self._health,
+        }
+        self.reload_if_changed()
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.socket.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def reload_if_changed(self) -> bool:
+        """Перечитывает хранилище и строит новый снимок, если файл изменился; True - данные обновлены."""
+        with self._reload_lock:
+            if not self.saver.refresh():
+                return False
+            self.snapshot = StoreSnapshot(self.saver.load_vacancies())
+            self.reloads += 1
+            return True
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.poll_interval):
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                print(f"Не удалось перечитать хранилище: {e}")
+
+    def handle(self, path: str, query: Dict[str, str]) -> Response:
+        """Выполняет запрос и возвращает (статус, тело ответа)."""
+        if path.startswith("/vacancy/"):
+            route: Optional[Callable[[Dict[str, str]], Response]] = self._vacancy
+            query = {**query, "id": unquote(path[len("/vacancy/") :])}
+        else:
+            route = self._routes.get(path)
+        if route is None:
+            return 404, {"error": f"Неизвестный запрос: {path}"}
+        with self._counter_lock:
+            self.requests += 1
+        try:
+            return route(query)
+        except (KeyError, ValueError) as e:
+            return 400, {"error": f"Некорректные параметры: {e}"}
+
+    def _top(self, query: Dict[str, str]) -> Response:
+        n = int(query.get("n", 10))
+        if n < 0:
+            raise ValueError("n должно быть неотрицательным")
+        vacancies = self.snapshot.get_top_vacancies(n, rank=query.get("rank", "max"))
+        return 200, [vacancy.to_dict() for vacancy in vacancies]
+
+    def _search(self, query: Dict[str, str]) -> Response:
+        vacancies = self.snapshot.search_vacancies(query["q"].lower(), mode=query.get("mode", "and"))
+        return 200, self._records(vacancies, query)
+
+    def _range(self, query: Dict[str, str]) -> Response:
+        mode = query.get("mode", "contains")
+        if mode not in ("contains", "overlaps"):
+            raise ValueError(f"неизвестный режим {mode}")
+        vacancies = self.snapshot.ranges.query(float(query["from"]), float(query["to"]), mode=mode)
+        return 200, self._records(vacancies, query)
+
+    @staticmethod
+    def _records(vacancies: List[Vacancy], query: Dict[str, str]) -> List[Dict[str, Any]]:
+        if "limit" in query:
+            vacancies = vacancies[: int(query["limit"])]
+        return [vacancy.to_dict() for vacancy in vacancies]
+
+    def _vacancy(self, query: Dict[str, str]) -> Response:
+        vacancy_id = query["id"]
+        by_id = self.snapshot.by_id
+        vacancy = by_id.get(vacancy_id)
+        if vacancy is None and vacancy_id.isdigit():
+            vacancy = by_id.get(int(vacancy_id))
+        if vacancy is None:
+            return 404, {"error": f"Вакансия с ID {vacancy_id} не найдена"}
+        return 200, vacancy.to_dict()
+
+    def _health(self, query: Dict[str, str]) -> Response:
+        return 200, {
+            "vacancies": len(self.snapshot),
+            "reloads": self.reloads,
+            "requests": self.requests,
+        }
+
+    def _make_handler(self) -> type:
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                parsed = urlparse(self.path)
+                query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+                status, body = daemon.handle(parsed.path, query)
+                payload = get_codec().dumps(body)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> None:
+        """Запускает сервер и наблюдение за файлом в фоновых потоках."""
+        self._stopped.clear()
+        self._threads = [
+            threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.1}, daemon=True),
+            threading.Thread(target=self._watch, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def serve_forever(self) -> None:
+        """Обслуживает запросы в текущем потоке до прерывания (Ctrl+C)."""
+        watcher = threading.Thread(target=self._watch, daemon=True)
+        watcher.start()
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self._stopped.set()
+            self.httpd.server_close()
+
+    def stop(self) -> None:
+        """Останавливает сервер и наблюдение за файлом."""
+        self._stopped.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        for thread in self._threads:
+            thread.join()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Сервер запросов к хранилищу вакансий на localhost")
+    parser.add_argument("--store", default="vacancies.json", help="файл хранилища в data/ (или абсолютный путь)")
+    parser.add_argument("--host", default="127.0.0.1", help="адрес")
+    parser.add_argument("--port", type=int, default=8765, help="порт")
+    parser.add_argument("--poll", type=float, default=1.0, help="период проверки файла хранилища, с")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    saver = JSONSaver(args.store, fields=STORE_FIELDS, compact=True)
+    daemon = QueryDaemon(saver, host=args.host, port=args.port, poll_interval=args.poll)
+    print(
+        f"Загружено {len(daemon.snapshot)} вакансий за {time.perf_counter() - started:.2f} с, "
+        f"запросы принимаются на {daemon.url}"
+    )
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
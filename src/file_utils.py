@@ -0,0 +1,109 @@
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from types import TracebackType
+from typing import Iterator, Optional, Type
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировки fcntl недоступны, работаем без них
+    fcntl = None  # type: ignore[assignment]
+
+
+class FileLock:
+    """Рекомендательная блокировка fcntl на файле-спутнике <path>.lock.
+
+    Блокировка повторно входимая в пределах объекта: вложенные with не блокируют сам поток.
+    Разные процессы и разные объекты FileLock на один путь ждут друг друга. shared() - разделяемая
+    блокировка для чтения: читатели не ждут друг друга, но ждут записи (with) и задерживают ее.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.lock_path = path + ".lock"
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._lock_fd: Optional[int] = None
+
+    def _acquire(self, exclusive: bool) -> None:
+        self._thread_lock.acquire()
+        try:
+            if self._depth == 0:
+                lock_fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                    except BaseException:
+                        os.close(lock_fd)
+                        raise
+                self._lock_fd = lock_fd
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._depth += 1
+
+    def __enter__(self) -> "FileLock":
+        self._acquire(exclusive=True)
+        return self
+
+    @contextmanager
+    def shared(self) -> Iterator["FileLock"]:
+        """Разделяемая блокировка на время чтения; внутри уже взятой блокировки объекта ничего не меняет.
+
+        Запись (with) внутри shared() не повышает блокировку до монопольной - внутри чтения не пишут.
+        """
+        self._acquire(exclusive=False)
+        try:
+            yield self
+        finally:
+            self.__exit__(None, None, None)
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._lock_fd is not None:
+            if fcntl is not None:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            os.close(self._lock_fd)
+            self._lock_fd = None
+        self._thread_lock.release()
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """Записывает файл целиком через временный файл и rename.
+
+    Данные и каталог синхронизируются на диск (fsync), поэтому при сбое на месте остается
+    либо старая, либо новая версия файла, но не обрезанная.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode)
+        else:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    _fsync_directory(directory)
+
+
+def _fsync_directory(directory: str) -> None:
+    """Сбрасывает на диск запись каталога, чтобы rename пережил сбой питания."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
@@ -1,33 +1,351 @@
-import json
+import logging
+import math
 import os
-from typing import Any, List
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from src.api import JobAPI
+from src.codec import JSONCodec, get_codec
+from src.file_utils import FileLock, atomic_write
+from src.http_cache import ResponseCache
+from src.rate_limit import RetryPolicy, TokenBucket
+from src.watermark import WatermarkStore, parse_published_at
 from src.vacancy import Vacancy
 
+logger = logging.getLogger(__name__)
+
+
+class PageFetchError(IOError):
+    """Страница выдачи не получена после всех повторов: результат выгрузки был бы неполным."""
+
+    def __init__(self, page: Any, status_code: int, attempts: int) -> None:
+        super().__init__(f"Страница {page} не получена после {attempts} попыток: HTTP {status_code}")
+        self.page = page
+        self.status_code = status_code
+        self.attempts = attempts
+
+
+def count_pages(first_page: Dict[str, Any], per_page: int, max_pages: int) -> Optional[int]:
+    """Количество страниц выдачи по полям pages/found первого ответа, не больше max_pages"""
+    if first_page.get("pages") is not None:
+        return min(int(first_page["pages"]), max_pages)
+    if first_page.get("found") is not None:
+        per_page = int(first_page.get("per_page") or per_page)
+        return min(math.ceil(int(first_page["found"]) / per_page), max_pages)
+    return None
+
+
+def check_status(status_code: int, page: int, required: bool) -> bool:
+    """True для ответа 200; окончательная ошибка на обязательной странице - PageFetchError"""
+    if status_code == 200:
+        return True
+    if required:
+        raise PageFetchError(page, status_code, 1)
+    return False
+
 
 class HeadHunterAPI(JobAPI):
     """Выгрузка вакансий с сайта hh.ru по api"""
 
-    def __init__(self) -> None:
-        """Определение ресурса и параметров для api"""
-        self.__url = "https://api.hh.ru/vacancies"
+    MAX_PAGES = 1000
+    PER_PAGE = 100
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        url: str = "https://api.hh.ru/vacancies",
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry: Optional[RetryPolicy] = None,
+        watermarks: Optional[WatermarkStore] = None,
+        codec: Optional[JSONCodec] = None,
+        timeout: Union[float, Tuple[float, float]] = (5, 30),
+    ) -> None:
+        """Определение ресурса и параметров для api.
+
+        max_workers - сколько страниц можно запрашивать одновременно (1 - последовательная выгрузка).
+        cache - кэш ответов на диске; без него каждая страница скачивается заново.
+        rate_limiter - ограничитель частоты, общий для всех потоков (и для других клиентов, если передать один объект).
+        retry - повтор запросов при 429, 5xx и сбоях соединения; по умолчанию RetryPolicy().
+        watermarks - отметки последней выгрузки для iter_new_vacancies.
+        codec - разбор ответов JSON; по умолчанию общий кодек get_codec() (orjson, если установлен).
+        timeout - таймаут запроса в секундах: число или пара (подключение, чтение); зависший запрос
+        завершается requests.Timeout и повторяется по политике retry.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers должен быть не меньше 1")
+        self.__url = url
         self.__headers = {"User-Agent": "HH-User-Agent"}
-        self.__params = {"text": "", "page": 0, "per_page": 100}
-
-    def get_vacancies(self, keyword_vac: str) -> List[Any]:
-        """Выгрузка вакансий с проверкой статус-кода 200"""
-        self.__params["text"] = keyword_vac
-        vacancies_word = []
-        for page in range(1000):
-            self.__params["page"] = page
-            response = requests.get(self.__url, headers=self.__headers, params=self.__params)
-            if response.status_code != 200:
+        self.__params = {"text": "", "page": 0, "per_page": self.PER_PAGE}
+        self.max_workers = max_workers
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.watermarks = watermarks
+        self.codec = codec
+        self.timeout = timeout
+
+        # Одна сессия с keep-alive на все запросы, пул соединений не меньше числа потоков
+        self.__adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.__session = requests.Session()
+        self.__session.headers.update(self.__headers)
+        self.__session.mount("https://", self.__adapter)
+        self.__session.mount("http://", self.__adapter)
+
+        self.__metrics_lock = threading.Lock()
+        self.__requests_count = 0
+        self.__bytes_received = 0
+        self.__cache_hits = 0
+        self.__not_modified = 0
+        self.__throttled = 0
+        self.__retried = 0
+        self.__failed = 0
+        self.__rate_limit_wait = 0.0
+
+    def close(self) -> None:
+        """Закрывает сессию и ее соединения"""
+        self.__session.close()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Статистика запросов: отправлено, получено байт, открыто и переиспользовано соединений,
+        ответов из кэша без запроса и ответов 304, ответов 429, повторов, запросов без успеха после всех
+        повторов и секунд ожидания в ограничителе частоты"""
+        pools = self.__adapter.poolmanager.pools
+        opened = sum(pools[key].num_connections for key in pools.keys())
+        with self.__metrics_lock:
+            return {
+                "requests": self.__requests_count,
+                "bytes_received": self.__bytes_received,
+                "connections_opened": opened,
+                "connections_reused": max(self.__requests_count - opened, 0),
+                "cache_hits": self.__cache_hits,
+                "not_modified": self.__not_modified,
+                "throttled": self.__throttled,
+                "retried": self.__retried,
+                "failed": self.__failed,
+                "rate_limit_wait": round(self.__rate_limit_wait, 3),
+            }
+
+    def _fetch_page(
+        self, keyword_vac: str, page: int, filters: Optional[Dict[str, Any]] = None, required: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Запрос одной страницы выдачи; None, если сервер ответил окончательной ошибкой (конец выдачи).
+
+        Страница, не полученная из-за временных ошибок, дает PageFetchError; required - страница заведомо есть
+        в выдаче (по pages/found), и любая окончательная ошибка на ней тоже дает PageFetchError."""
+        params = dict(self.__params, text=keyword_vac, page=page, **(filters or {}))
+        if self.cache is None:
+            response = self._get(params)
+            return self._decode(response) if check_status(response.status_code, page, required) else None
+
+        entry = self.cache.get(self.__url, params)
+        if entry is not None and self.cache.is_fresh(entry):
+            with self.__metrics_lock:
+                self.__cache_hits += 1
+            return entry.body
+        response = self._get(params, entry.validators() if entry is not None else None)
+        if response.status_code == 304 and entry is not None:
+            with self.__metrics_lock:
+                self.__not_modified += 1
+            self.cache.refresh(entry)
+            return entry.body
+        if not check_status(response.status_code, page, required):
+            return None
+        data = self._decode(response)
+        self.cache.put(
+            self.__url, params, data, response.headers.get("ETag"), response.headers.get("Last-Modified")
+        )
+        return data
+
+    def _decode(self, response: requests.Response) -> Any:
+        """Разбор тела ответа выбранным кодеком"""
+        return (self.codec or get_codec()).loads(response.content)
+
+    def _get(self, params: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """GET запрос к api с ограничением частоты, повторами при временных ошибках и учетом метрик.
+
+        Если временная ошибка (429, 5xx) не прошла после всех повторов, выдается PageFetchError,
+        а сбой соединения - исходное исключение requests: выгрузка не обрывается молча."""
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                waited = self.rate_limiter.acquire()
+                with self.__metrics_lock:
+                    self.__rate_limit_wait += waited
+            try:
+                if headers:
+                    response = self.__session.get(self.__url, params=params, headers=headers, timeout=self.timeout)
+                else:
+                    response = self.__session.get(self.__url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.retry.max_retries:
+                    with self.__metrics_lock:
+                        self.__failed += 1
+                    raise
+                self._wait_before_retry(attempt)
+                attempt += 1
+                continue
+
+            with self.__metrics_lock:
+                self.__requests_count += 1
+                self.__bytes_received += len(response.content)
+                if response.status_code == 429:
+                    self.__throttled += 1
+            if self.retry.should_retry(response.status_code, attempt):
+                self._wait_before_retry(attempt, response)
+                attempt += 1
+                continue
+            if response.status_code in self.retry.statuses:
+                with self.__metrics_lock:
+                    self.__failed += 1
+                error = PageFetchError(params.get("page"), response.status_code, attempt + 1)
+                logger.warning("%s", error)
+                raise error
+            return response
+
+    def _wait_before_retry(self, attempt: int, response: Optional[requests.Response] = None) -> None:
+        """Пауза перед повтором; ответ 429 приостанавливает общий ограничитель для всех потоков"""
+        with self.__metrics_lock:
+            self.__retried += 1
+        if response is None:
+            delay = self.retry.wait_time(attempt)
+        else:
+            delay = self.retry.wait_time(
+                attempt, response.status_code, response.headers.get("Retry-After"), self.rate_limiter
+            )
+        if delay:
+            time.sleep(delay)
+
+    def get_vacancies(self, keyword_vac: str, area: Optional[str] = None) -> List[Any]:
+        """Выгрузка вакансий с проверкой статус-кода 200; area - id региона hh.ru"""
+        return list(self.iter_vacancies(keyword_vac, area))
+
+    def iter_vacancies(
+        self, keyword_vac: str, area: Optional[str] = None, date_from: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Потоковая выгрузка: вакансии отдаются по мере получения страниц.
+
+        date_from - только вакансии, опубликованные не раньше этой даты (ISO 8601).
+        """
+        filters = {name: value for name, value in (("area", area), ("date_from", date_from)) if value is not None}
+        for items in self._iter_pages(keyword_vac, filters):
+            yield from items
+
+    def iter_new_vacancies(
+        self,
+        keyword_vac: str,
+        area: Optional[str] = None,
+        pending: Optional[Dict[Tuple[str, Optional[str]], str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Инкрементальная выгрузка: только вакансии, опубликованные после прошлой выгрузки того же запроса.
+
+        Выдача запрашивается от новых к старым (order_by=publication_time). hh.ru отдает по одному запросу
+        не больше pages * per_page вакансий (2000); если найдено больше, окно дат делится: следующий запрос
+        берет вакансии не новее самой старой из полученных (date_to), пока выдача не уместится целиком.
+        Отметка (самая поздняя published_at) берется из watermarks и обновляется, только когда получены все
+        страницы выдачи: при PageFetchError, сбое соединения, закрытом генераторе или выдаче, которую не
+        удалось уместить в лимит, отметка не меняется, и следующий запуск повторит выгрузку с прежней отметки.
+        Вакансии с датой, равной отметке или границе окна, приходят повторно - хранилище пропускает их
+        как дубликаты.
+
+        pending - если передан, новая отметка записывается в него под ключом (keyword_vac, area), а не в
+        watermarks: вызывающий сохраняет ее (WatermarkStore.update) после того, как вакансии записаны.
+        """
+        if self.watermarks is None:
+            raise ValueError("Для инкрементальной выгрузки нужно передать watermarks")
+        date_from = self.watermarks.get(keyword_vac, area)
+        date_to: Optional[str] = None
+        newest, newest_at = None, None
+        while True:
+            filters = {
+                name: value
+                for name, value in (("area", area), ("date_from", date_from), ("date_to", date_to))
+                if value is not None
+            }
+            filters["order_by"] = "publication_time"
+            summary: Dict[str, Any] = {}
+            oldest, oldest_at = None, None
+            for items in self._iter_pages(keyword_vac, filters, summary):
+                for vacancy in items:
+                    published_at = parse_published_at(vacancy.get("published_at"))
+                    if published_at is not None:
+                        if newest_at is None or published_at > newest_at:
+                            newest, newest_at = vacancy["published_at"], published_at
+                        if oldest_at is None or published_at < oldest_at:
+                            oldest, oldest_at = vacancy["published_at"], published_at
+                    yield vacancy
+            if not summary.get("truncated"):
                 break
-            vacancies_word.extend(response.json().get("items", []))
-        return vacancies_word
+            if oldest is None or oldest == date_to:
+                # Вакансий с одной датой больше, чем отдает один запрос: окно не делится дальше
+                logger.warning(
+                    "Выдача по запросу %r обрезана hh.ru (найдено %s), отметка не сдвигается",
+                    keyword_vac,
+                    summary["found"],
+                )
+                return
+            date_to = oldest
+        if newest is not None:
+            if pending is not None:
+                pending[(keyword_vac, area)] = newest
+            else:
+                self.watermarks.set(keyword_vac, area, newest)
+
+    def _iter_pages(
+        self, keyword_vac: str, filters: Optional[Dict[str, Any]] = None, summary: Optional[Dict[str, Any]] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Страницы выдачи в исходном порядке до последней (по pages/found) или первой пустой.
+
+        Неполученная страница (PageFetchError, сбой соединения) прерывает выгрузку исключением, поэтому
+        обычное завершение итератора означает, что выдача прочитана полностью.
+        summary - заполняется по первой странице: found и truncated (найдено больше, чем hh.ru отдает
+        по одному запросу, то есть больше pages * per_page)."""
+        first_page = self._fetch_page(keyword_vac, 0, filters)
+        if first_page is None or not first_page.get("items"):
+            return
+        pages = count_pages(first_page, self.PER_PAGE, self.MAX_PAGES)
+        if summary is not None and pages is not None and first_page.get("found") is not None:
+            per_page = int(first_page.get("per_page") or self.PER_PAGE)
+            summary["found"] = int(first_page["found"])
+            summary["truncated"] = summary["found"] > pages * per_page
+        yield first_page["items"]
+
+        if pages is None or self.max_workers == 1:
+            # Без pages/found число страниц неизвестно - читаем до первой пустой
+            for page in range(1, pages if pages is not None else self.MAX_PAGES):
+                data = self._fetch_page(keyword_vac, page, filters, required=pages is not None)
+                if data is None or not data.get("items"):
+                    return
+                yield data["items"]
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # В работе не больше max_workers страниц, чтобы в памяти не копилась вся выдача
+            page_numbers = iter(range(1, pages))
+            pending = deque(
+                executor.submit(self._fetch_page, keyword_vac, page, filters, True)
+                for page in islice(page_numbers, self.max_workers)
+            )
+            try:
+                while pending:
+                    data = pending.popleft().result()
+                    if data is None or not data.get("items"):
+                        return
+                    next_page = next(page_numbers, None)
+                    if next_page is not None:
+                        pending.append(executor.submit(self._fetch_page, keyword_vac, next_page, filters, True))
+                    yield data["items"]
+            finally:
+                # Конец выдачи, ошибка или закрытый генератор: оставшиеся в очереди страницы не нужны
+                for future in pending:
+                    future.cancel()
 
     @staticmethod
     def save_vacancies_to_json(keyword_vac: str, vacancies_word: list) -> None:
@@ -39,9 +357,10 @@ class HeadHunterAPI(JobAPI):
         # Определите имя файла с помощью ключевого слова
         filename = os.path.join(data_dir, f"vacancies.json")
 
-        # Сохранение вакансий в JSON-файл
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(vacancies_word, f, ensure_ascii=False, indent=4)
+        # Сохранение вакансий в JSON-файл: атомарно и под блокировкой, чтобы не мешать другим процессам
+        data = get_codec().dumps(vacancies_word, pretty=True)
+        with FileLock(filename):
+            atomic_write(filename, data)
 
         print(f"Вакансии по запросу '{keyword_vac}' сохранены в файл data/vacancies.json")
 
@@ -55,7 +374,7 @@ class HeadHunterAPI(JobAPI):
         """Загрузка вакансий из JSON файла и преобразование их в объекты Vacancy"""
         path = HeadHunterAPI.get_data_file_path(filename)
         with open(path, "r", encoding="utf-8") as f:
-            vacancies_from_json = json.load(f)
+            vacancies_from_json = get_codec().loads(f.read())
         return Vacancy.cast_to_object_list(vacancies_from_json)
 
 
@@ -0,0 +1,150 @@
+import hashlib
+import os
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+from src.codec import get_codec
+from src.file_utils import FileLock, atomic_write
+
+
+class CachedResponse:
+    """Запись кэша: тело ответа, время сохранения и валидаторы ETag / Last-Modified."""
+
+    def __init__(
+        self,
+        key: str,
+        body: Any,
+        stored_at: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        self.key = key
+        self.body = body
+        self.stored_at = stored_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def validators(self) -> Dict[str, str]:
+        """Заголовки условного запроса для перепроверки записи."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Кэш ответов API на диске: один JSON файл на пару URL + параметры запроса.
+
+    Запись моложе ttl секунд отдается без обращения к сети. Устаревшая запись перепроверяется
+    условным запросом (If-None-Match / If-Modified-Since), и ответ 304 продлевает ее без передачи тела.
+    В каталоге хранится не больше max_entries записей: при переполнении удаляются давно не читанные (LRU,
+    время последнего чтения - mtime файла).
+    """
+
+    def __init__(self, directory: str, ttl: float = 3600, max_entries: int = 1000) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries должен быть не меньше 1")
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Каталог создается при первой записи: кэш, в который ничего не записали, не оставляет следов на диске
+        self._lock = FileLock(os.path.join(directory, "cache"))
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Ключ записи: хэш URL и отсортированных параметров."""
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.sha256(f"{url}?{query}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Запись моложе ttl и не требует перепроверки."""
+        return time.time() - entry.stored_at < self.ttl
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[CachedResponse]:
+        """Запись для запроса (свежая или устаревшая); None, если ее нет или файл поврежден."""
+        key = self.make_key(url, params)
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = get_codec().loads(f.read())
+            entry = CachedResponse(
+                key, data["body"], float(data["stored_at"]), data.get("etag"), data.get("last_modified")
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        try:
+            # Отметка последнего чтения для вытеснения LRU
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        body: Any,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> CachedResponse:
+        """Сохраняет ответ и вытесняет лишние записи."""
+        entry = CachedResponse(self.make_key(url, params), body, time.time(), etag, last_modified)
+        self._write(entry)
+        return entry
+
+    def refresh(self, entry: CachedResponse) -> None:
+        """Продлевает запись после ответа 304 Not Modified."""
+        entry.stored_at = time.time()
+        self._write(entry)
+
+    def _write(self, entry: CachedResponse) -> None:
+        data = {
+            "stored_at": entry.stored_at,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "body": entry.body,
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            atomic_write(self._path(entry.key), get_codec().dumps(data))
+            self._evict()
+
+    def _evict(self) -> None:
+        """Удаляет давно не читанные записи сверх max_entries."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                entries.append((os.stat(os.path.join(self.directory, name)).st_mtime_ns, name))
+            except FileNotFoundError:
+                continue
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, name in entries[: len(entries) - self.max_entries]:
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        """Удаляет все записи кэша."""
+        if not os.path.isdir(self.directory):
+            return
+        with self._lock:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.unlink(os.path.join(self.directory, name))
+
+    def __len__(self) -> int:
+        if not os.path.isdir(self.directory):
+            return 0
+        return sum(1 for name in os.listdir(self.directory) if name.endswith(".json"))
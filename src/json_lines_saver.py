@@ -0,0 +1,131 @@
+import os
+from typing import Any, Dict, Iterable, Iterator, List
+
+from src.codec import JSONCodec, get_codec
+from src.file_utils import FileLock, atomic_write
+from src.json_saver import JSONSaver, StoreCorruptedError
+from src.json_saver_abstract import JSONAbstract
+from src.vacancy import Vacancy
+
+
+class JSONLinesSaver(JSONAbstract):
+    """Хранение вакансий в формате JSON Lines: одна запись на строку, файл только дописывается.
+
+    Удаление записывается строкой-надгробием {"_deleted": id}, повторная запись вакансии с тем же id
+    заменяет прежнюю. Файл переписывается целиком только в save_vacancies и compact.
+    """
+
+    TOMBSTONE_KEY = "_deleted"
+
+    def __init__(self, filename: str) -> None:
+        self.filename = JSONSaver.get_data_file_path(filename)
+        self._lock = FileLock(self.filename)
+
+    def _append_lines(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Дописывает записи в конец файла под блокировкой и сбрасывает их на диск (fsync) до ее снятия.
+
+        Если последняя строка файла недописана (сбой при прошлой записи), новые записи начинаются с новой
+        строки: к оборванной строке они не приклеиваются, и при загрузке пропускается только она.
+        """
+        data = self._encode_lines(records)
+        with self._lock:
+            with open(self.filename, "a+b") as f:
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        data = b"\n" + data
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _rewrite(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Атомарно переписывает файл указанными записями."""
+        data = self._encode_lines(records)
+        with self._lock:
+            atomic_write(self.filename, data)
+
+    @staticmethod
+    def _encode_lines(records: Iterable[Dict[str, Any]]) -> bytes:
+        """Записи журнала: компактный JSON общего кодека, по одной на строку."""
+        dumps = get_codec().dumps
+        return b"".join(dumps(record) + b"\n" for record in records)
+
+    def _replay(self) -> Dict[Any, Dict[str, Any]]:
+        """Проигрывает журнал и возвращает актуальные записи по id."""
+        records: Dict[Any, Dict[str, Any]] = {}
+        loads = get_codec().loads
+        with open(self.filename, "rb") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = loads(line)
+                except (JSONCodec.DecodeError, UnicodeDecodeError):
+                    # Недописанная строка после сбоя не должна ломать загрузку остальных
+                    print(f"Пропущена поврежденная строка {line_number} в файле {self.filename}.")
+                    continue
+                if self.TOMBSTONE_KEY in record:
+                    records.pop(record[self.TOMBSTONE_KEY], None)
+                else:
+                    records.pop(record.get("id"), None)
+                    records[record.get("id")] = record
+        return records
+
+    def save_vacancies(self, vacancies: List[Vacancy]) -> None:
+        """Переписывает файл указанным списком вакансий."""
+        self._rewrite(vacancy.to_dict() for vacancy in vacancies)
+
+    def load_vacancies(self) -> List[Vacancy]:
+        """Загружает актуальные вакансии из журнала."""
+        try:
+            return [Vacancy(**data) for data in self._replay().values()]
+        except FileNotFoundError:
+            print(f"Файл {self.filename} не найден.")
+            return []
+        except Exception as e:
+            print(f"Произошла ошибка: {e}")
+            return []
+
+    def add_vacancy(self, vacancy: Vacancy) -> None:
+        """Дописывает вакансию в конец файла."""
+        self._append_lines([vacancy.to_dict()])
+
+    def add_vacancies(self, vacancies: List[Vacancy]) -> None:
+        """Дописывает вакансии в конец файла."""
+        self._append_lines(vacancy.to_dict() for vacancy in vacancies)
+
+    def add_vacancies_stream(self, vacancies: Iterable[Vacancy]) -> Iterator[Vacancy]:
+        """Дописывает вакансии по мере поступления и отдает их дальше."""
+        for vacancy in vacancies:
+            self._append_lines([vacancy.to_dict()])
+            yield vacancy
+
+    def delete_vacancy(self, vacancy: Vacancy) -> None:
+        """Записывает надгробие для вакансии; файл не переписывается."""
+        self._append_lines([{self.TOMBSTONE_KEY: vacancy.id}])
+
+    def compact(self) -> int:
+        """Переписывает файл без удаленных и замененных записей, возвращает число оставшихся вакансий."""
+        with self._lock:
+            if not os.path.exists(self.filename):
+                return 0
+            records = self._replay()
+            self._rewrite(records.values())
+        return len(records)
+
+    def migrate_from_json(self, json_saver: JSONSaver, overwrite: bool = False) -> int:
+        """Однократный перенос вакансий из JSON массива (JSONSaver) в этот файл, возвращает их число.
+
+        Непустой журнал перезаписывается только с overwrite=True, иначе выдается FileExistsError. Если файл
+        JSONSaver не разобран, перенос отменяется с StoreCorruptedError и журнал не меняется.
+        """
+        if not os.path.exists(json_saver.filename):
+            return 0
+        with self._lock:
+            if not overwrite and os.path.exists(self.filename) and os.path.getsize(self.filename) > 0:
+                raise FileExistsError(f"Журнал {self.filename} не пуст: для переноса поверх него нужен overwrite=True")
+            vacancies = json_saver.load_vacancies()
+            if json_saver.corrupted:
+                raise StoreCorruptedError(f"Файл {json_saver.filename} поврежден, перенос отменен")
+            self.save_vacancies(vacancies)
+        return len(vacancies)
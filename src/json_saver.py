@@ -1,58 +1,397 @@
-import json
 import os
-from typing import Any, List
+import textwrap
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from src.codec import JSONCodec, get_codec
+from src.file_utils import FileLock, atomic_write
 from src.json_saver_abstract import JSONAbstract
+from src.projection import project, vacancy_field_tree
+from src.salary_index import SalaryRangeIndex
+from src.text_index import InvertedIndex
 from src.vacancy import Vacancy
 
 
+class StoreCorruptedError(ValueError):
+    """Файл хранилища не читается как JSON массив вакансий; запись в него отменена, чтобы не потерять данные."""
+
+
 class JSONSaver(JSONAbstract):
-    """Класс для работы с сохранением вакансий в JSON файл."""
+    """Класс для работы с сохранением вакансий в JSON файл.
+
+    fields - список сохраняемых полей (как в Vacancy.cast_to_object_iter), остальные поля в файл не пишутся;
+    compact - запись без отступов и пробелов; codec - кодек JSON (по умолчанию общий get_codec()).
+    """
 
-    def __init__(self, filename: str) -> None:
+    def __init__(
+        self,
+        filename: str,
+        fields: Optional[Iterable[str]] = None,
+        compact: bool = False,
+        codec: Optional[JSONCodec] = None,
+    ) -> None:
         self.filename = self.get_data_file_path(filename)
+        self.codec = codec
+        self.fields = tuple(fields) if fields is not None else None
+        self._field_tree = vacancy_field_tree(self.fields) if self.fields is not None else None
+        self.compact = compact
+        # Блокировка на запись, общая для всех процессов, работающих с этим файлом
+        self._lock = FileLock(self.filename)
+        # Индекс вакансий по id, сохраняется между вызовами и обновляется при записи
+        self._index: Optional[Dict[Any, Vacancy]] = None
+        # Время изменения и размер файла, по которым построен индекс
+        self._stamp: Optional[Tuple[int, int]] = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Поколение данных индекса и построенные по нему отсортированные списки зарплат
+        self._generation = 0
+        self._salary_order: Dict[str, Tuple[int, List[Any]]] = {}
+        self._salary_ranges: Optional[Tuple[int, SalaryRangeIndex]] = None
+        # Полнотекстовый индекс, хранится рядом с файлом вакансий
+        self.text_index_path = os.path.splitext(self.filename)[0] + ".index.json"
+        self._text_index: Optional[InvertedIndex] = None
+        # Файл есть, но не разобран (оборванная запись, ручная правка): изменения запрещены до исправления
+        self._corrupted = False
+        self.last_report: Dict[str, int] = self._empty_report()
+
+    @staticmethod
+    def _empty_report() -> Dict[str, int]:
+        """Отчет о записи: сколько вакансий добавлено, обновлено и пропущено как дубликаты."""
+        return {"inserted": 0, "updated": 0, "skipped": 0}
+
+    @property
+    def corrupted(self) -> bool:
+        """Файл есть, но при последней загрузке не разобран; изменения хранилища запрещены."""
+        return self._corrupted
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        """Время изменения и размер файла или None, если файла нет."""
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _is_cache_valid(self) -> bool:
+        """Индекс построен по текущей версии файла."""
+        return self._index is not None and self._stamp is not None and self._stamp == self._file_stamp()
+
+    def _get_index(self) -> Dict[Any, Vacancy]:
+        """Индекс вакансий по id; файл перечитывается, только если он изменился."""
+        self.load_vacancies()
+        return self._index if self._index is not None else {}
+
+    def refresh(self) -> bool:
+        """Перечитывает файл, если он изменился с прошлой загрузки или еще не загружался; True - файл перечитан."""
+        if self._index is not None and self._stamp == self._file_stamp():
+            return False
+        self.load_vacancies()
+        return True
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Число обращений к хранилищу, обслуженных из кэша и с чтением файла."""
+        return {"hits": self.cache_hits, "misses": self.cache_misses}
+
+    def _upsert(self, index: Dict[Any, Vacancy], vacancy: Vacancy, report: Dict[str, int]) -> str:
+        """Добавляет вакансию в индекс с учетом дубликатов, возвращает тип операции.
+
+        Вакансии сравниваются по записям в файле (после проекции на fields): поля, которые не сохраняются,
+        не делают вакансию измененной."""
+        existing = index.get(vacancy.id)
+        if existing is None:
+            operation = "inserted"
+        elif self._to_record(existing) == self._to_record(vacancy):
+            operation = "skipped"
+        else:
+            operation = "updated"
+        if operation != "skipped":
+            index[vacancy.id] = vacancy
+        report[operation] += 1
+        return operation
+
+    def get_vacancy(self, vacancy_id: Any) -> Optional[Vacancy]:
+        """Возвращает вакансию по id без просмотра всего списка."""
+        return self._get_index().get(vacancy_id)
+
+    def get_top_vacancies(self, n: int, rank: str = "max") -> List[Vacancy]:
+        """Топ N вакансий по зарплате (правило rank как в Vacancy.salary_key).
+
+        Отсортированный по зарплате список id строится один раз на версию данных,
+        повторные запросы берут из него первые N без пересортировки.
+        """
+        index = self._get_index()
+        cached = self._salary_order.get(rank)
+        if cached is None or cached[0] != self._generation:
+            keyed = [
+                (key, vacancy_id)
+                for vacancy_id, vacancy in index.items()
+                if (key := vacancy.salary_key(rank)) is not None
+            ]
+            order = sorted(keyed, key=lambda pair: pair[0], reverse=True)
+            cached = (self._generation, [vacancy_id for _, vacancy_id in order])
+            self._salary_order[rank] = cached
+        return [index[vacancy_id] for vacancy_id in cached[1][:n]]
+
+    def get_vacancies_by_salary(self, salary_from: float, salary_to: float, mode: str = "contains") -> List[Vacancy]:
+        """Вакансии по диапазону зарплат: contains - зарплата целиком в диапазоне, overlaps - пересекается с ним.
+
+        Индекс диапазонов строится один раз на версию данных.
+        """
+        index = self._get_index()
+        if self._salary_ranges is None or self._salary_ranges[0] != self._generation:
+            self._salary_ranges = (self._generation, SalaryRangeIndex(index.values()))
+        return self._salary_ranges[1].query(salary_from, salary_to, mode)
+
+    def _get_text_index(self) -> InvertedIndex:
+        """Полнотекстовый индекс для текущей версии файла: из памяти, с диска или построенный заново."""
+        index = self._get_index()
+        if self._text_index is None or self._stamp is None or self._text_index.stamp != self._stamp:
+            stored = InvertedIndex.load(self.text_index_path)
+            if stored is not None and self._stamp is not None and stored.stamp == self._stamp:
+                self._text_index = stored
+            else:
+                self._text_index = InvertedIndex.build(index.values())
+                self._text_index.stamp = self._stamp
+                if self._stamp is not None:
+                    with self._lock:
+                        self._text_index.save(self.text_index_path)
+        return self._text_index
+
+    def _sync_text_index(
+        self,
+        old_stamp: Optional[Tuple[int, int]],
+        added: Iterable[Vacancy] = (),
+        removed: Iterable[Any] = (),
+        persist: bool = True,
+    ) -> None:
+        """Переносит изменения хранилища в полнотекстовый индекс, если он соответствовал версии old_stamp."""
+        text_index = self._text_index
+        if text_index is None or old_stamp is None or text_index.stamp != old_stamp:
+            # Индекс не построен или устарел - он будет перестроен при следующем поиске
+            return
+        for vacancy_id in removed:
+            text_index.remove(vacancy_id)
+        for vacancy in added:
+            text_index.add(vacancy)
+        text_index.stamp = self._stamp
+        if persist:
+            text_index.save(self.text_index_path)
+
+    def search_vacancies(self, query: str, mode: str = "and") -> List[Vacancy]:
+        """Поиск по описанию и краткой информации вакансий через полнотекстовый индекс.
+
+        Слова запроса разделяются пробелами, слово со звездочкой на конце ищется как префикс;
+        mode="and" требует все слова, mode="or" - хотя бы одно.
+        """
+        text_index = self._get_text_index()
+        index = self._get_index()
+        return [index[vacancy_id] for vacancy_id in text_index.search(query, mode) if vacancy_id in index]
 
     @staticmethod
     def get_data_file_path(filename: str) -> str:
         """Получение абсолютного пути к файлу данных."""
         return os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", filename)
 
+    def _to_record(self, vacancy: Vacancy) -> Dict[str, Any]:
+        """Запись вакансии в файле: to_dict с проекцией на fields."""
+        data = vacancy.to_dict()
+        return data if self._field_tree is None else project(data, self._field_tree)
+
+    def _prepare(self, vacancy: Vacancy) -> Vacancy:
+        """Вакансия в том виде, в каком она будет прочитана из файла, чтобы кэш совпадал с диском."""
+        if self._field_tree is None:
+            return vacancy
+        return Vacancy.from_dict(self._to_record(vacancy))
+
+    def _dumps(self, data: Any) -> bytes:
+        return (self.codec or get_codec()).dumps(data, pretty=not self.compact)
+
     def save_vacancies(self, vacancies: List[Vacancy]) -> None:
-        """Сохраняет список вакансий в JSON файл."""
-        with open(self.filename, "w", encoding="utf-8") as f:
-            json.dump([vacancy.to_dict() for vacancy in vacancies], f, ensure_ascii=False, indent=4)
+        """Сохраняет список вакансий в JSON файл (атомарно, под блокировкой)."""
+        self._write_all(vacancies)
+
+    def _write_all(self, vacancies: List[Vacancy]) -> None:
+        """Перезаписывает файл вакансиями; в индекс попадают вакансии в том виде, в каком они записаны."""
+        records = [self._to_record(vacancy) for vacancy in vacancies]
+        data = self._dumps(records)
+        if self._field_tree is not None:
+            # Индекс строится из записанных записей, а не из переданных объектов: кэш совпадает с диском
+            vacancies = Vacancy.from_records(records)
+        with self._lock:
+            atomic_write(self.filename, data)
+            self._index = {vacancy.id: vacancy for vacancy in vacancies}
+            self._stamp = self._file_stamp()
+            self._corrupted = False
+            self._generation += 1
 
     def load_vacancies(self) -> List[Vacancy]:
-        """Загружает список вакансий из JSON файла."""
+        """Загружает список вакансий из JSON файла; пока файл не менялся, список берется из кэша."""
+        if self._is_cache_valid():
+            self.cache_hits += 1
+            return list(self._index.values())  # type: ignore[union-attr]
+        self.cache_misses += 1
         try:
-            with open(self.filename, "r", encoding="utf-8") as f:
-                vacancies_data = json.load(f)
+            # Разделяемая блокировка: дозапись (_append_to_array) меняет файл на месте, и без нее
+            # читатель мог бы застать массив без закрывающей скобки
+            with self._lock.shared(), open(self.filename, "rb") as f:
+                stamp = self._file_stamp()
+                vacancies_data = (self.codec or get_codec()).loads(f.read())
             # print(f"Загружено {len(vacancies_data)} вакансий из файла.")
-            return [Vacancy(**data) for data in vacancies_data]
+            vacancies = Vacancy.from_records(vacancies_data)
+            self._index = {vacancy.id: vacancy for vacancy in vacancies}
+            self._stamp = stamp
+            self._corrupted = False
+            self._generation += 1
+            return vacancies
         except FileNotFoundError:
             print(f"Файл {self.filename} не найден.")
+            self._index = {}
+            self._stamp = None
+            self._corrupted = False
             return []
-        except json.JSONDecodeError:
+        except JSONCodec.DecodeError:
             print(f"Ошибка декодирования JSON в файле vacancies.json.")
+            self._index = {}
+            self._stamp = None
+            self._corrupted = True
             return []
         except Exception as e:
             print(f"Произошла ошибка: {e}")
+            self._index = {}
+            self._stamp = None
+            self._corrupted = True
             return []
 
-    def add_vacancy(self, vacancy: Vacancy) -> None:
-        """Добавляет вакансию в JSON файл."""
-        vacancies = self.load_vacancies()
-        vacancies.append(vacancy)
-        self.save_vacancies(vacancies)
+    def _get_writable_index(self) -> Dict[Any, Vacancy]:
+        """Индекс для изменения хранилища; поврежденный файл не перезаписывается пустым или частичным списком."""
+        index = self._get_index()
+        if self._corrupted:
+            raise StoreCorruptedError(
+                f"Файл {self.filename} поврежден, изменения не записаны: исправьте файл или восстановите его"
+            )
+        return index
 
-    def add_vacancies(self, vacancies: list[Vacancy]) -> None:
-        """Добавляет все 2000 вакансий"""
-        old_vacancies = self.load_vacancies()
-        old_vacancies.extend(vacancies)
-        self.save_vacancies(old_vacancies)
+    def add_vacancy(self, vacancy: Vacancy) -> Dict[str, int]:
+        """Добавляет вакансию в JSON файл, вакансия с тем же id заменяется."""
+        return self.add_vacancies([vacancy])
+
+    def add_vacancies(self, vacancies: list[Vacancy]) -> Dict[str, int]:
+        """Добавляет вакансии без дубликатов по id и возвращает отчет о записи."""
+        report = self._empty_report()
+        vacancies = [self._prepare(vacancy) for vacancy in vacancies]
+        with self._lock:
+            index = self._get_writable_index()
+            old_stamp = self._stamp
+            changed = [vacancy for vacancy in vacancies if self._upsert(index, vacancy, report) != "skipped"]
+            if changed:
+                self._write_all(list(index.values()))
+                self._sync_text_index(old_stamp, added=changed)
+        self.last_report = report
+        return report
 
     def delete_vacancy(self, vacancy: Vacancy) -> Any:
         """Удаляет вакансию из JSON файла."""
-        vacancies = self.load_vacancies()
-        vacancies = [v for v in vacancies if v._id != vacancy._id]
-        self.save_vacancies(vacancies)
+        with self._lock:
+            index = self._get_writable_index()
+            old_stamp = self._stamp
+            if index.pop(vacancy.id, None) is not None:
+                self._write_all(list(index.values()))
+                self._sync_text_index(old_stamp, removed=[vacancy.id])
+
+    def add_vacancies_stream(self, vacancies: Iterable[Vacancy]) -> Iterator[Vacancy]:
+        """Дописывает вакансии в JSON файл по мере поступления и отдает их дальше.
+
+        Новая вакансия дописывается перед закрывающей скобкой массива, после каждой записи файл остается
+        корректным JSON. Блокировка берется на каждую запись, так что другие процессы могут писать
+        в тот же файл между страницами. Дубликаты по id пропускаются, а измененные вакансии записываются
+        одной перезаписью файла в конце - и тогда, когда источник прервался исключением или итерацию
+        остановили; итог доступен в last_report. Поврежденный файл не перезаписывается: выдается
+        StoreCorruptedError.
+        """
+        with self._lock:
+            if not os.path.exists(self.filename):
+                self._write_all([])
+        report = self._empty_report()
+        self.last_report = report
+        updated: List[Vacancy] = []
+        try:
+            for vacancy in vacancies:
+                stored = self._prepare(vacancy)
+                with self._lock:
+                    operation = self._upsert(self._get_writable_index(), stored, report)
+                    if operation == "inserted":
+                        old_stamp = self._stamp
+                        self._append_to_array(stored)
+                        self._sync_text_index(old_stamp, added=[stored], persist=False)
+                    elif operation == "updated":
+                        updated.append(stored)
+                yield vacancy
+        finally:
+            self._write_updated(updated)
+
+    def _write_updated(self, updated: List[Vacancy]) -> None:
+        """Записывает измененные потоком вакансии, которые пока есть только в индексе.
+
+        Если записать не удалось, индекс сбрасывается: кэш не должен отдавать версии, которых нет в файле.
+        """
+        with self._lock:
+            old_stamp = self._stamp
+            if updated:
+                try:
+                    index = self._get_writable_index()
+                    for vacancy in updated:
+                        index[vacancy.id] = vacancy
+                    self._write_all(list(index.values()))
+                except BaseException:
+                    self._index = None
+                    self._stamp = None
+                    raise
+            self._sync_text_index(old_stamp, added=updated)
+
+    def _append_to_array(self, vacancy: Vacancy) -> None:
+        """Дописывает вакансию перед закрывающей скобкой JSON массива, не читая файл целиком.
+
+        Сначала на диск (fsync) пишется сама вакансия, затем закрывающая скобка: оборванная запись оставляет
+        файл без скобки в конце, и следующая запись обнаружит повреждение, а не затрет данные.
+        """
+        if not os.path.exists(self.filename):
+            atomic_write(self.filename, b"[]")
+        with open(self.filename, "r+b") as f:
+            position, is_empty = self._find_array_end(f)
+            item = self._dumps(self._to_record(vacancy)).decode("utf-8")
+            if self.compact:
+                chunk, closing = ("" if is_empty else ",") + item, "]"
+            else:
+                chunk, closing = ("\n" if is_empty else ",\n") + textwrap.indent(item, " " * 4), "\n]"
+            f.seek(position)
+            f.write(chunk.encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+            f.write(closing.encode("utf-8"))
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+        # Запись сделана самим хранилищем, индекс остается актуальным
+        self._stamp = self._file_stamp()
+        self._generation += 1
+
+    @staticmethod
+    def _find_array_end(f: Any) -> Tuple[int, bool]:
+        """Позиция сразу после последнего элемента JSON массива и признак пустого массива.
+
+        Пустой файл становится пустым массивом; файл без закрывающей скобки (оборванная запись) не меняется,
+        выдается StoreCorruptedError.
+        """
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        tail_start = max(size - 4096, 0)
+        f.seek(tail_start)
+        tail = f.read().rstrip()
+        if not tail and tail_start == 0:
+            f.seek(0)
+            f.truncate()
+            f.write(b"[]")
+            return 1, True
+        if not tail.endswith(b"]"):
+            raise StoreCorruptedError(f"Файл {f.name} поврежден: нет закрывающей скобки массива")
+        body = tail[:-1].rstrip()
+        return tail_start + len(body), body.endswith(b"[")
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List, Optional
 from src.vacancy import Vacancy
 
+
 class JSONAbstract(ABC):
     @abstractmethod
     def save_vacancies(self, vacancies: List[Vacancy]) -> None:
@@ -14,8 +15,8 @@ class JSONAbstract(ABC):
         pass
 
     @abstractmethod
-    def add_vacancy(self, vacancy: Vacancy) -> None:
-        """Добавляет вакансию в файл."""
+    def add_vacancy(self, vacancy: Vacancy) -> Optional[Dict[str, int]]:
+        """Добавляет вакансию в файл; хранилище может вернуть отчет о записи (inserted/updated/skipped)."""
         pass
 
     @abstractmethod
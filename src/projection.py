@@ -0,0 +1,55 @@
+from typing import Any, Dict, Iterable, Optional
+
+# Поля, без которых вакансию нельзя восстановить и сравнить по зарплате; сохраняются при любой проекции
+REQUIRED_FIELDS = ("id", "name", "url", "salary", "currency")
+
+# Схема хранилища для меню: только поля, по которым идут запросы (зарплата, регион, поиск по snippet)
+STORE_FIELDS = (
+    "id",
+    "name",
+    "url",
+    "salary",
+    "currency",
+    "area.id",
+    "area.name",
+    "snippet.requirement",
+    "snippet.responsibility",
+)
+
+FieldTree = Dict[str, Optional[dict]]
+
+
+def field_tree(fields: Iterable[str]) -> FieldTree:
+    """Разбирает список полей (вложенные через точку: area.name) в дерево; None - поле целиком."""
+    tree: FieldTree = {}
+    for field in fields:
+        node = tree
+        parts = field.split(".")
+        for part in parts[:-1]:
+            child = node.get(part, {})
+            if child is None:
+                # Поле уже выбрано целиком
+                break
+            node = node.setdefault(part, child)
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+def project(data: Dict[str, Any], tree: FieldTree) -> Dict[str, Any]:
+    """Оставляет в словаре только поля из дерева, порядок ключей сохраняется."""
+    result = {}
+    for key, value in data.items():
+        if key not in tree:
+            continue
+        subtree = tree[key]
+        if subtree is None:
+            result[key] = value
+        elif isinstance(value, dict):
+            result[key] = project(value, subtree)
+    return result
+
+
+def vacancy_field_tree(fields: Iterable[str]) -> FieldTree:
+    """Дерево полей вакансии: выбранные поля плюс обязательные REQUIRED_FIELDS."""
+    return field_tree([*fields, *REQUIRED_FIELDS])
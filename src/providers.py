@@ -0,0 +1,114 @@
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from src.api import JobAPI
+from src.codec import get_codec
+from src.hh_api import HeadHunterAPI
+from src.vacancy import Vacancy
+
+
+class FileJobAPI(JobAPI):
+    """
+    Источник вакансий из JSON файла с записями в формате выдачи hh.ru (фикстуры, выгрузки других систем).
+
+    Файл читается при каждом запросе; вакансия подходит, если ключевое слово (без учета регистра) есть
+    в названии, требованиях или обязанностях. Пустое ключевое слово выбирает все записи.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def get_vacancies(self, keyword: str) -> List[Dict[str, Any]]:
+        with open(self.path, "rb") as f:
+            items = get_codec().loads(f.read())
+        keyword = keyword.lower()
+        return [item for item in items if keyword in self._text(item)]
+
+    @staticmethod
+    def _text(item: Dict[str, Any]) -> str:
+        snippet = item.get("snippet") or {}
+        parts = (item.get("name"), snippet.get("requirement"), snippet.get("responsibility"))
+        return " ".join(part for part in parts if part).lower()
+
+
+class SuperJobAPI(JobAPI):
+    """
+    Выгрузка вакансий с superjob.ru по api (нужен ключ приложения, по умолчанию из SUPERJOB_API_KEY).
+
+    Записи выдачи superjob приводятся к Vacancy в to_vacancy: id с префиксом sj (чтобы не совпадать с id hh.ru),
+    валюта rub - RUR, как у hh.ru.
+    """
+
+    PER_PAGE = 100
+    # Api отдает не больше 500 вакансий на запрос
+    MAX_PAGES = 5
+
+    def __init__(
+        self, api_key: Optional[str] = None, url: str = "https://api.superjob.ru/2.0/vacancies/", timeout: float = 10.0
+    ) -> None:
+        self.api_key = api_key if api_key is not None else os.getenv("SUPERJOB_API_KEY")
+        self.url = url
+        self.timeout = timeout
+        self.__session = requests.Session()
+
+    def close(self) -> None:
+        """Закрывает сессию и ее соединения"""
+        self.__session.close()
+
+    def get_vacancies(self, keyword: str) -> List[Dict[str, Any]]:
+        if not self.api_key:
+            raise ValueError("Для superjob.ru нужен ключ api: передайте api_key или задайте SUPERJOB_API_KEY")
+        vacancies: List[Dict[str, Any]] = []
+        for page in range(self.MAX_PAGES):
+            params: Dict[str, Any] = {"keyword": keyword, "page": page, "count": self.PER_PAGE}
+            response = self.__session.get(
+                self.url,
+                params=params,
+                headers={"X-Api-App-Id": self.api_key},
+                timeout=self.timeout,
+            )
+            if response.status_code != 200:
+                break
+            data = get_codec().loads(response.content)
+            vacancies.extend(data.get("objects", []))
+            if not data.get("more"):
+                break
+        return vacancies
+
+    def to_vacancy(self, item: Dict[str, Any]) -> Vacancy:
+        currency = (item.get("currency") or "rub").upper()
+        town = item.get("town") or {}
+        return Vacancy(
+            id=f"sj{item.get('id')}",
+            name=item.get("profession") or "Не указано",
+            area={"id": str(town["id"]), "name": town.get("title")} if town.get("id") is not None else {},
+            url=item.get("link") or "Не указано",
+            salary={"from": item.get("payment_from") or None, "to": item.get("payment_to") or None},
+            currency="RUR" if currency == "RUB" else currency,
+            snippet={"requirement": item.get("candidat"), "responsibility": item.get("work")},
+            employer=item.get("firm_name"),
+        )
+
+
+# Фабрики источников по имени; сторонние источники добавляются через register_provider
+PROVIDERS: Dict[str, Callable[..., JobAPI]] = {
+    "hh": HeadHunterAPI,
+    "superjob": SuperJobAPI,
+    "file": FileJobAPI,
+}
+
+
+def register_provider(name: str, factory: Callable[..., JobAPI]) -> None:
+    """Регистрирует источник вакансий (класс JobAPI или функцию, создающую его)."""
+    PROVIDERS[name] = factory
+
+
+def make_provider(spec: str, **options: Any) -> JobAPI:
+    """Источник по описанию "имя" или "имя:аргумент" (например, file:data/fixture.json)."""
+    name, _, argument = spec.partition(":")
+    if name not in PROVIDERS:
+        raise ValueError(f"Неизвестный источник вакансий: {name}")
+    args = (argument,) if argument else ()
+    return PROVIDERS[name](*args, **options)
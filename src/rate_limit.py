@@ -0,0 +1,140 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterable, Optional
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты запросов «ведро токенов», общий для всех потоков.
+
+    Ведро пополняется со скоростью rate токенов в секунду и вмещает не больше capacity токенов,
+    поэтому допускается короткий всплеск до capacity запросов, а в среднем - не больше rate в секунду.
+    pause() останавливает выдачу токенов всем потокам, например по Retry-After от сервера. Асинхронные клиенты
+    ждут токен через acquire_async() и могут делить одно ведро с синхронными.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate должен быть больше 0")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    def _wait_time(self) -> float:
+        """Сколько ждать до следующего токена; 0 - токен выдан. Вызывается под блокировкой."""
+        now = self._clock()
+        if now < self._paused_until:
+            return self._paused_until - now
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> float:
+        """Ждет токен; возвращает время ожидания в секундах."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                delay = self._wait_time()
+            if delay <= 0:
+                return waited
+            self._sleep(delay)
+            waited += delay
+
+    async def acquire_async(self) -> float:
+        """Как acquire, но ждет через asyncio.sleep, не останавливая цикл событий."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                delay = self._wait_time()
+            if delay <= 0:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Не выдавать токены seconds секунд."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+            self._tokens = 0.0
+
+
+class RetryPolicy:
+    """
+    Повтор запросов при временных ошибках: 429, 5xx и сбои соединения.
+
+    Пауза перед попыткой attempt (с нуля) - случайная величина от 0 до backoff * 2 ** attempt,
+    не больше max_backoff (экспоненциальная задержка с полным джиттером). Если сервер прислал Retry-After,
+    ждем указанное им время.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        statuses: Iterable[int] = (429, 500, 502, 503, 504),
+    ) -> None:
+        if max_retries < 0:
+            raise ValueError("max_retries не может быть отрицательным")
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+
+    def should_retry(self, status_code: int, attempt: int) -> bool:
+        return status_code in self.statuses and attempt < self.max_retries
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Пауза перед повтором номер attempt (с нуля)."""
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            return server_delay
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def wait_time(
+        self,
+        attempt: int,
+        status_code: Optional[int] = None,
+        retry_after: Optional[str] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+    ) -> float:
+        """Сколько ждать перед повтором номер attempt (status_code - None при сбое соединения).
+
+        Ответ 429 приостанавливает общий ограничитель rate_limiter для всех клиентов и потоков: пауза пройдет
+        в ожидании токена следующей попытки, и ждать отдельно не нужно (0)."""
+        delay = self.delay(attempt, retry_after)
+        if status_code == 429 and rate_limiter is not None:
+            rate_limiter.pause(delay)
+            return 0.0
+        return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After в секундах: число секунд или HTTP дата; None, если заголовка нет или он некорректен."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,140 @@
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from src.vacancy import Vacancy
+
+Interval = Tuple[float, float, int]
+
+
+class _Node:
+    """Узел центрированного дерева интервалов."""
+
+    __slots__ = ("center", "by_low", "by_high", "left", "right")
+
+    def __init__(self, center: float, intervals: List[Interval]) -> None:
+        self.center = center
+        self.by_low = sorted(intervals, key=lambda interval: interval[0])
+        self.by_high = sorted(intervals, key=lambda interval: interval[1], reverse=True)
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+
+
+def _build(intervals: List[Interval]) -> Optional[_Node]:
+    """Строит дерево: в узле интервалы, содержащие медиану концов, остальные уходят влево и вправо."""
+    if not intervals:
+        return None
+    endpoints = sorted(value for low, high, _ in intervals for value in (low, high))
+    center = endpoints[len(endpoints) // 2]
+    node = _Node(center, [interval for interval in intervals if interval[0] <= center <= interval[1]])
+    node.left = _build([interval for interval in intervals if interval[1] < center])
+    node.right = _build([interval for interval in intervals if interval[0] > center])
+    return node
+
+
+class SalaryRangeIndex:
+    """
+    Индекс по границам зарплаты для запросов по диапазону.
+
+    Учитываются все виды зарплаты Vacancy: диапазон (from, to) и одно число (from = to).
+    Пересечение с диапазоном [lo, hi] ищется за O(log N + k): интервалы, содержащие lo, дает дерево
+    интервалов, а интервалы, начинающиеся в (lo, hi], - бинарный поиск по отсортированным нижним границам.
+    Вхождение в диапазон - тоже O(log N + k): в окне нижних границ [lo, hi] интервалы с верхней границей
+    не больше hi находятся через минимум верхних границ на отрезке (разреженная таблица, O(1) на запрос).
+    """
+
+    def __init__(self, vacancies: Iterable[Vacancy]) -> None:
+        self.vacancies: List[Vacancy] = []
+        intervals: List[Interval] = []
+        for vacancy in vacancies:
+            bounds = vacancy.salary_bounds
+            if bounds is None:
+                continue
+            low, high = min(bounds), max(bounds)
+            intervals.append((low, high, len(self.vacancies)))
+            self.vacancies.append(vacancy)
+        self._by_low = sorted(intervals, key=lambda interval: interval[0])
+        self._lows = [interval[0] for interval in self._by_low]
+        self._highs = [interval[1] for interval in self._by_low]
+        self._min_high = self._build_min_table(self._highs)
+        self._root = _build(intervals)
+
+    @staticmethod
+    def _build_min_table(values: List[float]) -> List[List[int]]:
+        """Разреженная таблица: table[j][i] - позиция минимума values на отрезке [i, i + 2**j)."""
+        table = [list(range(len(values)))]
+        width = 1
+        while width * 2 <= len(values):
+            previous = table[-1]
+            table.append(
+                [left if values[left] <= values[right] else right for left, right in zip(previous, previous[width:])]
+            )
+            width *= 2
+        return table
+
+    def _argmin_high(self, start: int, end: int) -> int:
+        """Позиция наименьшей верхней границы на отрезке [start, end) окна нижних границ."""
+        level = (end - start).bit_length() - 1
+        row = self._min_high[level]
+        left, right = row[start], row[end - (1 << level)]
+        return left if self._highs[left] <= self._highs[right] else right
+
+    def __len__(self) -> int:
+        return len(self.vacancies)
+
+    def _stab(self, point: float) -> Iterator[int]:
+        """Номера интервалов, содержащих точку."""
+        node = self._root
+        while node is not None:
+            if point < node.center:
+                for low, _, position in node.by_low:
+                    if low > point:
+                        break
+                    yield position
+                node = node.left
+            elif point > node.center:
+                for _, high, position in node.by_high:
+                    if high < point:
+                        break
+                    yield position
+                node = node.right
+            else:
+                for _, _, position in node.by_low:
+                    yield position
+                return
+
+    def overlaps(self, salary_from: float, salary_to: float) -> List[Vacancy]:
+        """Вакансии, зарплата которых пересекается с диапазоном [salary_from, salary_to]."""
+        if salary_from > salary_to:
+            return []
+        positions = list(self._stab(salary_from))
+        start = bisect_right(self._lows, salary_from)
+        end = bisect_right(self._lows, salary_to)
+        positions.extend(interval[2] for interval in self._by_low[start:end])
+        return [self.vacancies[position] for position in sorted(positions)]
+
+    def contains(self, salary_from: float, salary_to: float) -> List[Vacancy]:
+        """Вакансии, зарплата которых целиком лежит в диапазоне [salary_from, salary_to]."""
+        start = bisect_left(self._lows, salary_from)
+        end = bisect_right(self._lows, salary_to)
+        positions = []
+        # Отрезок, где наименьшая верхняя граница больше hi, подходящих интервалов не содержит
+        segments = [(start, end)]
+        while segments:
+            start, end = segments.pop()
+            if start >= end:
+                continue
+            lowest = self._argmin_high(start, end)
+            if self._highs[lowest] > salary_to:
+                continue
+            positions.append(self._by_low[lowest][2])
+            segments.append((start, lowest))
+            segments.append((lowest + 1, end))
+        return [self.vacancies[position] for position in sorted(positions)]
+
+    def query(self, salary_from: float, salary_to: float, mode: str = "contains") -> List[Vacancy]:
+        """Запрос по диапазону: mode="contains" - вхождение, mode="overlaps" - пересечение."""
+        if mode == "contains":
+            return self.contains(salary_from, salary_to)
+        if mode == "overlaps":
+            return self.overlaps(salary_from, salary_to)
+        raise ValueError(f"Неизвестный режим фильтрации: {mode}")
@@ -0,0 +1,114 @@
+import sqlite3
+from typing import Any, Iterable, List, Optional, Tuple
+
+from src.codec import get_codec
+from src.json_saver import JSONSaver
+from src.json_saver_abstract import JSONAbstract
+from src.vacancy import Vacancy
+
+
+class SQLiteSaver(JSONAbstract):
+    """Хранение вакансий в SQLite.
+
+    Вакансия хранится как JSON в поле payload, для запросов рядом лежат индексированные колонки:
+    id (первичный ключ), границы зарплаты salary_from/salary_to и id региона area_id.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS vacancies (
+            id TEXT PRIMARY KEY,
+            salary_from REAL,
+            salary_to REAL,
+            area_id TEXT,
+            payload TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_vacancies_salary_from ON vacancies (salary_from);
+        CREATE INDEX IF NOT EXISTS idx_vacancies_salary_to ON vacancies (salary_to);
+        CREATE INDEX IF NOT EXISTS idx_vacancies_area_id ON vacancies (area_id);
+    """
+
+    def __init__(self, filename: str) -> None:
+        self.filename = JSONSaver.get_data_file_path(filename)
+        self.connection = sqlite3.connect(self.filename)
+        self.connection.executescript(self.SCHEMA)
+
+    def close(self) -> None:
+        """Закрывает соединение с базой."""
+        self.connection.close()
+
+    @staticmethod
+    def _salary_bounds(vacancy: Vacancy) -> Tuple[Optional[float], Optional[float]]:
+        """Нижняя и верхняя граница зарплаты в рублях; одно число дает одинаковые границы."""
+        return vacancy.salary_bounds or (None, None)
+
+    @classmethod
+    def _to_row(cls, vacancy: Vacancy) -> Tuple[Any, ...]:
+        """Строка таблицы для вакансии."""
+        salary_from, salary_to = cls._salary_bounds(vacancy)
+        area_id = vacancy.area.get("id") if isinstance(vacancy.area, dict) else None
+        payload = get_codec().dumps(vacancy.to_dict()).decode("utf-8")
+        return str(vacancy.id), salary_from, salary_to, None if area_id is None else str(area_id), payload
+
+    @staticmethod
+    def _to_vacancies(rows: Iterable[Tuple[str]]) -> List[Vacancy]:
+        """Восстанавливает вакансии из колонки payload."""
+        codec = get_codec()
+        return [Vacancy(**codec.loads(row[0])) for row in rows]
+
+    def save_vacancies(self, vacancies: List[Vacancy]) -> None:
+        """Заменяет содержимое таблицы указанным списком вакансий."""
+        with self.connection:
+            self.connection.execute("DELETE FROM vacancies")
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO vacancies VALUES (?, ?, ?, ?, ?)", [self._to_row(v) for v in vacancies]
+            )
+
+    def load_vacancies(self) -> List[Vacancy]:
+        """Загружает все вакансии в порядке добавления."""
+        return self._to_vacancies(self.connection.execute("SELECT payload FROM vacancies ORDER BY rowid"))
+
+    def add_vacancy(self, vacancy: Vacancy) -> None:
+        """Добавляет вакансию или заменяет вакансию с тем же id."""
+        self.add_vacancies([vacancy])
+
+    def add_vacancies(self, vacancies: List[Vacancy]) -> None:
+        """Добавляет вакансии одной транзакцией."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO vacancies VALUES (?, ?, ?, ?, ?)", [self._to_row(v) for v in vacancies]
+            )
+
+    def delete_vacancy(self, vacancy: Vacancy) -> None:
+        """Удаляет вакансию по id."""
+        with self.connection:
+            self.connection.execute("DELETE FROM vacancies WHERE id = ?", (str(vacancy.id),))
+
+    def get_vacancy_by_id(self, vacancy_id: Any) -> Optional[Vacancy]:
+        """Поиск вакансии по первичному ключу."""
+        rows = self._to_vacancies(
+            self.connection.execute("SELECT payload FROM vacancies WHERE id = ?", (str(vacancy_id),))
+        )
+        return rows[0] if rows else None
+
+    def get_top_vacancies(self, n: int) -> List[Vacancy]:
+        """Топ N вакансий по верхней границе зарплаты."""
+        return self._to_vacancies(
+            self.connection.execute(
+                "SELECT payload FROM vacancies WHERE salary_to IS NOT NULL ORDER BY salary_to DESC LIMIT ?", (n,)
+            )
+        )
+
+    def get_vacancies_by_salary(self, salary_from: float, salary_to: float) -> List[Vacancy]:
+        """Вакансии, зарплата которых целиком лежит в диапазоне [salary_from, salary_to]."""
+        return self._to_vacancies(
+            self.connection.execute(
+                "SELECT payload FROM vacancies WHERE salary_from >= ? AND salary_to <= ? ORDER BY salary_from",
+                (salary_from, salary_to),
+            )
+        )
+
+    def get_vacancies_by_area(self, area_id: Any) -> List[Vacancy]:
+        """Вакансии региона по его id."""
+        return self._to_vacancies(
+            self.connection.execute("SELECT payload FROM vacancies WHERE area_id = ? ORDER BY rowid", (str(area_id),))
+        )
@@ -0,0 +1,135 @@
+import re
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.codec import get_codec
+from src.file_utils import atomic_write
+from src.vacancy import Vacancy
+
+TAG_RE = re.compile(r"<[^>]+>")
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Разбивает текст на слова: без HTML тегов, в нижнем регистре, ё заменяется на е."""
+    if not text:
+        return []
+    return TOKEN_RE.findall(TAG_RE.sub(" ", text).lower().replace("ё", "е"))
+
+
+def vacancy_terms(vacancy: Vacancy) -> Set[str]:
+    """Слова из описания и краткой информации (требования и обязанности) вакансии."""
+    snippet = vacancy.snippet or {}
+    terms: Set[str] = set()
+    for text in (vacancy.description, snippet.get("requirement"), snippet.get("responsibility")):
+        terms.update(tokenize(text))
+    return terms
+
+
+class InvertedIndex:
+    """
+    Инвертированный индекс: слово -> множество id вакансий.
+
+    Запрос - слова через пробел; слово со звездочкой на конце ищется как префикс (разраб*).
+    Режим and требует все слова запроса, or - хотя бы одно. Индекс обновляется по одной вакансии
+    и сохраняется в JSON вместе с отметкой версии файла хранилища (stamp).
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[Any]] = {}
+        self._documents: Dict[Any, Set[str]] = {}
+        self._order: Dict[Any, int] = {}
+        self._next_order = 0
+        self._sorted_terms: Optional[List[str]] = None
+        self.stamp: Optional[Tuple[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, vacancy: Vacancy) -> None:
+        """Добавляет вакансию в индекс (прежняя версия с тем же id заменяется)."""
+        self._add_terms(vacancy.id, vacancy_terms(vacancy))
+
+    def _add_terms(self, vacancy_id: Any, terms: Set[str]) -> None:
+        if vacancy_id in self._documents:
+            self.remove(vacancy_id)
+        self._documents[vacancy_id] = terms
+        self._order[vacancy_id] = self._next_order
+        self._next_order += 1
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = set()
+                self._sorted_terms = None
+            postings.add(vacancy_id)
+
+    def remove(self, vacancy_id: Any) -> None:
+        """Удаляет вакансию из индекса."""
+        terms = self._documents.pop(vacancy_id, None)
+        if terms is None:
+            return
+        del self._order[vacancy_id]
+        for term in terms:
+            postings = self._postings[term]
+            postings.discard(vacancy_id)
+            if not postings:
+                del self._postings[term]
+                self._sorted_terms = None
+
+    def _match_term(self, term: str) -> Set[Any]:
+        """id вакансий для одного слова запроса (с учетом префикса)."""
+        if not term.endswith("*"):
+            return self._postings.get(term, set())
+        prefix = term[:-1]
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        result: Set[Any] = set()
+        position = bisect_left(self._sorted_terms, prefix)
+        while position < len(self._sorted_terms) and self._sorted_terms[position].startswith(prefix):
+            result |= self._postings[self._sorted_terms[position]]
+            position += 1
+        return result
+
+    def search(self, query: str, mode: str = "and") -> List[Any]:
+        """id вакансий, подходящих под запрос, в порядке их добавления в индекс."""
+        if mode not in ("and", "or"):
+            raise ValueError(f"Неизвестный режим поиска: {mode}")
+        terms = [term + "*" if raw.endswith("*") else term for raw in query.split() for term in tokenize(raw)]
+        if not terms:
+            return []
+        matches = [self._match_term(term) for term in terms]
+        if mode == "and":
+            result = set.intersection(*sorted(matches, key=len))
+        else:
+            result = set().union(*matches)
+        return sorted(result, key=self._order.__getitem__)
+
+    @classmethod
+    def build(cls, vacancies: Iterable[Vacancy]) -> "InvertedIndex":
+        """Строит индекс по набору вакансий."""
+        index = cls()
+        for vacancy in vacancies:
+            index.add(vacancy)
+        return index
+
+    def save(self, path: str) -> None:
+        """Сохраняет индекс в JSON файл (атомарно)."""
+        data = {
+            "stamp": self.stamp,
+            "documents": [[vacancy_id, sorted(terms)] for vacancy_id, terms in self._documents.items()],
+        }
+        atomic_write(path, get_codec().dumps(data))
+
+    @classmethod
+    def load(cls, path: str) -> Optional["InvertedIndex"]:
+        """Загружает индекс из файла; None, если файла нет или он поврежден."""
+        try:
+            with open(path, "rb") as f:
+                data = get_codec().loads(f.read())
+            index = cls()
+            for vacancy_id, terms in data["documents"]:
+                index._add_terms(vacancy_id, set(terms))
+            index.stamp = tuple(data["stamp"]) if data.get("stamp") else None
+            return index
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
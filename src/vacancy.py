@@ -1,9 +1,15 @@
+import heapq
 import json
+import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from src.currency import get_default_converter
+from src.projection import project, vacancy_field_tree
 from src.vacancy_mixin import VacancyMixin
 
+logger = logging.getLogger(__name__)
+
 
 class Vacancy(VacancyMixin):
     """
@@ -17,14 +23,21 @@ class Vacancy(VacancyMixin):
         salary (Union[int, Tuple[int, int]]): Зарплата, предложенная для вакансии.
         description (Optional[str]): Описание вакансии.
         snippet (dict): Краткая информация о вакансии.
+        currency (Optional[str]): Валюта зарплаты (код hh.ru), без нее зарплата считается в рублях.
     """
 
-    def __init__(self, id, name, area, url, salary, description=None, snippet=None, **kwargs) -> None:
+    def __init__(self, id, name, area, url, salary, description=None, snippet=None, currency=None, **kwargs) -> None:
         if not isinstance(name, str) or not name:
             raise ValueError("Название вакансии должно быть непустой строкой")
         if not isinstance(url, str) or not url:
             raise ValueError("URL должен быть непустой строкой")
+        self._assign(id, name, area, url, salary, description, snippet, currency, kwargs)
+
+    # Поля to_dict, остальные ключи записи попадают в kwargs
+    FIELDS = frozenset(("id", "name", "area", "url", "salary", "description", "snippet", "currency"))
 
+    def _assign(self, id, name, area, url, salary, description, snippet, currency, kwargs) -> None:
+        """Заполняет атрибуты без проверок (проверяют __init__ и from_records)."""
         self._id = id
         self.__name = name
         self.area = area
@@ -33,6 +46,51 @@ class Vacancy(VacancyMixin):
         self.snippet = snippet if snippet else {}
         self.kwargs = kwargs
         self._salary = self._validate_salary(salary)
+        if currency is None and isinstance(salary, dict):
+            currency = salary.get("currency")
+        self.currency = currency
+        # Границы зарплаты в рублях считаются один раз, сравнения и сортировки берут готовое значение
+        self._salary_base = self._normalize_bounds(self._salary, currency)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> List["Vacancy"]:
+        """Создает вакансии пачкой из словарей в формате to_dict (отсутствующий area - пустой словарь).
+
+        Название и URL проверяются для всей пачки до создания объектов, ошибка выдается одна: ValueError
+        перечисляет номера всех некорректных записей. Затем объекты заполняются через _assign без вызова
+        __init__ и без вывода на экран.
+        """
+        records = list(records)
+        invalid = [
+            position
+            for position, record in enumerate(records)
+            if not isinstance(record.get("name"), str)
+            or not record["name"]
+            or not isinstance(record.get("url"), str)
+            or not record["url"]
+        ]
+        if invalid:
+            raise ValueError(f"Некорректные записи вакансий (нет названия или URL): {invalid[:20]}")
+        fields = cls.FIELDS
+        new = cls.__new__
+        vacancies = []
+        for record in records:
+            vacancy = new(cls)
+            vacancy._assign(
+                record.get("id"),
+                record["name"],
+                record.get("area", {}),
+                record["url"],
+                record.get("salary"),
+                record.get("description"),
+                record.get("snippet"),
+                record.get("currency"),
+                {} if record.keys() <= fields else {k: v for k, v in record.items() if k not in fields},
+            )
+            vacancies.append(vacancy)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Создано вакансий: %d", len(vacancies), extra={"vacancy_count": len(vacancies)})
+        return vacancies
 
     # def __repr__(self) -> str:
     #     return (f"Vacancy(id={self.id}, name={self.name}, area={self.area}, url={self.url}, "
@@ -87,23 +145,27 @@ class Vacancy(VacancyMixin):
         return (f"Вакансия: "
             f"{self.__name}\nСсылка: {self.url}\nЗарплата: {salary_str}\nОписание: {self.snippet.get('responsibility', "Нет информации")}")
 
+    def _compare_key(self) -> Tuple[float, float]:
+        """Зарплата в рублях для сравнения; без зарплаты - нули."""
+        return self._salary_base or (0, 0)
+
     def __eq__(self, other: int) -> Any:
-        """Сравнивает зарплату текущей вакансии с другой вакансией на равенство."""
+        """Сравнивает зарплату текущей вакансии с другой вакансией на равенство (в рублях)."""
         if isinstance(other, Vacancy):
-            return self._salary == other._salary
-        return False
+            return self._compare_key() == other._compare_key()
+        return NotImplemented
 
     def __lt__(self, other: int) -> Any:
-        """Сравнивает зарплату текущей вакансии с другой вакансией на меньше."""
+        """Сравнивает зарплату текущей вакансии с другой вакансией на меньше (в рублях)."""
         if isinstance(other, Vacancy):
-            return self._salary < other._salary
-        return False
+            return self._compare_key() < other._compare_key()
+        return NotImplemented
 
     def __gt__(self, other: int) -> Any:
-        """Сравнивает зарплату текущей вакансии с другой вакансией на больше"""
+        """Сравнивает зарплату текущей вакансии с другой вакансией на больше (в рублях)"""
         if isinstance(other, Vacancy):
-            return self._salary > other._salary
-        return False
+            return self._compare_key() > other._compare_key()
+        return NotImplemented
 
     @staticmethod
     def _validate_salary(salary: (int, float, list, tuple)) -> int | tuple[int, int] | None:
@@ -118,6 +180,9 @@ class Vacancy(VacancyMixin):
             if to_salary:
                 return to_salary
             return 0
+        elif isinstance(salary, (list, tuple)) and len(salary) == 2:
+            # Диапазон (from, to) после сохранения в JSON читается как список
+            return salary[0], salary[1]
         elif isinstance(salary, (int, float)):
             # if salary.lower() in ["не указано", "зарплата не указана", ""]:
             #     return 0
@@ -136,6 +201,49 @@ class Vacancy(VacancyMixin):
             #     return 0
         return 0
 
+    @staticmethod
+    def _normalize_bounds(salary: Any, currency: Optional[str]) -> Optional[Tuple[float, float]]:
+        """Границы зарплаты в рублях; одно число дает равные границы, без зарплаты - None."""
+        if isinstance(salary, tuple):
+            bounds = salary[0], salary[1]
+        elif isinstance(salary, (int, float)) and salary:
+            bounds = salary, salary
+        else:
+            return None
+        rate = get_default_converter().rate(currency)
+        if rate == 1.0:
+            return bounds
+        return bounds[0] * rate, bounds[1] * rate
+
+    @property
+    def salary_bounds(self) -> Optional[Tuple[float, float]]:
+        """Нижняя и верхняя граница зарплаты в рублях; одно число дает равные границы, без зарплаты - None."""
+        return self._salary_base
+
+    def salary_key(self, rank: str = "max") -> Optional[float]:
+        """Значение зарплаты для ранжирования.
+
+        Диапазон ранжируется по правилу rank: max - по верхней границе, mid - по середине,
+        min - по нижней. Вакансия без зарплаты дает None.
+        """
+        bounds = self.salary_bounds
+        if bounds is None:
+            return None
+        if rank == "max":
+            return max(bounds)
+        if rank == "mid":
+            return (bounds[0] + bounds[1]) / 2
+        if rank == "min":
+            return min(bounds)
+        raise ValueError(f"Неизвестный способ ранжирования: {rank}")
+
+    @staticmethod
+    def top_by_salary(vacancies: Iterable["Vacancy"], n: int, rank: str = "max") -> List["Vacancy"]:
+        """Топ N вакансий по зарплате на ограниченной куче: O(len * log N) времени и O(N) памяти."""
+        keyed = ((vacancy.salary_key(rank), vacancy) for vacancy in vacancies)
+        with_salary = ((key, vacancy) for key, vacancy in keyed if key is not None)
+        return [vacancy for _, vacancy in heapq.nlargest(n, with_salary, key=lambda pair: pair[0])]
+
     def _get_salary_str(self) -> str:
         """Возвращает зарплату в виде строки."""
         if isinstance(self._salary, tuple):
@@ -145,20 +253,36 @@ class Vacancy(VacancyMixin):
         return "Зарплата не указана"
 
     @classmethod
-    def cast_to_object_list(cls, vacancies: List[Dict[str, Any]]) -> list:
+    def from_dict(cls, data: Dict[str, Any]) -> "Vacancy":
+        """Создает вакансию из словаря to_dict, в том числе урезанного проекцией (без area)."""
+        return cls(**{"area": {}, **data})
+
+    @classmethod
+    def cast_to_object_list(cls, vacancies: List[Dict[str, Any]], fields: Optional[Iterable[str]] = None) -> list:
         """Преобразует список вакансий в список объектов класса Vacancy."""
-        return [
-            cls(
-                id=vacancy.get("id", "Не указано"),
-                name=vacancy.get("name", "Не указано"),
-                area=vacancy.get("area", {}),
-                url=vacancy.get("alternate_url", "Не указано"),
-                salary=vacancy.get("salary", 0),
-                description=vacancy.get("description", "Не указано"),
-                snippet=vacancy.get("snippet", {}),
-            )
-            for vacancy in vacancies
-        ]
+        return list(cls.cast_to_object_iter(vacancies, fields))
+
+    @classmethod
+    def cast_to_object_iter(
+        cls, vacancies: Iterable[Dict[str, Any]], fields: Optional[Iterable[str]] = None
+    ) -> Iterator["Vacancy"]:
+        """Лениво преобразует поток вакансий в объекты класса Vacancy.
+
+        fields - список сохраняемых полей в терминах to_dict (вложенные через точку: area.name);
+        остальные поля отбрасываются сразу при создании объекта. Обязательные поля сохраняются всегда.
+        """
+        tree = vacancy_field_tree(fields) if fields is not None else None
+        for vacancy in vacancies:
+            data = {
+                "id": vacancy.get("id", "Не указано"),
+                "name": vacancy.get("name", "Не указано"),
+                "area": vacancy.get("area", {}),
+                "url": vacancy.get("alternate_url", "Не указано"),
+                "salary": vacancy.get("salary", 0),
+                "description": vacancy.get("description", "Не указано"),
+                "snippet": vacancy.get("snippet", {}),
+            }
+            yield cls(**data) if tree is None else cls.from_dict(project(data, tree))
 
     # @staticmethod
     # def _get_salary_str(vacancy: Dict[str, Any]) -> str:
@@ -185,6 +309,7 @@ class Vacancy(VacancyMixin):
             "salary": self._salary,
             "description": self.description,
             "snippet": self.snippet,
+            **({"currency": self.currency} if self.currency else {}),
             **self.kwargs,
         }
 
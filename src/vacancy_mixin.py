@@ -1,5 +1,8 @@
+import logging
 from typing import Any, Dict, Optional
 
+logger = logging.getLogger(__name__)
+
 
 class VacancyMixin:
 
@@ -21,8 +24,9 @@ class VacancyMixin:
         self._salary = salary
         self.snippet = snippet if snippet else {}
         self.kwargs = kwargs
-        print(repr(self))
-
+        # Отладочный вывод выключен по умолчанию; repr не строится, пока уровень DEBUG не включен
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Создана вакансия %r", self, extra={"vacancy_id": id})
 
     def __repr__(self) -> str:
         return (
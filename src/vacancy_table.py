@@ -0,0 +1,147 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from src.currency import CurrencyConverter, get_default_converter
+from src.vacancy import Vacancy
+
+
+class VacancyTable:
+    """
+    Колоночное представление вакансий для быстрых запросов по зарплате.
+
+    Границы зарплаты (в рублях), код валюты и id региона хранятся массивами NumPy, поэтому топ N и фильтры
+    по диапазону считаются векторно, без цикла по объектам. Отсутствующая граница зарплаты - nan,
+    отсутствующий регион - -1. Исходные записи доступны через rows().
+    """
+
+    def __init__(
+        self,
+        records: Sequence[Any],
+        salary_from: Sequence[float],
+        salary_to: Sequence[float],
+        currencies: Sequence[Optional[str]],
+        area_ids: Sequence[int],
+    ) -> None:
+        self.records = list(records)
+        self.salary_from = np.asarray(salary_from, dtype=np.float64)
+        self.salary_to = np.asarray(salary_to, dtype=np.float64)
+        self.area_id = np.asarray(area_ids, dtype=np.int64)
+        # Валюты кодируются номерами, словарь кодов общий для всей таблицы
+        codes: Dict[Optional[str], int] = {}
+        currency_codes = [codes.setdefault(currency, len(codes)) for currency in currencies]
+        self.currency_names: List[Optional[str]] = list(codes)
+        self.currency = np.asarray(currency_codes, dtype=np.int16)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @staticmethod
+    def _bounds(salary: Any) -> tuple:
+        """Границы зарплаты в формате hh.ru или Vacancy; отсутствующая граница - nan."""
+        if isinstance(salary, dict):
+            salary_from, salary_to = salary.get("from"), salary.get("to")
+        elif isinstance(salary, (list, tuple)) and len(salary) == 2:
+            salary_from, salary_to = salary
+        elif isinstance(salary, (int, float)) and salary:
+            salary_from, salary_to = salary, salary
+        else:
+            salary_from, salary_to = None, None
+        return (
+            np.nan if salary_from is None else float(salary_from),
+            np.nan if salary_to is None else float(salary_to),
+        )
+
+    @staticmethod
+    def _area_id(area: Any) -> int:
+        """Числовой id региона или -1."""
+        try:
+            return int(area.get("id"))
+        except (AttributeError, TypeError, ValueError):
+            return -1
+
+    @classmethod
+    def from_vacancies(cls, vacancies: Iterable[Vacancy]) -> "VacancyTable":
+        """Строит таблицу из объектов Vacancy (или CompactVacancy)."""
+        records = list(vacancies)
+        bounds = [cls._bounds(vacancy.salary_bounds) for vacancy in records]
+        return cls(
+            records,
+            [bound[0] for bound in bounds],
+            [bound[1] for bound in bounds],
+            [getattr(vacancy, "currency", None) for vacancy in records],
+            [cls._area_id(vacancy.area) for vacancy in records],
+        )
+
+    @classmethod
+    def from_raw(
+        cls, items: Iterable[Dict[str, Any]], converter: Optional[CurrencyConverter] = None
+    ) -> "VacancyTable":
+        """Строит таблицу из вакансий в формате ответа api.hh.ru, зарплата пересчитывается в рубли."""
+        converter = converter or get_default_converter()
+        records = list(items)
+        currencies = [(item.get("salary") or {}).get("currency") for item in records]
+        rates = np.asarray([converter.rate(currency) for currency in currencies], dtype=np.float64)
+        bounds = np.asarray([cls._bounds(item.get("salary")) for item in records], dtype=np.float64).reshape(-1, 2)
+        return cls(
+            records,
+            bounds[:, 0] * rates,
+            bounds[:, 1] * rates,
+            currencies,
+            [cls._area_id(item.get("area")) for item in records],
+        )
+
+    def _low_high(self) -> tuple:
+        """Нижняя и верхняя граница; если одна из них не указана, берется другая."""
+        low = np.where(np.isnan(self.salary_from), self.salary_to, self.salary_from)
+        high = np.where(np.isnan(self.salary_to), self.salary_from, self.salary_to)
+        return low, high
+
+    def salary_key(self, rank: str = "max") -> np.ndarray:
+        """Значение зарплаты для ранжирования: max - верхняя граница, mid - середина, min - нижняя."""
+        low, high = self._low_high()
+        if rank == "max":
+            return high
+        if rank == "mid":
+            return (low + high) / 2
+        if rank == "min":
+            return low
+        raise ValueError(f"Неизвестный способ ранжирования: {rank}")
+
+    def top_n(self, n: int, rank: str = "max") -> np.ndarray:
+        """Номера строк топ N вакансий по зарплате (по убыванию), вакансии без зарплаты не попадают."""
+        key = self.salary_key(rank)
+        candidates = np.flatnonzero(~np.isnan(key))
+        if n <= 0 or candidates.size == 0:
+            return np.empty(0, dtype=np.int64)
+        values = key[candidates]
+        if n < candidates.size:
+            # argpartition отбирает N лучших за O(len), сортируются только они
+            part = np.argpartition(-values, n - 1)[:n]
+            candidates, values = candidates[part], values[part]
+        return candidates[np.argsort(-values, kind="stable")]
+
+    def salary_range_mask(self, salary_from: float, salary_to: float, mode: str = "contains") -> np.ndarray:
+        """Маска строк по диапазону: contains - зарплата целиком в диапазоне, overlaps - пересекается с ним."""
+        low, high = self._low_high()
+        with np.errstate(invalid="ignore"):
+            if mode == "contains":
+                return (low >= salary_from) & (high <= salary_to)
+            if mode == "overlaps":
+                return (low <= salary_to) & (high >= salary_from)
+        raise ValueError(f"Неизвестный режим фильтрации: {mode}")
+
+    def currency_mask(self, currency: Optional[str]) -> np.ndarray:
+        """Маска строк с указанной валютой."""
+        if currency not in self.currency_names:
+            return np.zeros(len(self), dtype=bool)
+        return self.currency == self.currency_names.index(currency)
+
+    def area_mask(self, area_id: int) -> np.ndarray:
+        """Маска строк указанного региона."""
+        return self.area_id == int(area_id)
+
+    def rows(self, selection: Any) -> List[Any]:
+        """Исходные записи по номерам строк или булевой маске."""
+        indices = np.flatnonzero(selection) if np.asarray(selection).dtype == bool else selection
+        return [self.records[i] for i in indices]
@@ -0,0 +1,69 @@
+import os
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from src.codec import get_codec
+from src.file_utils import FileLock, atomic_write
+
+PUBLISHED_AT_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+
+
+def parse_published_at(value: Optional[str]) -> Optional[datetime]:
+    """Дата публикации hh.ru (2024-01-15T10:30:00+0300); None, если значение пустое или некорректное."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, PUBLISHED_AT_FORMAT)
+    except ValueError:
+        return None
+
+
+class WatermarkStore:
+    """
+    Отметки инкрементальной выгрузки: для каждого запроса - самая поздняя дата публикации (published_at),
+    уже попавшая в хранилище.
+
+    Отметки хранятся в JSON файле (по умолчанию data/watermarks.json) и перезаписываются атомарно под
+    блокировкой, так что несколько процессов могут обновлять отметки разных запросов.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = FileLock(path)
+
+    @staticmethod
+    def key(keyword: str, area: Optional[str] = None) -> str:
+        return keyword if area is None else f"{keyword};{area}"
+
+    def load(self) -> Dict[str, str]:
+        """Все отметки; пустой словарь, если файла нет или он поврежден."""
+        try:
+            with open(self.path, "rb") as f:
+                data = get_codec().loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, keyword: str, area: Optional[str] = None) -> Optional[str]:
+        return self.load().get(self.key(keyword, area))
+
+    def set(self, keyword: str, area: Optional[str], published_at: str) -> None:
+        """Сохраняет отметку запроса; более ранняя дата не заменяет более позднюю."""
+        self.update({(keyword, area): published_at})
+
+    def update(self, marks: Dict[Tuple[str, Optional[str]], str]) -> None:
+        """Сохраняет отметки нескольких запросов ((ключевое слово, регион) -> published_at) одной записью."""
+        with self._lock:
+            data = self.load()
+            changed = False
+            for (keyword, area), published_at in marks.items():
+                key = self.key(keyword, area)
+                current = parse_published_at(data.get(key))
+                new = parse_published_at(published_at)
+                if new is None or (current is not None and current >= new):
+                    continue
+                data[key] = published_at
+                changed = True
+            if changed:
+                atomic_write(self.path, get_codec().dumps(data, pretty=True))
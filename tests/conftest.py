@@ -1,12 +1,28 @@
+import hashlib
+import json
 import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
 
 import pytest
 
+from src import currency
 from src.hh_api import HeadHunterAPI
 from src.json_saver import JSONSaver
 from src.vacancy import Vacancy
 
 
+@pytest.fixture(autouse=True)
+def rates_cache(tmp_path, monkeypatch):
+    """Кэш курсов конвертера по умолчанию пишется во временный каталог, а не в data/."""
+    cache_file = str(tmp_path / "rates.json")
+    monkeypatch.setattr(currency, "DEFAULT_CACHE_FILE", cache_file)
+    monkeypatch.setattr(currency, "_default_converter", None)
+    return cache_file
+
+
 @pytest.fixture
 def mock_vacancy_data():
     """Создает тестовые данные вакансии."""
@@ -46,8 +62,14 @@ def sample_vacancy():
 
 
 @pytest.fixture
-def json_saver():
-    return JSONSaver("test_vacancies.json")
+def json_saver(tmp_path):
+    return JSONSaver(str(tmp_path / "test_vacancies.json"))
+
+
+@pytest.fixture
+def tmp_json_saver(tmp_path):
+    """JSONSaver, работающий с временным файлом вместо data/."""
+    return JSONSaver(str(tmp_path / "vacancies.json"))
 
     # @pytest.fixture
     # def hh_api():
@@ -77,3 +99,109 @@ def vacancy_data():
         "description": "Test description 2",
         "snippet": {"requirement": "Java, Spring", "responsibility": "Developing applications"},
     }
+
+
+class StubHHServer:
+    """Локальный HTTP-сервер, отдающий страницы выдачи в формате api.hh.ru."""
+
+    def __init__(self, total: int = 250, delay: float = 0.0) -> None:
+        self.items = [{"id": str(i), "name": f"Vacancy {i}", "alternate_url": f"http://hh/{i}"} for i in range(total)]
+        self.delay = delay
+        # Включают валидаторы ответа: ETag по содержимому и фиксированный Last-Modified
+        self.etag = False
+        self.last_modified = None
+        self.not_modified = 0
+        # Временные ошибки: номер страницы -> список (статус, Retry-After), отдаются по одной до нормального ответа
+        self.faults: dict = {}
+        # Глубина выдачи, как у hh.ru (2000): дальше страницы не отдаются, found остается полным
+        self.max_depth = None
+        self.requests: list = []
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+                with server.lock:
+                    server.requests.append(query)
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                    faults = server.faults.get(int(query.get("page", 0)))
+                    fault = faults.pop(0) if faults else None
+                if fault is not None:
+                    with server.lock:
+                        server.active -= 1
+                    status, retry_after = fault
+                    self.send_response(status)
+                    if retry_after is not None:
+                        self.send_header("Retry-After", str(retry_after))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                try:
+                    if server.delay:
+                        time.sleep(server.delay)
+                    status, body = server.handle(query)
+                finally:
+                    with server.lock:
+                        server.active -= 1
+                payload = json.dumps(body).encode("utf-8")
+                etag = f'"{hashlib.sha1(payload).hexdigest()}"' if server.etag and status == 200 else None
+                last_modified = server.last_modified if status == 200 else None
+                if (etag and self.headers.get("If-None-Match") == etag) or (
+                    last_modified and self.headers.get("If-Modified-Since") == last_modified
+                ):
+                    with server.lock:
+                        server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                if etag:
+                    self.send_header("ETag", etag)
+                if last_modified:
+                    self.send_header("Last-Modified", last_modified)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/vacancies"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    def handle(self, query: dict) -> tuple:
+        """Формирует ответ на запрос страницы: (статус, тело)."""
+        page = int(query.get("page", 0))
+        per_page = int(query.get("per_page", 20))
+        found = self.items
+        # Даты в одном часовом поясе, строки сравниваются как даты
+        if "date_from" in query:
+            found = [item for item in found if item.get("published_at", "") >= query["date_from"]]
+        if "date_to" in query:
+            found = [item for item in found if item.get("published_at", "") <= query["date_to"]]
+        if query.get("order_by") == "publication_time":
+            found = sorted(found, key=lambda item: item.get("published_at", ""), reverse=True)
+        depth = len(found) if self.max_depth is None else min(len(found), self.max_depth)
+        pages = -(-depth // per_page)
+        if page >= pages:
+            return 400, {"errors": [{"type": "bad_argument"}]}
+        items = found[page * per_page : (page + 1) * per_page]
+        return 200, {"items": items, "found": len(found), "pages": pages, "page": page, "per_page": per_page}
+
+
+@pytest.fixture
+def hh_server():
+    server = StubHHServer()
+    server.thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
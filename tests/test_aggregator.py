@@ -0,0 +1,155 @@
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.aggregator import Aggregator, main, normalize_text, normalize_url
+from src.api import JobAPI
+from src.hh_api import HeadHunterAPI
+from src.providers import PROVIDERS, FileJobAPI, SuperJobAPI, make_provider, register_provider
+
+
+class SlowJobAPI(JobAPI):
+    def __init__(self, items, delay=0.0, error=None):
+        self.items = items
+        self.delay = delay
+        self.error = error
+
+    def get_vacancies(self, keyword):
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.items
+
+
+def hh_item(id, name, url, employer=None):
+    return {"id": id, "name": name, "alternate_url": url, "employer": {"name": employer} if employer else None}
+
+
+@pytest.fixture
+def fixture_file(tmp_path):
+    path = tmp_path / "fixture.json"
+    items = [
+        hh_item("f1", "Python разработчик", "https://www.hh.ru/vacancy/1/", "Яндекс"),
+        hh_item("f2", "Java Developer", "https://example.com/java", "Acme"),
+    ]
+    path.write_text(json.dumps(items, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+def test_normalize():
+    assert normalize_url("HTTPS://www.hh.ru/vacancy/1/?from=main") == normalize_url("http://hh.ru/vacancy/1")
+    assert normalize_url("Не указано") == ""
+    assert normalize_text("Python-разработчик (Senior)") == "python разработчик senior"
+
+
+def test_dedup_by_url_and_title_employer():
+    aggregator = Aggregator(
+        {
+            "a": SlowJobAPI([hh_item("1", "Python разработчик", "http://hh.ru/vacancy/1", "Яндекс")]),
+            "b": SlowJobAPI(
+                [
+                    hh_item("2", "Другое название", "https://www.hh.ru/vacancy/1/"),
+                    hh_item("3", "PYTHON-разработчик", "http://board/3", "ЯНДЕКС"),
+                    hh_item("4", "Python разработчик", "http://board/4", "Другая компания"),
+                ],
+                delay=0.05,
+            ),
+        }
+    )
+    vacancies = aggregator.search("python")
+    assert [(v.id, v.kwargs["source"]) for v in vacancies] == [("1", "a"), ("4", "b")]
+    assert aggregator.stats["b"]["duplicates"] == 2
+
+
+def test_malformed_records_are_skipped(caplog):
+    items = [
+        "не запись",
+        {"id": "1", "name": "Python", "alternate_url": "http://board/1", "employer": "Acme"},
+        {"id": "2", "name": None, "alternate_url": "http://board/2"},
+        hh_item("3", "Python", "http://board/3"),
+    ]
+    aggregator = Aggregator({"a": SlowJobAPI(items)})
+    assert [v.id for v in aggregator.search("python")] == ["3"]
+    assert aggregator.stats["a"]["invalid"] == 3 and aggregator.stats["a"]["error"] is None
+    assert caplog.text.count("запись пропущена") == 3
+
+
+def test_latency_bounded_by_slowest_provider():
+    providers = {str(i): SlowJobAPI([hh_item(str(i), "Python", f"http://board/{i}")], delay=0.3) for i in range(4)}
+    started = time.perf_counter()
+    assert len(Aggregator(providers).search("python")) == 4
+    assert time.perf_counter() - started < 0.9
+
+
+def test_failed_and_slow_providers_do_not_block_others():
+    aggregator = Aggregator(
+        {
+            "ok": SlowJobAPI([hh_item("1", "Python", "http://board/1")]),
+            "broken": SlowJobAPI([], error=ValueError("нет ключа")),
+            "slow": SlowJobAPI([hh_item("2", "Python", "http://board/2")], delay=2),
+        },
+        timeout=0.3,
+    )
+    started = time.perf_counter()
+    assert [v.id for v in aggregator.search("python")] == ["1"]
+    assert time.perf_counter() - started < 1
+    assert aggregator.stats["broken"]["error"] == "нет ключа"
+    assert "нет ответа" in aggregator.stats["slow"]["error"]
+
+
+def test_hh_and_file_providers(hh_server, fixture_file):
+    hh_server.items[1]["alternate_url"] = "https://example.com/java"
+    aggregator = Aggregator({"hh": HeadHunterAPI(url=hh_server.url), "file": FileJobAPI(fixture_file)})
+    vacancies = aggregator.search("java")
+    # Вакансия из файла опубликована и на hh.ru (тот же URL) и попадает в результат один раз
+    assert len(vacancies) == 250
+    assert (aggregator.stats["hh"]["found"], aggregator.stats["file"]["found"]) == (250, 1)
+    assert sum(stats["duplicates"] for stats in aggregator.stats.values()) == 1
+
+
+def test_registry(fixture_file):
+    provider = make_provider(f"file:{fixture_file}")
+    assert isinstance(provider, FileJobAPI)
+    assert [item["id"] for item in provider.get_vacancies("PYTHON")] == ["f1"]
+    with pytest.raises(ValueError):
+        make_provider("unknown")
+    register_provider("fixed", lambda: SlowJobAPI([]))
+    try:
+        assert isinstance(make_provider("fixed"), SlowJobAPI)
+    finally:
+        del PROVIDERS["fixed"]
+
+
+@patch("src.providers.requests.Session.get")
+def test_superjob(mock_get):
+    item = {
+        "id": 7,
+        "profession": "Python разработчик",
+        "link": "https://www.superjob.ru/vakansii/7.html",
+        "payment_from": 100000,
+        "payment_to": 0,
+        "currency": "rub",
+        "firm_name": "Яндекс",
+        "town": {"id": 4, "title": "Москва"},
+        "candidat": "Python",
+        "work": "Разработка",
+    }
+    mock_get.return_value = MagicMock(status_code=200, content=json.dumps({"objects": [item], "more": False}).encode())
+    provider = SuperJobAPI(api_key="key")
+    items = provider.get_vacancies("python")
+    assert mock_get.call_args.kwargs["headers"] == {"X-Api-App-Id": "key"}
+
+    vacancy = provider.to_vacancy(items[0])
+    assert (vacancy.id, vacancy.salary, vacancy.currency) == ("sj7", 100000, "RUR")
+    assert vacancy.area == {"id": "4", "name": "Москва"} and vacancy.kwargs["employer"] == "Яндекс"
+    with pytest.raises(ValueError):
+        SuperJobAPI(api_key="").get_vacancies("python")
+
+
+def test_main(fixture_file, tmp_path, capsys):
+    store = tmp_path / "store.json"
+    main(["разработчик", "--provider", f"file:{fixture_file}", "--store", str(store)])
+    assert [v["id"] for v in json.loads(store.read_text(encoding="utf-8"))] == ["f1"]
+    assert "добавлено 1" in capsys.readouterr().out
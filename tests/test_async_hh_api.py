@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from src.async_hh_api import AsyncHeadHunterAPI  # noqa: E402
+from src.hh_api import PageFetchError  # noqa: E402
+from src.rate_limit import RetryPolicy  # noqa: E402
+
+
+def run(coroutine_factory, **kwargs):
+    """Выполняет сценарий с клиентом на новом цикле событий и закрывает клиент."""
+
+    async def scenario():
+        async with AsyncHeadHunterAPI(**kwargs) as hh_api:
+            return await coroutine_factory(hh_api), hh_api.get_metrics()
+
+    return asyncio.run(scenario())
+
+
+def test_get_vacancies_keeps_page_order(hh_server):
+    vacancies, metrics = run(lambda api: api.get_vacancies("Python"), url=hh_server.url)
+    assert [v["id"] for v in vacancies] == [str(i) for i in range(250)]
+    assert sorted(int(r["page"]) for r in hh_server.requests) == [0, 1, 2]
+    assert metrics["requests"] == 3
+
+
+def test_search_many_shares_concurrency_limit(hh_server):
+    hh_server.items = hh_server.items * 8
+    hh_server.delay = 0.05
+    results, metrics = run(
+        lambda api: api.search_many(["Python", "Java", "Go"]), url=hh_server.url, max_concurrency=3
+    )
+    assert {keyword: len(items) for keyword, items in results.items()} == {"Python": 2000, "Java": 2000, "Go": 2000}
+    assert 1 < hh_server.max_active <= 3
+    assert metrics["max_in_flight"] <= 3
+
+
+def test_retry_and_area_filter(hh_server):
+    hh_server.faults = {1: [(503, 0)]}
+    vacancies, metrics = run(lambda api: api.get_vacancies("Python", area="1"), url=hh_server.url)
+    assert len(vacancies) == 250
+    assert metrics["retried"] == 1 and metrics["failed"] == 0
+    assert all(r["area"] == "1" for r in hh_server.requests)
+
+
+def test_failed_page_raises(hh_server):
+    hh_server.faults = {1: [(503, 0)] * 2}
+    with pytest.raises(PageFetchError):
+        run(lambda api: api.get_vacancies("Python"), url=hh_server.url, retry=RetryPolicy(max_retries=1, backoff=0.01))
+
+
+def test_final_error_inside_known_pages_raises(hh_server):
+    hh_server.faults = {1: [(403, None)]}
+    with pytest.raises(PageFetchError) as error:
+        run(lambda api: api.get_vacancies("Python"), url=hh_server.url)
+    assert error.value.page == 1 and error.value.status_code == 403
+
+
+def test_first_page_error(hh_server):
+    hh_server.items = []
+    vacancies, _ = run(lambda api: api.get_vacancies("Python"), url=hh_server.url)
+    assert vacancies == []
+
+
+def test_timeout_cancels_pending_pages(hh_server):
+    hh_server.items = hh_server.items * 8
+    hh_server.delay = 0.2
+
+    async def scenario(api):
+        with pytest.raises(asyncio.TimeoutError):
+            await api.get_vacancies("Python", timeout=0.3)
+        return len(asyncio.all_tasks()) - 1
+
+    pending, _ = run(scenario, url=hh_server.url, max_concurrency=2)
+    assert pending == 0
+    assert len(hh_server.requests) < 20
+
+
+def test_transport_error_is_raised_after_retries():
+    with pytest.raises(httpx.ConnectError):
+        run(
+            lambda api: api.get_vacancies("Python"),
+            url="http://127.0.0.1:1/vacancies",
+            retry=RetryPolicy(max_retries=1, backoff=0),
+        )
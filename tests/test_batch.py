@@ -0,0 +1,99 @@
+import json
+
+import pytest
+import requests
+
+from src.batch import BatchCollector, main, read_queries
+from src.hh_api import HeadHunterAPI
+from src.rate_limit import RetryPolicy
+from src.watermark import WatermarkStore
+
+
+def test_read_queries(tmp_path):
+    path = tmp_path / "queries.txt"
+    path.write_text("# ночная выгрузка\nPython\n\nPython;1\n Java ; 2 \nPython\n", encoding="utf-8")
+    assert read_queries(str(path)) == [("Python", None), ("Python", "1"), ("Java", "2")]
+
+
+def test_batch_dedups_across_queries(hh_server, tmp_json_saver, capsys):
+    hh_server.items = hh_server.items[:150]
+    hh_api = HeadHunterAPI(max_workers=2, url=hh_server.url)
+    collector = BatchCollector(hh_api, tmp_json_saver)
+    report = collector.run([("Python", None), ("Python", "1"), ("Java", "2")])
+
+    assert report == {"inserted": 150, "updated": 0, "skipped": 0}
+    assert [(s["found"], s["unique"], s["duplicates"]) for s in collector.stats] == [
+        (150, 150, 0),
+        (150, 0, 150),
+        (150, 0, 150),
+    ]
+    assert len(tmp_json_saver.load_vacancies()) == 150
+    assert [r.get("area") for r in hh_server.requests if r["page"] == "0"] == [None, "1", "2"]
+    assert "Java (регион 2): найдено 150, новых 0, повторов 150" in capsys.readouterr().out
+
+
+def test_batch_failed_query_does_not_stop_batch(hh_server, tmp_json_saver, capsys):
+    hh_server.faults = {0: [(503, 0)] * 2}
+    hh_api = HeadHunterAPI(url=hh_server.url, retry=RetryPolicy(max_retries=1, backoff=0.01))
+    collector = BatchCollector(hh_api, tmp_json_saver)
+    assert collector.run([("Python", None), ("Java", None)])["inserted"] == 250
+    assert "HTTP 503" in collector.stats[0]["error"] and collector.stats[1]["error"] is None
+    assert "Python: выгрузка неполная, найдено 0" in capsys.readouterr().out
+
+
+def test_batch_connection_error_does_not_stop_batch(hh_server, tmp_json_saver, capsys):
+    hh_api = HeadHunterAPI(url=hh_server.url)
+    iter_vacancies = hh_api.iter_vacancies
+
+    def flaky(keyword, area=None):
+        if keyword == "Python":
+            raise requests.ConnectionError("connection reset")
+        return iter_vacancies(keyword, area)
+
+    hh_api.iter_vacancies = flaky
+    collector = BatchCollector(hh_api, tmp_json_saver)
+    assert collector.run([("Python", None), ("Java", None)])["inserted"] == 250
+    assert collector.stats[0]["error"] == "connection reset" and collector.stats[1]["error"] is None
+    assert "Python: выгрузка неполная, найдено 0 - connection reset" in capsys.readouterr().out
+
+
+def test_batch_main(hh_server, tmp_path, capsys):
+    queries = tmp_path / "queries.txt"
+    queries.write_text("Python\nJava\n", encoding="utf-8")
+    store = tmp_path / "store.json"
+    main([str(queries), "--store", str(store), "--url", hh_server.url, "--cache-ttl", "0", "--rate", "1000"])
+
+    assert len(json.loads(store.read_text(encoding="utf-8"))) == 250
+    output = capsys.readouterr().out
+    assert "Запросов в пакете: 2, уникальных вакансий: 250" in output
+    assert "добавлено 250" in output
+
+
+def test_batch_incremental(hh_server, tmp_json_saver, tmp_path):
+    for i, item in enumerate(hh_server.items):
+        item["published_at"] = f"2024-01-01T{i // 60:02d}:{i % 60:02d}:00+0300"
+    hh_api = HeadHunterAPI(url=hh_server.url, watermarks=WatermarkStore(str(tmp_path / "watermarks.json")))
+    BatchCollector(hh_api, tmp_json_saver, incremental=True).run([("Python", None)])
+
+    hh_server.items.append(
+        {"id": "new", "name": "New", "alternate_url": "http://hh/new", "published_at": "2024-01-01T05:00:00+0300"}
+    )
+    hh_server.requests.clear()
+    report = BatchCollector(hh_api, tmp_json_saver, incremental=True).run([("Python", None)])
+    assert report == {"inserted": 1, "updated": 0, "skipped": 1}
+    assert len(hh_server.requests) == 1
+    assert len(tmp_json_saver.load_vacancies()) == 251
+
+
+def test_batch_incremental_keeps_watermark_when_store_fails(hh_server, tmp_json_saver, tmp_path, monkeypatch):
+    hh_server.items[0]["published_at"] = "2024-01-01T10:00:00+0300"
+    watermarks = WatermarkStore(str(tmp_path / "watermarks.json"))
+    hh_api = HeadHunterAPI(url=hh_server.url, watermarks=watermarks)
+
+    def fail(vacancies):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(tmp_json_saver, "_write_all", fail)
+    with pytest.raises(OSError):
+        BatchCollector(hh_api, tmp_json_saver, incremental=True).run([("Python", None)])
+    assert watermarks.get("Python") is None
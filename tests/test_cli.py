@@ -0,0 +1,124 @@
+import csv
+import json
+import subprocess
+import sys
+
+import pytest
+
+from src.cli import EXIT_ERROR, EXIT_NOT_FOUND, EXIT_OK, EXIT_USAGE, main
+from src.json_saver import JSONSaver
+from src.vacancy import Vacancy
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = str(tmp_path / "store.json")
+    JSONSaver(path).add_vacancies(
+        [
+            Vacancy(
+                "1", "Python Developer", {"name": "Москва"}, "http://hh/1", (100000, 150000),
+                snippet={"requirement": "Python, Django"},
+            ),
+            Vacancy("2", "Java Developer", {"name": "Казань"}, "http://hh/2", 120000, snippet={"requirement": "Java"}),
+            Vacancy("3", "Стажер", {}, "http://hh/3", 0, snippet={"requirement": "Python"}),
+        ]
+    )
+    return path
+
+
+def test_top_json(store, capsys):
+    assert main(["--store", store, "top", "2"]) == EXIT_OK
+    records = json.loads(capsys.readouterr().out)
+    assert [record["id"] for record in records] == ["1", "2"]
+
+
+def test_search_csv(store, capsys):
+    assert main(["--store", store, "--format", "csv", "search", "pyth", "--prefix"]) == EXIT_OK
+    rows = list(csv.DictReader(capsys.readouterr().out.splitlines()))
+    assert [row["id"] for row in rows] == ["1", "3"]
+    assert rows[0]["salary_from"] == "100000" and rows[0]["area"] == "Москва"
+
+
+def test_common_options_after_command(store, capsys):
+    assert main(["top", "2", "--store", store, "--format", "csv"]) == EXIT_OK
+    assert [row["id"] for row in csv.DictReader(capsys.readouterr().out.splitlines())] == ["1", "2"]
+    assert main(["--store", store, "--format", "csv", "top", "1", "--format", "text"]) == EXIT_OK
+    assert capsys.readouterr().out.startswith("Вакансия: Python Developer")
+
+
+def test_range_and_not_found(store, capsys):
+    assert main(["--store", store, "range", "110000", "130000"]) == EXIT_OK
+    assert [record["id"] for record in json.loads(capsys.readouterr().out)] == ["2"]
+    assert main(["--store", store, "range", "1", "2"]) == EXIT_NOT_FOUND
+    assert json.loads(capsys.readouterr().out) == []
+
+
+def test_show_and_delete(store, capsys):
+    assert main(["--store", store, "show", "2"]) == EXIT_OK
+    assert json.loads(capsys.readouterr().out)[0]["name"] == "Java Developer"
+
+    assert main(["--store", store, "delete", "2"]) == EXIT_OK
+    assert json.loads(capsys.readouterr().out) == {"deleted": "2"}
+    assert main(["--store", store, "show", "2"]) == EXIT_NOT_FOUND
+    assert "не найдена" in capsys.readouterr().err
+
+
+def test_store_messages_go_to_stderr(tmp_path, capsys):
+    assert main(["--store", str(tmp_path / "missing.json"), "top", "5"]) == EXIT_NOT_FOUND
+    captured = capsys.readouterr()
+    assert json.loads(captured.out) == []
+    assert "не найден" in captured.err
+
+
+def test_usage_errors(capsys):
+    assert main(["top", "-1"]) == EXIT_USAGE
+    assert main(["unknown"]) == EXIT_USAGE
+    assert "invalid choice" in capsys.readouterr().err
+
+
+def test_fetch(hh_server, tmp_path, capsys):
+    store = str(tmp_path / "store.json")
+    argv = ["--store", store, "fetch", "Python", "--url", hh_server.url, "--cache-ttl", "0", "--rate", "1000"]
+    assert main(argv) == EXIT_OK
+    report = json.loads(capsys.readouterr().out)
+    assert report["inserted"] == 250 and report["failed"] == 0
+    assert len(JSONSaver(store).load_vacancies()) == 250
+
+
+def test_fetch_failure(hh_server, tmp_path, capsys):
+    hh_server.faults = {0: [(503, 0)] * 10}
+    argv = ["--store", str(tmp_path / "store.json"), "fetch", "Python", "--url", hh_server.url, "--cache-ttl", "0"]
+    assert main(argv) == EXIT_ERROR
+    report = json.loads(capsys.readouterr().out)
+    assert report["failed"] == 1 and "HTTP 503" in report["error"]
+
+
+def test_fetch_incremental_saves_watermark_after_store(hh_server, tmp_path, monkeypatch, capsys):
+    from src.hh_api import HeadHunterAPI
+
+    monkeypatch.setattr(HeadHunterAPI, "get_data_file_path", staticmethod(lambda name: str(tmp_path / name)))
+    hh_server.items[0]["published_at"] = "2024-01-01T10:00:00+0300"
+    argv = ["--store", str(tmp_path / "store.json"), "fetch", "Python", "--incremental", "--url", hh_server.url]
+    argv += ["--cache-ttl", "0", "--rate", "1000"]
+    write_all = JSONSaver._write_all
+
+    def fail(self, vacancies):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(JSONSaver, "_write_all", fail)
+    assert main(argv) == EXIT_ERROR
+    assert not (tmp_path / "watermarks.json").exists()
+
+    monkeypatch.setattr(JSONSaver, "_write_all", write_all)
+    assert main(argv) == EXIT_OK
+    assert json.loads((tmp_path / "watermarks.json").read_text())["Python"] == "2024-01-01T10:00:00+0300"
+
+
+def test_read_command_does_not_import_requests(store):
+    code = (
+        "import sys; from src.cli import main; "
+        f"code = main(['--store', {store!r}, 'top', '1']); "
+        "sys.exit(10 if 'requests' in sys.modules else code)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True)
+    assert result.returncode == EXIT_OK
@@ -0,0 +1,55 @@
+import pytest
+
+from src import codec as codec_module
+from src.codec import CODECS, JSONCodec, get_codec, make_codec, set_codec
+from src.json_saver import JSONSaver
+from src.vacancy import Vacancy
+
+AVAILABLE = [name for name in CODECS if name == "json" or codec_module.orjson is not None]
+
+
+@pytest.fixture(params=AVAILABLE)
+def codec(request):
+    return make_codec(request.param)
+
+
+def test_roundtrip(codec):
+    data = {"id": "1", "name": "Разработчик", "salary": (1000, 2000), "items": [None, True, 1.5]}
+    compact = codec.dumps(data)
+    assert isinstance(compact, bytes)
+    assert "Разработчик".encode("utf-8") in compact
+    assert b" " not in compact and b"\n" not in compact
+    assert b"\n" in codec.dumps(data, pretty=True)
+    expected = dict(data, salary=[1000, 2000])
+    assert codec.loads(compact) == codec.loads(compact.decode("utf-8")) == expected
+
+
+def test_decode_error(codec):
+    with pytest.raises(JSONCodec.DecodeError):
+        codec.loads(b"not a json")
+
+
+def test_json_saver_with_codec(tmp_path, codec, sample_vacancy, vacancy_data):
+    saver = JSONSaver(str(tmp_path / "vacancies.json"), codec=codec)
+    saver.add_vacancy(sample_vacancy)
+    list(saver.add_vacancies_stream([Vacancy(**vacancy_data)]))
+    reloaded = JSONSaver(str(tmp_path / "vacancies.json"), codec=make_codec("json"))
+    assert [v.id for v in reloaded.load_vacancies()] == [123, 124]
+    assert reloaded.get_vacancy(124).salary == (1500, 2500)
+
+
+def test_make_and_set_codec(monkeypatch):
+    with pytest.raises(ValueError):
+        make_codec("yaml")
+    monkeypatch.setattr(codec_module, "_codec", None)
+    set_codec("json")
+    assert get_codec().name == "json"
+    set_codec(None)
+    assert get_codec().name == ("orjson" if codec_module.orjson is not None else "json")
+
+
+def test_orjson_unavailable(monkeypatch):
+    monkeypatch.setattr(codec_module, "orjson", None)
+    assert make_codec().name == "json"
+    with pytest.raises(ValueError):
+        make_codec("orjson")
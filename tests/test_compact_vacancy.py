@@ -0,0 +1,78 @@
+import pytest
+
+from src.compact_vacancy import CompactVacancy
+from src.vacancy import Vacancy
+
+
+@pytest.fixture
+def raw_vacancy():
+    return {
+        "id": "1",
+        "name": "Python Developer",
+        "area": {"id": "1", "name": "Москва", "url": "https://api.hh.ru/areas/1"},
+        "alternate_url": "http://example.com",
+        "salary": {"from": 1000, "to": 2000, "currency": "RUR", "gross": False},
+        "snippet": {"requirement": "Python, Django", "responsibility": "Developing applications"},
+    }
+
+
+def test_compact_vacancy_has_no_dict(raw_vacancy):
+    vacancy = CompactVacancy.cast_to_object_list([raw_vacancy])[0]
+    assert not hasattr(vacancy, "__dict__")
+    with pytest.raises(AttributeError):
+        vacancy.extra = 1
+
+
+def test_compact_vacancy_matches_vacancy(raw_vacancy):
+    """Публичные свойства совпадают с обычной Vacancy."""
+    compact = CompactVacancy.cast_to_object_list([raw_vacancy])[0]
+    regular = Vacancy.cast_to_object_list([raw_vacancy])[0]
+    assert compact.id == regular.id
+    assert compact.name == regular.name
+    assert compact.url == regular.url
+    assert compact.salary == regular.salary == (1000, 2000)
+    assert compact.snippet == regular.snippet
+    assert compact.area == {"id": "1", "name": "Москва"}
+    assert compact.currency == "RUR"
+    assert compact.to_dict()["salary"] == (1000, 2000)
+
+
+def test_compact_vacancy_interns_repeated_strings(raw_vacancy):
+    other = dict(raw_vacancy, area={"id": "1", "name": "".join(["Мос", "ква"])})
+    first, second = CompactVacancy.cast_to_object_list([raw_vacancy, other])
+    assert first.area_name is second.area_name
+
+
+@pytest.mark.parametrize(
+    "salary, expected",
+    [({"from": 1000}, 1000), ({"to": 2000}, 2000), (None, 0), ((1000, 2000), (1000, 2000)), ([1, 2], (1, 2))],
+)
+def test_compact_vacancy_salary_shapes(salary, expected):
+    vacancy = CompactVacancy(id="1", name="Dev", area={}, url="http://example.com", salary=salary)
+    assert vacancy.salary == expected
+
+
+def test_compact_vacancy_comparison_and_from_vacancy(sample_vacancy):
+    compact = CompactVacancy.from_vacancy(sample_vacancy)
+    higher = CompactVacancy(id="2", name="Dev", area={}, url="http://example.com", salary={"from": 2000, "to": 3000})
+    assert compact == sample_vacancy
+    assert compact < higher
+    assert higher > compact
+    assert compact.to_dict() == sample_vacancy.to_dict()
+
+
+def test_mixed_comparisons_are_symmetric(sample_vacancy):
+    compact = CompactVacancy.from_vacancy(sample_vacancy)
+    higher = Vacancy(id="2", name="Dev", area={}, url="http://example.com", salary=(2000, 3000))
+    assert sample_vacancy == compact and compact == sample_vacancy
+    assert compact < higher and higher > compact
+    compact_higher = CompactVacancy.from_vacancy(higher)
+    assert compact_higher > sample_vacancy and sample_vacancy < compact_higher
+    assert sample_vacancy != "Python Developer"
+    with pytest.raises(TypeError):
+        sample_vacancy < 1000
+
+
+def test_compact_vacancy_invalid_name():
+    with pytest.raises(ValueError):
+        CompactVacancy(id="1", name="", area={}, url="http://example.com", salary=0)
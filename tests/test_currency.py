@@ -0,0 +1,75 @@
+import json
+import os
+
+import pytest
+
+from src.currency import CurrencyConverter, RateProvider, StaticRateProvider, get_default_converter
+
+
+class CountingProvider(RateProvider):
+    def __init__(self, rates=None, fail=False):
+        self.rates = rates or {"RUR": 1.0, "USD": 100.0}
+        self.fail = fail
+        self.calls = 0
+
+    def get_rates(self):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("нет сети")
+        return dict(self.rates)
+
+
+def test_static_rates():
+    converter = CurrencyConverter(StaticRateProvider({"USD": 90.0}))
+    assert converter.convert(1000, "USD") == 90000
+    assert converter.convert(1000, "RUR") == 1000
+    assert converter.convert(1000, None) == 1000
+    assert converter.rate("XXX") == 1.0
+
+
+def test_rates_are_fetched_once_per_ttl():
+    provider = CountingProvider()
+    converter = CurrencyConverter(provider, ttl=60)
+    for _ in range(100):
+        converter.convert(10, "USD")
+    assert provider.calls == 1
+
+
+def test_cache_file_is_shared_between_converters(tmp_path):
+    cache_file = str(tmp_path / "rates.json")
+    provider = CountingProvider()
+    CurrencyConverter(provider, cache_file=cache_file).rate("USD")
+    assert json.loads(open(cache_file, encoding="utf-8").read())["rates"]["USD"] == 100.0
+
+    second = CurrencyConverter(provider, cache_file=cache_file)
+    assert second.rate("USD") == 100.0
+    assert provider.calls == 1
+
+
+def test_expired_cache_is_used_when_provider_fails(tmp_path, capsys):
+    cache_file = str(tmp_path / "rates.json")
+    with open(cache_file, "w", encoding="utf-8") as f:
+        json.dump({"fetched_at": 0, "rates": {"USD": 80.0}}, f)
+    converter = CurrencyConverter(CountingProvider(fail=True), cache_file=cache_file, ttl=60)
+    assert converter.rate("USD") == 80.0
+    assert "Не удалось обновить курсы валют" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("payload", ["не json", '{"rates": {}}'])
+def test_broken_cache_falls_back_to_provider(tmp_path, payload):
+    cache_file = tmp_path / "rates.json"
+    cache_file.write_text(payload, encoding="utf-8")
+    provider = CountingProvider()
+    assert CurrencyConverter(provider, cache_file=str(cache_file)).rate("USD") == 100.0
+    assert provider.calls == 1
+
+
+def test_rate_provider_is_abstract():
+    with pytest.raises(TypeError):
+        RateProvider()
+
+
+def test_default_cache_path_is_injectable(rates_cache):
+    assert get_default_converter().cache_file == rates_cache
+    get_default_converter().rate("USD")
+    assert os.path.exists(rates_cache)
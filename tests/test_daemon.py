@@ -0,0 +1,70 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from src.daemon import QueryDaemon
+from src.json_saver import JSONSaver
+from src.vacancy import Vacancy
+
+
+def make_vacancies(count, offset=0):
+    return [
+        Vacancy(
+            str(i), f"Python Developer {i}", {}, f"http://hh/{i}", 1000 * (i + 1), snippet={"requirement": "Python"}
+        )
+        for i in range(offset, offset + count)
+    ]
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    JSONSaver(str(tmp_path / "store.json")).add_vacancies(make_vacancies(5))
+    daemon = QueryDaemon(JSONSaver(str(tmp_path / "store.json")), port=0, poll_interval=60)
+    daemon.start()
+    yield daemon
+    daemon.stop()
+
+
+def get(daemon, path):
+    try:
+        with urlopen(daemon.url + path, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def test_queries(daemon):
+    status, top = get(daemon, "/top?n=2")
+    assert status == 200 and [v["id"] for v in top] == ["4", "3"]
+    assert [v["id"] for v in get(daemon, "/range?from=1500&to=3500")[1]] == ["1", "2"]
+    assert len(get(daemon, "/search?q=python")[1]) == 5
+    assert len(get(daemon, "/search?q=python&limit=2")[1]) == 2
+    assert get(daemon, "/vacancy/2")[1]["name"] == "Python Developer 2"
+
+
+def test_errors(daemon):
+    assert get(daemon, "/vacancy/404")[0] == 404
+    assert get(daemon, "/unknown")[0] == 404
+    assert get(daemon, "/top?n=abc")[0] == 400
+    assert get(daemon, "/range?from=1")[0] == 400
+
+
+def test_store_is_loaded_once(daemon):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: get(daemon, "/top?n=1")[0], range(40)))
+    assert results == [200] * 40
+    assert daemon.saver.get_cache_stats()["misses"] == 1
+    assert get(daemon, "/health")[1]["reloads"] == 1
+    assert not os.path.exists(daemon.saver.text_index_path)
+
+
+def test_reload_on_change(daemon, tmp_path):
+    JSONSaver(str(tmp_path / "store.json")).add_vacancies(make_vacancies(1, offset=10))
+    assert daemon.reload_if_changed()
+    assert not daemon.reload_if_changed()
+    assert get(daemon, "/top?n=1")[1][0]["id"] == "10"
+    assert get(daemon, "/health")[1] == {"vacancies": 6, "reloads": 2, "requests": 2}
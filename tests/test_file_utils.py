@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.file_utils import FileLock, atomic_write
+from src.json_saver import JSONSaver
+from src.vacancy import Vacancy
+
+
+def test_atomic_write_replaces_content(tmp_path):
+    path = str(tmp_path / "vacancies.json")
+    atomic_write(path, b"[1]")
+    atomic_write(path, b"[1, 2]")
+    with open(path, "rb") as f:
+        assert f.read() == b"[1, 2]"
+    assert os.listdir(tmp_path) == ["vacancies.json"]
+
+
+def test_atomic_write_keeps_old_file_on_error(tmp_path):
+    """Сбой во время записи оставляет прежнюю версию файла и не оставляет временных файлов."""
+    path = str(tmp_path / "vacancies.json")
+    atomic_write(path, b"[1]")
+    with patch("src.file_utils.os.replace", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            atomic_write(path, b"[1, 2]")
+    with open(path, "rb") as f:
+        assert f.read() == b"[1]"
+    assert os.listdir(tmp_path) == ["vacancies.json"]
+
+
+def test_file_lock_is_reentrant_and_exclusive(tmp_path):
+    path = str(tmp_path / "vacancies.json")
+    first, second = FileLock(path), FileLock(path)
+    acquired = threading.Event()
+
+    def take_second():
+        with second:
+            acquired.set()
+
+    with first:
+        with first:
+            thread = threading.Thread(target=take_second)
+            thread.start()
+            time.sleep(0.1)
+            assert not acquired.is_set()
+    thread.join(timeout=5)
+    assert acquired.is_set()
+
+
+def test_shared_lock_waits_for_writer(tmp_path):
+    """Читатели не мешают друг другу, но ждут, пока запись не закончится."""
+    path = str(tmp_path / "vacancies.json")
+    writer, reader = FileLock(path), FileLock(path)
+    acquired = threading.Event()
+
+    def read():
+        with reader.shared():
+            acquired.set()
+
+    with FileLock(path).shared():
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join(timeout=5)
+        assert acquired.is_set()
+
+    acquired.clear()
+    with writer:
+        thread = threading.Thread(target=read)
+        thread.start()
+        time.sleep(0.1)
+        assert not acquired.is_set()
+    thread.join(timeout=5)
+    assert acquired.is_set()
+
+
+def test_concurrent_savers_do_not_lose_writes(tmp_path):
+    """Несколько хранилищ на одном файле не затирают записи друг друга."""
+    path = str(tmp_path / "vacancies.json")
+
+    def collect(worker):
+        saver = JSONSaver(path)
+        for i in range(10):
+            saver.add_vacancy(Vacancy(id=f"{worker}-{i}", name="Python", area={}, url="http://hh", salary=0))
+
+    threads = [threading.Thread(target=collect, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(JSONSaver(path).load_vacancies()) == 40
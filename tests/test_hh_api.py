@@ -3,21 +3,26 @@ import os
 import unittest
 from unittest.mock import MagicMock, mock_open, patch
 
-from src.hh_api import HeadHunterAPI
+import pytest
+
+from src.hh_api import HeadHunterAPI, PageFetchError
+from src.http_cache import ResponseCache
+from src.rate_limit import RetryPolicy, TokenBucket
+from src.watermark import WatermarkStore
 from src.vacancy import Vacancy
 
 
 class TestHeadHunterAPI(unittest.TestCase):
 
-    @patch("src.hh_api.requests.get")
+    @patch("src.hh_api.requests.Session.get")
     def test_get_vacancies(self, mock_get):
         """Тест метода get_vacancies с использованием моков"""
         # Пример ответа API
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "items": [{"id": "1", "name": "Vacancy 1"}, {"id": "2", "name": "Vacancy 2"}]
-        }
+        mock_response.content = json.dumps(
+            {"items": [{"id": "1", "name": "Vacancy 1"}, {"id": "2", "name": "Vacancy 2"}]}
+        ).encode("utf-8")
         mock_get.return_value = mock_response
 
         hh_api = HeadHunterAPI()
@@ -64,5 +69,254 @@ class TestHeadHunterAPI(unittest.TestCase):
         self.assertEqual(vacancies[0].name, "Vacancy 1")
         self.assertEqual(vacancies[1].name, "Vacancy 2")
 
+
+def test_get_vacancies_concurrent_keeps_page_order(hh_server):
+    """Параллельная выгрузка возвращает все страницы в исходном порядке"""
+    hh_api = HeadHunterAPI(max_workers=4, url=hh_server.url)
+    vacancies = hh_api.get_vacancies("Python")
+    assert [v["id"] for v in vacancies] == [str(i) for i in range(250)]
+    # Одна страница на каждый запрос, лишних запросов за пределы pages нет
+    assert sorted(int(r["page"]) for r in hh_server.requests) == [0, 1, 2]
+    assert all(r["text"] == "Python" for r in hh_server.requests)
+
+
+def test_get_vacancies_concurrent_respects_limit(hh_server):
+    """Число одновременных запросов не превышает max_workers"""
+    hh_server.items = hh_server.items * 8
+    hh_server.delay = 0.05
+    hh_api = HeadHunterAPI(max_workers=3, url=hh_server.url)
+    vacancies = hh_api.get_vacancies("Python")
+    assert len(vacancies) == 2000
+    assert 1 < hh_server.max_active <= 3
+
+
+def test_get_vacancies_concurrent_first_page_error(hh_server):
+    """Ошибка на первой странице дает пустой результат"""
+    hh_server.items = []
+    hh_api = HeadHunterAPI(max_workers=4, url=hh_server.url)
+    assert hh_api.get_vacancies("Python") == []
+
+
+def test_get_vacancies_stops_at_last_page(hh_server):
+    """Последовательная выгрузка останавливается на последней странице из поля pages"""
+    hh_api = HeadHunterAPI(url=hh_server.url)
+    vacancies = hh_api.get_vacancies("Python")
+    assert len(vacancies) == 250
+    assert len(hh_server.requests) == 3
+
+
+@patch("src.hh_api.requests.Session.get")
+def test_get_vacancies_stops_at_empty_items(mock_get):
+    """Выгрузка останавливается на первой странице без вакансий"""
+    pages = [{"items": [{"id": "1"}]}, {"items": [{"id": "2"}]}, {"items": []}, {"items": [{"id": "3"}]}]
+    responses = []
+    for page in pages:
+        responses.append(MagicMock(status_code=200, content=json.dumps(page).encode("utf-8")))
+    mock_get.side_effect = responses
+
+    vacancies = HeadHunterAPI().get_vacancies("Python")
+    assert [v["id"] for v in vacancies] == ["1", "2"]
+    assert mock_get.call_count == 3
+
+
+@patch("src.hh_api.requests.Session.get")
+def test_requests_use_timeout(mock_get):
+    """Каждый запрос уходит с таймаутом: по умолчанию (5, 30), либо заданным в конструкторе"""
+    mock_get.return_value = MagicMock(status_code=200, content=b'{"items": []}')
+    HeadHunterAPI().get_vacancies("Python")
+    assert mock_get.call_args.kwargs["timeout"] == (5, 30)
+    HeadHunterAPI(timeout=2.5).get_vacancies("Python")
+    assert mock_get.call_args.kwargs["timeout"] == 2.5
+
+
+def test_get_metrics_reuses_connection(hh_server):
+    """Метрики: число запросов, объем ответа и переиспользование соединения"""
+    hh_api = HeadHunterAPI(url=hh_server.url)
+    hh_api.get_vacancies("Python")
+    metrics = hh_api.get_metrics()
+    hh_api.close()
+    assert metrics["requests"] == 3
+    assert metrics["bytes_received"] > 0
+    assert metrics["connections_opened"] == 1
+    assert metrics["connections_reused"] == 2
+
+
+def test_iter_vacancies_is_lazy(hh_server):
+    """Потоковая выгрузка запрашивает следующую страницу только по мере чтения"""
+    hh_api = HeadHunterAPI(url=hh_server.url)
+    stream = hh_api.iter_vacancies("Python")
+    assert next(stream)["id"] == "0"
+    assert len(hh_server.requests) == 1
+    assert len(list(stream)) == 249
+    assert len(hh_server.requests) == 3
+
+
+def test_iter_vacancies_concurrent_order(hh_server):
+    """Параллельная потоковая выгрузка сохраняет порядок страниц"""
+    hh_server.items = hh_server.items * 4
+    hh_api = HeadHunterAPI(max_workers=3, url=hh_server.url)
+    ids = [v["id"] for v in hh_api.iter_vacancies("Python")]
+    assert ids == [str(i) for i in range(250)] * 4
+
+
+def test_max_workers_validation():
+    with pytest.raises(ValueError):
+        HeadHunterAPI(max_workers=0)
+
+
+def test_cache_fresh_pages_skip_network(hh_server, tmp_path):
+    """Повтор запроса в пределах ttl не обращается к серверу"""
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    first = HeadHunterAPI(url=hh_server.url, cache=cache).get_vacancies("Python")
+    assert len(hh_server.requests) == 3
+
+    hh_api = HeadHunterAPI(url=hh_server.url, cache=cache)
+    assert hh_api.get_vacancies("Python") == first
+    assert len(hh_server.requests) == 3
+    assert hh_api.get_metrics()["cache_hits"] == 3
+    assert hh_api.get_metrics()["requests"] == 0
+
+    HeadHunterAPI(url=hh_server.url, cache=cache).get_vacancies("Java")
+    assert len(hh_server.requests) == 6
+
+
+@pytest.mark.parametrize("validator", ["etag", "last_modified"])
+def test_cache_stale_pages_are_revalidated(hh_server, tmp_path, validator):
+    """Устаревшие страницы перепроверяются условным запросом и не передаются заново"""
+    if validator == "etag":
+        hh_server.etag = True
+    else:
+        hh_server.last_modified = "Mon, 01 Jan 2024 00:00:00 GMT"
+    cache = ResponseCache(str(tmp_path), ttl=0)
+    first = HeadHunterAPI(max_workers=2, url=hh_server.url, cache=cache).get_vacancies("Python")
+
+    hh_api = HeadHunterAPI(max_workers=2, url=hh_server.url, cache=cache)
+    assert hh_api.get_vacancies("Python") == first
+    assert hh_server.not_modified == 3
+    assert hh_api.get_metrics()["not_modified"] == 3
+    assert hh_api.get_metrics()["bytes_received"] == 0
+
+
+def test_cache_stale_page_without_validators_is_downloaded(hh_server, tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=0)
+    HeadHunterAPI(url=hh_server.url, cache=cache).get_vacancies("Python")
+    hh_server.items = hh_server.items[:100]
+    assert len(HeadHunterAPI(url=hh_server.url, cache=cache).get_vacancies("Python")) == 100
+    assert hh_server.not_modified == 0
+
+
 # if __name__ == '__main__':
 #     unittest.main()
+
+
+def test_retry_on_transient_errors(hh_server):
+    """429 и 5xx повторяются, страницы не теряются"""
+    hh_server.faults = {0: [(503, None)], 1: [(429, 0), (429, 0)], 2: [(502, None)]}
+    hh_api = HeadHunterAPI(max_workers=2, url=hh_server.url, retry=RetryPolicy(backoff=0.01))
+    assert len(hh_api.get_vacancies("Python")) == 250
+    metrics = hh_api.get_metrics()
+    assert metrics["throttled"] == 2
+    assert metrics["retried"] == 4
+    assert metrics["failed"] == 0
+
+
+def test_retry_gives_up_after_max_retries(hh_server, caplog):
+    """Страница, не полученная после всех повторов, прерывает выгрузку, а не обрезает результат"""
+    hh_server.faults = {1: [(500, None)] * 3}
+    hh_api = HeadHunterAPI(url=hh_server.url, retry=RetryPolicy(max_retries=2, backoff=0.01))
+    with pytest.raises(PageFetchError) as error:
+        hh_api.get_vacancies("Python")
+    assert (error.value.page, error.value.status_code, error.value.attempts) == (1, 500, 3)
+    assert hh_api.get_metrics()["failed"] == 1
+    assert "HTTP 500" in caplog.text
+
+
+def test_retry_after_pauses_shared_rate_limiter(hh_server):
+    hh_server.faults = {0: [(429, 0.2)]}
+    limiter = TokenBucket(rate=1000)
+    hh_api = HeadHunterAPI(url=hh_server.url, rate_limiter=limiter, retry=RetryPolicy(backoff=0.01))
+    hh_api.get_vacancies("Python")
+    assert hh_api.get_metrics()["rate_limit_wait"] >= 0.2
+
+
+def test_iter_new_vacancies_uses_watermark(hh_server, tmp_path):
+    """Повторная выгрузка запрашивает только вакансии новее отметки"""
+    for i, item in enumerate(hh_server.items):
+        item["published_at"] = f"2024-01-01T{i // 60:02d}:{i % 60:02d}:00+0300"
+    watermarks = WatermarkStore(str(tmp_path / "watermarks.json"))
+    hh_api = HeadHunterAPI(url=hh_server.url, watermarks=watermarks)
+    assert len(list(hh_api.iter_new_vacancies("Python", "1"))) == 250
+    assert watermarks.get("Python", "1") == "2024-01-01T04:09:00+0300"
+
+    hh_server.items.append({"id": "new", "name": "New", "published_at": "2024-01-01T05:00:00+0300"})
+    hh_server.requests.clear()
+    new = list(hh_api.iter_new_vacancies("Python", "1"))
+    assert [v["id"] for v in new] == ["new", "249"]
+    assert len(hh_server.requests) == 1
+    assert hh_server.requests[0]["date_from"] == "2024-01-01T04:09:00+0300"
+    assert hh_server.requests[0]["order_by"] == "publication_time"
+    assert watermarks.get("Python", "1") == "2024-01-01T05:00:00+0300"
+    assert watermarks.get("Python") is None
+
+
+def test_iter_new_vacancies_keeps_watermark_on_failed_page(hh_server, tmp_path):
+    """Отметка не сдвигается, если часть выдачи не получена: следующий запуск возвращает пропущенное"""
+    for i, item in enumerate(hh_server.items):
+        item["published_at"] = f"2024-01-01T{i // 60:02d}:{i % 60:02d}:00+0300"
+    watermarks = WatermarkStore(str(tmp_path / "watermarks.json"))
+    hh_api = HeadHunterAPI(url=hh_server.url, watermarks=watermarks, retry=RetryPolicy(max_retries=1, backoff=0.01))
+    for faults in ({1: [(503, None)] * 2}, {2: [(403, None)]}):
+        hh_server.faults = faults
+        received = []
+        with pytest.raises(PageFetchError):
+            for vacancy in hh_api.iter_new_vacancies("Python"):
+                received.append(vacancy)
+        assert received and watermarks.get("Python") is None
+
+    assert len(list(hh_api.iter_new_vacancies("Python"))) == 250
+    assert watermarks.get("Python") == "2024-01-01T04:09:00+0300"
+
+
+def test_iter_new_vacancies_splits_capped_window(hh_server, tmp_path):
+    """Выдача больше лимита глубины hh.ru дочитывается окнами по date_to, отметка - самая поздняя дата"""
+    for i, item in enumerate(hh_server.items):
+        item["published_at"] = f"2024-01-01T{i // 60:02d}:{i % 60:02d}:00+0300"
+    hh_server.max_depth = 100
+    watermarks = WatermarkStore(str(tmp_path / "watermarks.json"))
+    hh_api = HeadHunterAPI(url=hh_server.url, watermarks=watermarks)
+    received = [v["id"] for v in hh_api.iter_new_vacancies("Python")]
+    assert set(received) == {str(i) for i in range(250)}
+    assert [r.get("date_to") for r in hh_server.requests if r["page"] == "0"] == [
+        None,
+        "2024-01-01T02:30:00+0300",
+        "2024-01-01T00:51:00+0300",
+    ]
+    assert watermarks.get("Python") == "2024-01-01T04:09:00+0300"
+
+
+def test_iter_new_vacancies_keeps_watermark_on_capped_window(hh_server, tmp_path, caplog):
+    """Если вакансий с одной датой больше лимита, выдачу не уместить - отметка не сдвигается"""
+    for item in hh_server.items:
+        item["published_at"] = "2024-01-01T10:00:00+0300"
+    hh_server.max_depth = 100
+    watermarks = WatermarkStore(str(tmp_path / "watermarks.json"))
+    hh_api = HeadHunterAPI(url=hh_server.url, watermarks=watermarks)
+    assert len(list(hh_api.iter_new_vacancies("Python"))) == 200
+    assert watermarks.get("Python") is None
+    assert "обрезана" in caplog.text
+
+
+def test_iter_new_vacancies_pending_watermark(hh_server, tmp_path):
+    """С pending отметка не пишется в watermarks: ее сохраняет вызывающий после записи вакансий"""
+    hh_server.items[0]["published_at"] = "2024-01-01T10:00:00+0300"
+    watermarks = WatermarkStore(str(tmp_path / "watermarks.json"))
+    hh_api = HeadHunterAPI(url=hh_server.url, watermarks=watermarks)
+    pending = {}
+    assert len(list(hh_api.iter_new_vacancies("Python", "1", pending=pending))) == 250
+    assert pending == {("Python", "1"): "2024-01-01T10:00:00+0300"}
+    assert watermarks.get("Python", "1") is None
+
+
+def test_iter_new_vacancies_requires_watermarks():
+    with pytest.raises(ValueError):
+        next(HeadHunterAPI().iter_new_vacancies("Python"))
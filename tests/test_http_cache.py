@@ -0,0 +1,69 @@
+import os
+import time
+
+import pytest
+
+from src.http_cache import ResponseCache
+
+URL = "https://api.hh.ru/vacancies"
+
+
+def test_key_ignores_params_order():
+    assert ResponseCache.make_key(URL, {"text": "Python", "page": 1}) == ResponseCache.make_key(
+        URL, {"page": 1, "text": "Python"}
+    )
+    assert ResponseCache.make_key(URL, {"page": 1}) != ResponseCache.make_key(URL, {"page": 2})
+
+
+def test_put_and_get(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    assert cache.get(URL, {"page": 0}) is None
+    cache.put(URL, {"page": 0}, {"items": [1]}, etag='"abc"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    entry = ResponseCache(str(tmp_path)).get(URL, {"page": 0})
+    assert entry.body == {"items": [1]}
+    assert cache.is_fresh(entry)
+    assert entry.validators() == {"If-None-Match": '"abc"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+
+def test_directory_is_created_on_first_write(tmp_path):
+    cache = ResponseCache(str(tmp_path / "http_cache"))
+    assert cache.get(URL) is None and len(cache) == 0
+    cache.clear()
+    assert not os.path.exists(cache.directory)
+    cache.put(URL, None, {"items": []})
+    assert len(cache) == 1
+
+
+def test_ttl_and_refresh(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    entry = cache.put(URL, None, {"items": []})
+    entry.stored_at -= 120
+    assert not cache.is_fresh(entry)
+    cache.refresh(entry)
+    assert cache.is_fresh(cache.get(URL))
+
+
+def test_lru_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_entries=2)
+    cache.put(URL, {"page": 0}, 0)
+    cache.put(URL, {"page": 1}, 1)
+    # Чтение делает страницу 0 недавно использованной, вытесняется страница 1
+    old = time.time() - 10
+    os.utime(os.path.join(str(tmp_path), ResponseCache.make_key(URL, {"page": 1}) + ".json"), (old, old))
+    assert cache.get(URL, {"page": 0}).body == 0
+    cache.put(URL, {"page": 2}, 2)
+    assert len(cache) == 2
+    assert cache.get(URL, {"page": 1}) is None
+    assert cache.get(URL, {"page": 0}).body == 0
+
+
+def test_corrupt_entry_and_clear(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.put(URL, None, {"items": []})
+    with open(os.path.join(str(tmp_path), ResponseCache.make_key(URL) + ".json"), "w") as f:
+        f.write("{")
+    assert cache.get(URL) is None
+    cache.clear()
+    assert len(cache) == 0
+    with pytest.raises(ValueError):
+        ResponseCache(str(tmp_path), max_entries=0)
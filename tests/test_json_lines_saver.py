@@ -0,0 +1,92 @@
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.json_lines_saver import JSONLinesSaver
+from src.json_saver import StoreCorruptedError
+from src.vacancy import Vacancy
+
+
+@pytest.fixture
+def lines_saver(tmp_path):
+    return JSONLinesSaver(str(tmp_path / "vacancies.jsonl"))
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_add_vacancy_appends_line(lines_saver, sample_vacancy, vacancy_data):
+    """Добавление дописывает одну строку и не трогает прежние."""
+    lines_saver.add_vacancy(sample_vacancy)
+    with open(lines_saver.filename, "rb") as f:
+        first_line = f.read()
+    lines_saver.add_vacancy(Vacancy(**vacancy_data))
+    with open(lines_saver.filename, "rb") as f:
+        content = f.read()
+    assert content.startswith(first_line)
+    assert [line["id"] for line in read_lines(lines_saver.filename)] == [123, 124]
+    assert [v.id for v in lines_saver.load_vacancies()] == [123, 124]
+
+
+def test_delete_writes_tombstone_and_compact(lines_saver, sample_vacancy, vacancy_data):
+    """Удаление записывает надгробие, compact переписывает файл без него."""
+    lines_saver.add_vacancies([sample_vacancy, Vacancy(**vacancy_data)])
+    lines_saver.delete_vacancy(sample_vacancy)
+    assert read_lines(lines_saver.filename)[-1] == {"_deleted": 123}
+    assert [v.id for v in lines_saver.load_vacancies()] == [124]
+
+    assert lines_saver.compact() == 1
+    assert [line["id"] for line in read_lines(lines_saver.filename)] == [124]
+
+
+def test_readd_replaces_previous_record(lines_saver, vacancy_data):
+    lines_saver.add_vacancy(Vacancy(**vacancy_data))
+    lines_saver.add_vacancy(Vacancy(**dict(vacancy_data, name="Senior Java Developer")))
+    assert [v.name for v in lines_saver.load_vacancies()] == ["Senior Java Developer"]
+
+
+def test_load_skips_truncated_line(lines_saver, sample_vacancy):
+    """Недописанная последняя строка пропускается."""
+    lines_saver.add_vacancy(sample_vacancy)
+    with open(lines_saver.filename, "a", encoding="utf-8") as f:
+        f.write('{"id": 125, "na')
+    assert [v.id for v in lines_saver.load_vacancies()] == [123]
+
+
+def test_append_after_truncated_line_starts_new_line(lines_saver, sample_vacancy, vacancy_data):
+    """Запись после оборванной строки не склеивается с ней и сбрасывается на диск."""
+    lines_saver.add_vacancy(sample_vacancy)
+    with open(lines_saver.filename, "a", encoding="utf-8") as f:
+        f.write('{"id": 125, "na')
+    with patch("src.json_lines_saver.os.fsync", wraps=os.fsync) as fsync:
+        lines_saver.add_vacancy(Vacancy(**vacancy_data))
+    assert fsync.call_count == 1
+    assert [v.id for v in lines_saver.load_vacancies()] == [123, 124]
+
+
+def test_migrate_from_json(lines_saver, tmp_json_saver, sample_vacancy, vacancy_data):
+    tmp_json_saver.save_vacancies([sample_vacancy, Vacancy(**vacancy_data)])
+    assert lines_saver.migrate_from_json(tmp_json_saver) == 2
+    assert [v.id for v in lines_saver.load_vacancies()] == [123, 124]
+
+
+def test_migrate_keeps_journal(lines_saver, tmp_json_saver, sample_vacancy, vacancy_data):
+    """Перенос не затирает непустой журнал без overwrite и не переносит поврежденный файл."""
+    lines_saver.add_vacancy(sample_vacancy)
+    tmp_json_saver.save_vacancies([Vacancy(**vacancy_data)])
+    with pytest.raises(FileExistsError):
+        lines_saver.migrate_from_json(tmp_json_saver)
+
+    with open(tmp_json_saver.filename, "a", encoding="utf-8") as f:
+        f.write("{")
+    with pytest.raises(StoreCorruptedError):
+        lines_saver.migrate_from_json(tmp_json_saver, overwrite=True)
+    assert [v.id for v in lines_saver.load_vacancies()] == [123]
+
+
+def test_load_missing_file(lines_saver):
+    assert lines_saver.load_vacancies() == []
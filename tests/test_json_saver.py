@@ -3,6 +3,9 @@ from unittest.mock import mock_open, patch
 
 import pytest
 
+from src.json_saver import JSONSaver, StoreCorruptedError
+from src.vacancy import Vacancy
+
 
 @patch("builtins.open", new_callable=mock_open)
 @patch("src.json_saver.JSONSaver.get_data_file_path", return_value="test_vacancies.json")
@@ -32,5 +35,253 @@ def test_load_vacancies_json_decode_error(mock_get_data_file_path, mock_file, js
     assert vacancies == []
 
 
+def test_add_vacancies_stream_writes_incrementally(tmp_json_saver, sample_vacancy, vacancy_data):
+    """Потоковая запись: файл корректен после каждой вакансии и содержит прежние записи."""
+    tmp_json_saver.save_vacancies([sample_vacancy])
+    vacancies = [Vacancy(**vacancy_data), Vacancy(**dict(vacancy_data, id=125))]
+    stream = tmp_json_saver.add_vacancies_stream(iter(vacancies))
+
+    next(stream)
+    with open(tmp_json_saver.filename, encoding="utf-8") as f:
+        assert [v["id"] for v in json.load(f)] == [123, 124]
+    assert len(list(stream)) == 1
+    with open(tmp_json_saver.filename, encoding="utf-8") as f:
+        assert [v["id"] for v in json.load(f)] == [123, 124, 125]
+
+
+def test_add_vacancies_stream_creates_file(tmp_json_saver, sample_vacancy):
+    """Потоковая запись в отсутствующий файл создает JSON массив."""
+    assert list(tmp_json_saver.add_vacancies_stream([sample_vacancy])) == [sample_vacancy]
+    vacancies = tmp_json_saver.load_vacancies()
+    assert [v.name for v in vacancies] == ["Python Developer"]
+
+
+def test_add_vacancies_stream_empty_source(tmp_json_saver):
+    """Пустой поток оставляет корректный пустой массив."""
+    assert list(tmp_json_saver.add_vacancies_stream([])) == []
+    with open(tmp_json_saver.filename, encoding="utf-8") as f:
+        assert json.load(f) == []
+
+
+def test_add_vacancies_dedup_report(tmp_json_saver, sample_vacancy, vacancy_data):
+    """Повторное добавление не плодит дубликаты, измененная вакансия обновляется."""
+    assert tmp_json_saver.add_vacancies([sample_vacancy, Vacancy(**vacancy_data)]) == {
+        "inserted": 2,
+        "updated": 0,
+        "skipped": 0,
+    }
+    report = tmp_json_saver.add_vacancies([sample_vacancy, Vacancy(**dict(vacancy_data, name="Senior Java"))])
+    assert report == {"inserted": 0, "updated": 1, "skipped": 1}
+    with open(tmp_json_saver.filename, encoding="utf-8") as f:
+        assert [(v["id"], v["name"]) for v in json.load(f)] == [(123, "Python Developer"), (124, "Senior Java")]
+
+
+def test_index_survives_reload(tmp_json_saver, sample_vacancy):
+    """Дедупликация работает и для вакансий, прочитанных из файла."""
+    tmp_json_saver.add_vacancy(sample_vacancy)
+    fresh_saver = type(tmp_json_saver)(tmp_json_saver.filename)
+    assert fresh_saver.add_vacancy(sample_vacancy) == {"inserted": 0, "updated": 0, "skipped": 1}
+
+
+def test_get_and_delete_vacancy_by_id(tmp_json_saver, sample_vacancy, vacancy_data):
+    tmp_json_saver.add_vacancies([sample_vacancy, Vacancy(**vacancy_data)])
+    assert tmp_json_saver.get_vacancy(124).name == "Java Developer"
+    tmp_json_saver.delete_vacancy(sample_vacancy)
+    assert tmp_json_saver.get_vacancy(123) is None
+    assert [v.id for v in tmp_json_saver.load_vacancies()] == [124]
+
+
+def test_add_vacancies_stream_skips_duplicates(tmp_json_saver, sample_vacancy):
+    tmp_json_saver.add_vacancy(sample_vacancy)
+    assert list(tmp_json_saver.add_vacancies_stream([sample_vacancy])) == [sample_vacancy]
+    assert tmp_json_saver.last_report == {"inserted": 0, "updated": 0, "skipped": 1}
+    assert len(tmp_json_saver.load_vacancies()) == 1
+
+
+def test_load_vacancies_uses_cache(tmp_json_saver, sample_vacancy):
+    """Повторная загрузка неизмененного файла не читает его заново."""
+    tmp_json_saver.add_vacancy(sample_vacancy)
+    with patch("src.json_saver.get_codec") as mock_codec:
+        assert [v.id for v in tmp_json_saver.load_vacancies()] == [123]
+        assert [v.id for v in tmp_json_saver.load_vacancies()] == [123]
+    mock_codec.assert_not_called()
+    assert tmp_json_saver.get_cache_stats()["hits"] >= 2
+
+
+def test_load_vacancies_reloads_changed_file(tmp_json_saver, sample_vacancy, vacancy_data):
+    """Изменение файла извне сбрасывает кэш."""
+    tmp_json_saver.add_vacancy(sample_vacancy)
+    tmp_json_saver.load_vacancies()
+    misses = tmp_json_saver.get_cache_stats()["misses"]
+
+    with open(tmp_json_saver.filename, "w", encoding="utf-8") as f:
+        json.dump([Vacancy(**vacancy_data).to_dict(), sample_vacancy.to_dict()], f)
+    assert [v.id for v in tmp_json_saver.load_vacancies()] == [124, 123]
+    assert tmp_json_saver.get_cache_stats()["misses"] == misses + 1
+
+
+def test_batch_add_parses_file_once(tmp_json_saver, sample_vacancy, vacancy_data):
+    tmp_json_saver.add_vacancy(sample_vacancy)
+    fresh_saver = type(tmp_json_saver)(tmp_json_saver.filename)
+    fresh_saver.add_vacancies([Vacancy(**vacancy_data), Vacancy(**dict(vacancy_data, id=125))])
+    fresh_saver.delete_vacancy(sample_vacancy)
+    fresh_saver.load_vacancies()
+    assert fresh_saver.get_cache_stats()["misses"] == 1
+
+
+def test_get_top_vacancies_uses_sorted_index(tmp_json_saver, sample_vacancy, vacancy_data):
+    """Топ N берется из отсортированного индекса и обновляется после записи."""
+    tmp_json_saver.add_vacancies([sample_vacancy, Vacancy(**vacancy_data)])
+    assert [v.id for v in tmp_json_saver.get_top_vacancies(1)] == [124]
+    with patch("src.json_saver.sorted") as mock_sorted:
+        assert [v.id for v in tmp_json_saver.get_top_vacancies(2)] == [124, 123]
+    mock_sorted.assert_not_called()
+
+    tmp_json_saver.add_vacancy(Vacancy(**dict(vacancy_data, id=125, salary={"from": 5000})))
+    assert [v.id for v in tmp_json_saver.get_top_vacancies(2)] == [125, 124]
+    assert [v.id for v in tmp_json_saver.get_top_vacancies(3, rank="min")] == [125, 124, 123]
+
+
+def test_search_vacancies_updates_index_incrementally(tmp_json_saver, sample_vacancy, vacancy_data):
+    """Полнотекстовый поиск видит добавленные и удаленные через хранилище вакансии без перестроения."""
+    tmp_json_saver.add_vacancy(sample_vacancy)
+    assert [v.id for v in tmp_json_saver.search_vacancies("django")] == [123]
+
+    with patch("src.json_saver.InvertedIndex.build") as mock_build:
+        tmp_json_saver.add_vacancy(Vacancy(**vacancy_data))
+        assert [v.id for v in tmp_json_saver.search_vacancies("develop*")] == [123, 124]
+        tmp_json_saver.delete_vacancy(sample_vacancy)
+        assert [v.id for v in tmp_json_saver.search_vacancies("develop*")] == [124]
+    mock_build.assert_not_called()
+
+
+def test_search_vacancies_uses_persisted_index(tmp_json_saver, sample_vacancy):
+    tmp_json_saver.add_vacancy(sample_vacancy)
+    tmp_json_saver.search_vacancies("python")
+    fresh_saver = type(tmp_json_saver)(tmp_json_saver.filename)
+    with patch("src.json_saver.InvertedIndex.build") as mock_build:
+        assert [v.id for v in fresh_saver.search_vacancies("python django")] == [123]
+    mock_build.assert_not_called()
+
+
+def test_search_vacancies_rebuilds_after_external_change(tmp_json_saver, sample_vacancy, vacancy_data):
+    tmp_json_saver.add_vacancy(sample_vacancy)
+    tmp_json_saver.search_vacancies("python")
+    with open(tmp_json_saver.filename, "w", encoding="utf-8") as f:
+        json.dump([Vacancy(**vacancy_data).to_dict()], f)
+    assert [v.id for v in tmp_json_saver.search_vacancies("java")] == [124]
+    assert tmp_json_saver.search_vacancies("python") == []
+
+
+def test_get_vacancies_by_salary(tmp_json_saver, sample_vacancy, vacancy_data):
+    """Диапазон (from, to), сохраненный в JSON, находится после перезагрузки файла."""
+    tmp_json_saver.add_vacancies([sample_vacancy, Vacancy(**vacancy_data)])
+    fresh_saver = type(tmp_json_saver)(tmp_json_saver.filename)
+    assert [v.id for v in fresh_saver.get_vacancies_by_salary(1000, 2000)] == [123]
+    assert [v.id for v in fresh_saver.get_vacancies_by_salary(1900, 2000, mode="overlaps")] == [123, 124]
+    fresh_saver.delete_vacancy(sample_vacancy)
+    assert [v.id for v in fresh_saver.get_vacancies_by_salary(0, 3000)] == [124]
+
+
+def test_field_projection_and_compact_output(tmp_path, sample_vacancy, vacancy_data):
+    saver = JSONSaver(str(tmp_path / "vacancies.json"), fields=["area.name", "snippet.requirement"], compact=True)
+    saver.add_vacancy(sample_vacancy)
+    list(saver.add_vacancies_stream([Vacancy(**vacancy_data)]))
+
+    text = (tmp_path / "vacancies.json").read_text(encoding="utf-8")
+    assert "\n" not in text and '": ' not in text
+    records = json.loads(text)
+    assert records[0] == {
+        "id": 123,
+        "name": "Python Developer",
+        "area": {"name": "Москва"},
+        "url": "http://example.com",
+        "salary": [1000, 2000],
+        "snippet": {"requirement": "Python, Django"},
+    }
+    assert [r["id"] for r in records] == [123, 124]
+
+    # Повторная запись тех же вакансий не считается изменением, хотя объекты полнее сохраненных
+    reloaded = JSONSaver(str(tmp_path / "vacancies.json"), fields=["area.name", "snippet.requirement"], compact=True)
+    assert reloaded.add_vacancies([sample_vacancy, Vacancy(**vacancy_data)]) == {
+        "inserted": 0,
+        "updated": 0,
+        "skipped": 2,
+    }
+    assert reloaded.get_vacancy(124).description is None
+    assert [v.id for v in reloaded.search_vacancies("django")] == [123]
+
+
+def test_projected_index_skips_readd_without_rewrite(tmp_path, sample_vacancy):
+    """Кэш проецирующего хранилища хранит записанный вид вакансии: повтор не перезаписывает файл"""
+    saver = JSONSaver(str(tmp_path / "vacancies.json"), fields=["area.name"], compact=True)
+    saver.save_vacancies([sample_vacancy])
+    assert saver.get_vacancy(123).description is None and saver.get_vacancy(123).snippet == {}
+
+    stamp = saver._file_stamp()
+    assert saver.add_vacancies([sample_vacancy]) == {"inserted": 0, "updated": 0, "skipped": 1}
+    list(saver.add_vacancies_stream([sample_vacancy]))
+    assert saver.last_report == {"inserted": 0, "updated": 0, "skipped": 1}
+    assert saver._file_stamp() == stamp
+
+
+def test_torn_append_does_not_reset_store(tmp_path, vacancy_data):
+    """Оборванная дозапись не дает следующей записи затереть хранилище."""
+    path = tmp_path / "vacancies.json"
+    saver = JSONSaver(str(path), compact=True)
+    saver.save_vacancies([Vacancy(**dict(vacancy_data, id=i)) for i in range(50)])
+    torn = path.read_bytes()[:-1] + b',{"id":50,"name":"Ja'
+    path.write_bytes(torn)
+
+    fresh = JSONSaver(str(path), compact=True)
+    with pytest.raises(StoreCorruptedError):
+        list(fresh.add_vacancies_stream([Vacancy(**dict(vacancy_data, id=51))]))
+    with pytest.raises(StoreCorruptedError):
+        fresh.add_vacancy(Vacancy(**dict(vacancy_data, id=51)))
+    with pytest.raises(StoreCorruptedError):
+        saver._append_to_array(Vacancy(**dict(vacancy_data, id=51)))
+    assert path.read_bytes() == torn
+
+
+def test_stream_writes_updates_when_interrupted(tmp_json_saver, sample_vacancy, vacancy_data):
+    """Измененные вакансии попадают в файл, даже если источник упал или итерацию остановили."""
+    tmp_json_saver.save_vacancies([sample_vacancy, Vacancy(**vacancy_data)])
+
+    def failing_source():
+        yield Vacancy(**dict(vacancy_data, name="Senior Java Developer"))
+        raise ConnectionError("нет сети")
+
+    with pytest.raises(ConnectionError):
+        list(tmp_json_saver.add_vacancies_stream(failing_source()))
+    with open(tmp_json_saver.filename, encoding="utf-8") as f:
+        assert json.load(f)[1]["name"] == "Senior Java Developer"
+
+    stream = tmp_json_saver.add_vacancies_stream(iter([Vacancy(**dict(vacancy_data, name="Lead"))] * 2))
+    next(stream)
+    stream.close()
+    assert [v.name for v in JSONSaver(tmp_json_saver.filename).load_vacancies()] == ["Python Developer", "Lead"]
+
+
+def test_unreadable_records_clear_cached_index(tmp_json_saver, sample_vacancy):
+    """Файл, который не удалось загрузить, не оставляет в кэше прежние вакансии."""
+    tmp_json_saver.save_vacancies([sample_vacancy])
+    with open(tmp_json_saver.filename, "w", encoding="utf-8") as f:
+        json.dump([{"id": 1}], f)
+    assert tmp_json_saver.load_vacancies() == []
+    assert tmp_json_saver.corrupted and tmp_json_saver.get_vacancy(123) is None
+    with pytest.raises(StoreCorruptedError):
+        tmp_json_saver.add_vacancy(sample_vacancy)
+
+
+def test_append_writes_closing_bracket_last(tmp_json_saver, sample_vacancy):
+    """Вакансия сбрасывается на диск до закрывающей скобки, сама скобка - последней записью."""
+    tmp_json_saver.save_vacancies([])
+    writes = []
+    with patch("src.json_saver.os.fsync", side_effect=lambda fd: writes.append(open(tmp_json_saver.filename).read())):
+        tmp_json_saver._append_to_array(sample_vacancy)
+    assert len(writes) == 2
+    assert not writes[0].rstrip().endswith("]") and writes[1].rstrip().endswith("]")
+
+
 # if __name__ == '__main__':
 #     pytest.main()
@@ -0,0 +1,26 @@
+from src.projection import field_tree, project, vacancy_field_tree
+
+
+def test_field_tree():
+    assert field_tree(["id", "area.name", "area.id", "snippet"]) == {
+        "id": None,
+        "area": {"name": None, "id": None},
+        "snippet": None,
+    }
+    # Поле целиком не сужается вложенным
+    assert field_tree(["area", "area.name"]) == {"area": None}
+    assert field_tree(["area.name", "area"]) == {"area": None}
+
+
+def test_project_keeps_order_and_skips_missing():
+    data = {"id": 1, "area": {"id": "1", "name": "Москва", "url": "x"}, "salary": 10, "extra": [1]}
+    assert project(data, field_tree(["salary", "area.name", "snippet.requirement", "id"])) == {
+        "id": 1,
+        "area": {"name": "Москва"},
+        "salary": 10,
+    }
+    assert project({"area": None}, field_tree(["area.name"])) == {}
+
+
+def test_vacancy_field_tree_keeps_required_fields():
+    assert set(vacancy_field_tree([])) == {"id", "name", "url", "salary", "currency"}
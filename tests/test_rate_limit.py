@@ -0,0 +1,73 @@
+import threading
+import time
+
+import pytest
+
+from src.rate_limit import RetryPolicy, TokenBucket, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_burst_then_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep=clock.sleep)
+    for _ in range(3):
+        assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert clock.now == pytest.approx(1.0)
+
+
+def test_token_bucket_pause():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, clock=clock, sleep=clock.sleep)
+    bucket.pause(2)
+    assert bucket.acquire() >= 2
+
+
+def test_token_bucket_is_shared_between_threads():
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(11)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - start >= 0.19
+
+
+def test_retry_policy():
+    policy = RetryPolicy(max_retries=2, backoff=1, max_backoff=3)
+    assert policy.should_retry(503, 0)
+    assert not policy.should_retry(503, 2)
+    assert not policy.should_retry(400, 0)
+    assert all(0 <= policy.delay(attempt) <= 3 for attempt in range(10))
+    assert policy.delay(0, "7") == 7
+    with pytest.raises(ValueError):
+        RetryPolicy(max_retries=-1)
+
+
+def test_retry_policy_wait_time_pauses_limiter_on_429():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, clock=clock, sleep=clock.sleep)
+    policy = RetryPolicy()
+    assert policy.wait_time(0, 503, "4", bucket) == 4
+    assert policy.wait_time(0, 429, "4", bucket) == 0
+    assert bucket.acquire() >= 4
+    assert policy.wait_time(0, 429, "4") == 4
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("скоро") is None
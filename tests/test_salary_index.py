@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from src.salary_index import SalaryRangeIndex
+from src.vacancy import Vacancy
+
+
+def make_vacancy(vacancy_id, salary):
+    return Vacancy(id=vacancy_id, name="Developer", area={}, url="http://example.com", salary=salary)
+
+
+@pytest.fixture
+def index():
+    return SalaryRangeIndex(
+        [
+            make_vacancy("1", {"from": 1000, "to": 2000}),
+            make_vacancy("2", {"from": 1500}),
+            make_vacancy("3", None),
+            make_vacancy("4", [2500, 4000]),
+            make_vacancy("5", {"to": 900}),
+        ]
+    )
+
+
+def ids(vacancies):
+    return [vacancy.id for vacancy in vacancies]
+
+
+def test_contains_covers_all_salary_shapes(index):
+    assert len(index) == 4
+    assert ids(index.contains(900, 2000)) == ["1", "2", "5"]
+    assert ids(index.query(2000, 5000)) == ["4"]
+
+
+def test_overlaps(index):
+    assert ids(index.overlaps(1800, 2600)) == ["1", "4"]
+    assert ids(index.query(0, 1000, mode="overlaps")) == ["1", "5"]
+    assert ids(index.overlaps(5000, 6000)) == []
+    assert index.overlaps(10, 1) == []
+    with pytest.raises(ValueError):
+        index.query(0, 1, mode="inside")
+
+
+def test_matches_linear_scan():
+    rnd = random.Random(7)
+    vacancies = []
+    for i in range(500):
+        low = rnd.randrange(0, 10_000, 100)
+        salary = rnd.choice([{"from": low}, {"from": low, "to": low + rnd.randrange(0, 5_000, 100)}, None])
+        vacancies.append(make_vacancy(str(i), salary))
+    index = SalaryRangeIndex(vacancies)
+    for _ in range(50):
+        lo = rnd.randrange(0, 12_000, 100)
+        hi = lo + rnd.randrange(0, 4_000, 100)
+        with_bounds = [v for v in vacancies if v.salary_bounds]
+        assert ids(index.overlaps(lo, hi)) == ids(
+            v for v in with_bounds if v.salary_bounds[0] <= hi and v.salary_bounds[1] >= lo
+        )
+        assert ids(index.contains(lo, hi)) == ids(
+            v for v in with_bounds if v.salary_bounds[0] >= lo and v.salary_bounds[1] <= hi
+        )
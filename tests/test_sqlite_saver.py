@@ -0,0 +1,66 @@
+import pytest
+
+from src.sqlite_saver import SQLiteSaver
+from src.vacancy import Vacancy
+
+
+@pytest.fixture
+def sqlite_saver(tmp_path):
+    saver = SQLiteSaver(str(tmp_path / "vacancies.db"))
+    yield saver
+    saver.close()
+
+
+def make_vacancy(vacancy_id, salary, area_id="1"):
+    return Vacancy(
+        id=vacancy_id,
+        name=f"Vacancy {vacancy_id}",
+        area={"id": area_id, "name": "Москва"},
+        url=f"http://hh/{vacancy_id}",
+        salary=salary,
+    )
+
+
+def test_add_load_and_delete(sqlite_saver, sample_vacancy, vacancy_data):
+    sqlite_saver.add_vacancies([sample_vacancy, Vacancy(**vacancy_data)])
+    assert [v.id for v in sqlite_saver.load_vacancies()] == [123, 124]
+
+    sqlite_saver.delete_vacancy(sample_vacancy)
+    assert [v.id for v in sqlite_saver.load_vacancies()] == [124]
+
+
+def test_add_replaces_same_id(sqlite_saver, vacancy_data):
+    sqlite_saver.add_vacancy(Vacancy(**vacancy_data))
+    sqlite_saver.add_vacancy(Vacancy(**dict(vacancy_data, name="Senior Java Developer")))
+    assert [v.name for v in sqlite_saver.load_vacancies()] == ["Senior Java Developer"]
+
+
+def test_get_vacancy_by_id(sqlite_saver, sample_vacancy):
+    sqlite_saver.add_vacancy(sample_vacancy)
+    assert sqlite_saver.get_vacancy_by_id("123").name == "Python Developer"
+    assert sqlite_saver.get_vacancy_by_id("999") is None
+
+
+def test_top_range_and_area_queries(sqlite_saver):
+    sqlite_saver.save_vacancies(
+        [
+            make_vacancy("1", {"from": 1000, "to": 2000}),
+            make_vacancy("2", {"from": 3000}, area_id="2"),
+            make_vacancy("3", {"from": 1500, "to": 5000}),
+            make_vacancy("4", None),
+        ]
+    )
+    assert [v.id for v in sqlite_saver.get_top_vacancies(2)] == ["3", "2"]
+    assert [v.id for v in sqlite_saver.get_vacancies_by_salary(900, 3000)] == ["1", "2"]
+    assert [v.id for v in sqlite_saver.get_vacancies_by_area("2")] == ["2"]
+
+
+def test_queries_use_indexes(sqlite_saver):
+    plans = {
+        "id": "SELECT payload FROM vacancies WHERE id = '1'",
+        "salary": "SELECT payload FROM vacancies WHERE salary_from >= 1 AND salary_to <= 2",
+        "area": "SELECT payload FROM vacancies WHERE area_id = '1'",
+    }
+    for query in plans.values():
+        detail = " ".join(row[-1] for row in sqlite_saver.connection.execute("EXPLAIN QUERY PLAN " + query))
+        assert "USING" in detail and "INDEX" in detail
@@ -0,0 +1,66 @@
+import pytest
+
+from src.text_index import InvertedIndex, tokenize
+from src.vacancy import Vacancy
+
+
+def make_vacancy(vacancy_id, description, requirement=None, responsibility=None):
+    return Vacancy(
+        id=vacancy_id,
+        name="Developer",
+        area={},
+        url="http://example.com",
+        salary=0,
+        description=description,
+        snippet={"requirement": requirement, "responsibility": responsibility},
+    )
+
+
+@pytest.fixture
+def index():
+    return InvertedIndex.build(
+        [
+            make_vacancy("1", "<p>Разработка на <b>Python</b></p>", "Опыт с Django"),
+            make_vacancy("2", "Backend на Java", responsibility="Поддержка ёмких сервисов"),
+            make_vacancy("3", None, "Python и Java", "Разработчик сервисов"),
+        ]
+    )
+
+
+def test_tokenize_normalizes_text():
+    assert tokenize("<highlighttext>Python</highlighttext>-разработчик, Ёлка!") == ["python", "разработчик", "елка"]
+    assert tokenize(None) == []
+
+
+def test_search_and_or(index):
+    assert index.search("python") == ["1", "3"]
+    assert index.search("Python java") == ["3"]
+    assert index.search("python java", mode="or") == ["1", "2", "3"]
+    assert index.search("емких") == ["2"]
+    assert index.search("golang") == []
+    with pytest.raises(ValueError):
+        index.search("python", mode="xor")
+
+
+def test_search_prefix(index):
+    assert index.search("разраб*") == ["1", "3"]
+    assert index.search("серв* java") == ["2", "3"]
+
+
+def test_incremental_add_and_remove(index):
+    index.remove("1")
+    assert index.search("python") == ["3"]
+    index.add(make_vacancy("3", "Golang"))
+    assert index.search("python") == []
+    assert index.search("golang") == ["3"]
+    assert len(index) == 2
+
+
+def test_save_and_load(index, tmp_path):
+    index.stamp = (1, 2)
+    path = str(tmp_path / "vacancies.index.json")
+    index.save(path)
+    loaded = InvertedIndex.load(path)
+    assert loaded.stamp == (1, 2)
+    assert loaded.search("разраб*") == ["1", "3"]
+    assert InvertedIndex.load(str(tmp_path / "missing.json")) is None
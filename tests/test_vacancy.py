@@ -4,6 +4,7 @@ from unittest.mock import mock_open, patch
 
 import pytest
 
+from src.currency import CurrencyConverter, StaticRateProvider
 from src.vacancy import Vacancy
 
 
@@ -203,11 +204,118 @@ def test_validate_salary_str_range():
     assert validated_salary == (1000, 2000)
 
 
+def test_validate_salary_list_after_json_roundtrip():
+    assert Vacancy._validate_salary([1000, 2000]) == (1000, 2000)
+
+
 def test_validate_salary_str_invalid():
     salary = "invalid"
     validated_salary = Vacancy._validate_salary(salary)
     assert validated_salary == 0
 
 
+def test_cast_to_object_iter_is_lazy():
+    consumed = []
+
+    def source():
+        for i in range(3):
+            consumed.append(i)
+            yield {"id": str(i), "name": f"Vacancy {i}", "alternate_url": f"http://hh/{i}", "salary": None}
+
+    stream = Vacancy.cast_to_object_iter(source())
+    assert consumed == []
+    first = next(stream)
+    assert first.id == "0"
+    assert consumed == [0]
+    assert [v.id for v in stream] == ["1", "2"]
+
+
+def make_salary_vacancy(vacancy_id, salary):
+    return Vacancy(id=vacancy_id, name="Developer", area={}, url="http://example.com", salary=salary)
+
+
+def test_salary_key_rules():
+    vacancy = make_salary_vacancy("1", {"from": 1000, "to": 3000})
+    assert vacancy.salary_bounds == (1000, 3000)
+    assert vacancy.salary_key() == 3000
+    assert vacancy.salary_key("mid") == 2000
+    assert vacancy.salary_key("min") == 1000
+    assert make_salary_vacancy("2", {"from": 1500}).salary_key("min") == 1500
+    assert make_salary_vacancy("3", None).salary_key() is None
+    with pytest.raises(ValueError):
+        vacancy.salary_key("avg")
+
+
+def test_top_by_salary():
+    vacancies = [
+        make_salary_vacancy("1", {"from": 1000, "to": 3000}),
+        make_salary_vacancy("2", {"from": 2500}),
+        make_salary_vacancy("3", None),
+        make_salary_vacancy("4", {"to": 2800}),
+    ]
+    assert [v.id for v in Vacancy.top_by_salary(vacancies, 2)] == ["1", "4"]
+    assert [v.id for v in Vacancy.top_by_salary(iter(vacancies), 2, rank="mid")] == ["4", "2"]
+    assert [v.id for v in Vacancy.top_by_salary(vacancies, 10)] == ["1", "4", "2"]
+
+
+def test_salary_is_compared_in_rubles(monkeypatch):
+    converter = CurrencyConverter(StaticRateProvider({"USD": 100.0}))
+    monkeypatch.setattr("src.currency._default_converter", converter)
+    dollars = make_salary_vacancy("1", {"from": 1000, "to": 2000, "currency": "USD"})
+    rubles = make_salary_vacancy("2", {"from": 100000, "to": 150000, "currency": "RUR"})
+    assert dollars.salary == (1000, 2000)
+    assert dollars.salary_bounds == (100000, 200000)
+    assert dollars > rubles
+    assert [v.id for v in Vacancy.top_by_salary([rubles, dollars], 1)] == ["1"]
+    assert Vacancy(**dollars.to_dict()).salary_bounds == (100000, 200000)
+
+
 # if __name__ == '__main__':
 #     unittest.main()
+
+
+def test_cast_to_object_list_with_fields():
+    raw = {
+        "id": "1",
+        "name": "Python Developer",
+        "area": {"id": "1", "name": "Москва", "url": "https://api.hh.ru/areas/1"},
+        "alternate_url": "http://example.com",
+        "salary": {"from": 1000, "to": 2000, "currency": "USD"},
+        "snippet": {"requirement": "Python", "responsibility": "Code"},
+        "employer": {"name": "Company"},
+    }
+    vacancy = Vacancy.cast_to_object_list([raw], fields=["area.name"])[0]
+    assert vacancy.to_dict() == {
+        "id": "1",
+        "name": "Python Developer",
+        "area": {"name": "Москва"},
+        "url": "http://example.com",
+        "salary": (1000, 2000),
+        "description": None,
+        "snippet": {},
+        "currency": "USD",
+    }
+
+
+def test_from_records(capfd):
+    records = [
+        {"id": 1, "name": "Dev", "url": "http://x/1", "salary": [1000, 2000], "currency": "RUR", "source": "hh"},
+        {"id": 2, "name": "QA", "url": "http://x/2", "salary": 1500, "area": {"name": "Москва"}},
+    ]
+    first, second = Vacancy.from_records(records)
+    assert first.to_dict() == Vacancy(**dict(records[0], area={})).to_dict()
+    assert first.kwargs == {"source": "hh"}
+    assert second.salary_bounds == (1500, 1500)
+    assert second.area == {"name": "Москва"}
+    assert second > Vacancy.from_records([{"name": "Junior", "url": "http://x/3", "salary": 500}])[0]
+    assert capfd.readouterr().out == ""
+
+
+def test_from_records_validates_whole_batch():
+    records = [
+        {"id": 1, "name": "Dev", "url": "http://x/1"},
+        {"id": 2, "name": "", "url": "http://x/2"},
+        {"id": 3, "name": "QA"},
+    ]
+    with pytest.raises(ValueError, match=r"\[1, 2\]"):
+        Vacancy.from_records(iter(records))
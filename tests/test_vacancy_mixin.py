@@ -1,3 +1,4 @@
+import logging
 from unittest.mock import MagicMock
 
 import pytest
@@ -35,20 +36,30 @@ def test_vacancy_mixin_repr():
     assert repr(vacancy) == expected_repr
 
 
-def test_vacancy_mixin_init_prints_repr(capfd):
-    vacancy = TestVacancy(
-        id="1",
-        name="Software Engineer",
-        area={"name": "Moscow"},
-        url="http://example.com",
-        salary={"from": 1000, "to": 2000},
-        description="A great job",
-        snippet={"requirement": "Experience with Python", "responsibility": "Develop applications"},
-    )
+def test_vacancy_mixin_init_is_quiet(capfd, caplog):
+    """Создание объекта ничего не печатает, repr пишется в лог только на уровне DEBUG."""
+    def make():
+        return TestVacancy(
+            id="1",
+            name="Software Engineer",
+            area={"name": "Moscow"},
+            url="http://example.com",
+            salary={"from": 1000, "to": 2000},
+            description="A great job",
+            snippet={"requirement": "Experience with Python", "responsibility": "Develop applications"},
+        )
+
     expected_repr = (
         "TestVacancy(1, Software Engineer, {'name': 'Moscow'}, "
         "{'from': 1000, 'to': 2000}, A great job, "
-        "{'requirement': 'Experience with Python', 'responsibility': 'Develop applications'})\n"
+        "{'requirement': 'Experience with Python', 'responsibility': 'Develop applications'})"
     )
-    captured = capfd.readouterr()
-    assert captured.out == expected_repr
+    make()
+    assert capfd.readouterr().out == ""
+    assert caplog.records == []
+
+    with caplog.at_level(logging.DEBUG, logger="src.vacancy_mixin"):
+        make()
+    assert capfd.readouterr().out == ""
+    assert caplog.records[0].getMessage() == f"Создана вакансия {expected_repr}"
+    assert caplog.records[0].vacancy_id == "1"
@@ -0,0 +1,60 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.currency import CurrencyConverter, StaticRateProvider  # noqa: E402
+from src.vacancy import Vacancy  # noqa: E402
+from src.vacancy_table import VacancyTable  # noqa: E402
+
+
+@pytest.fixture
+def raw_items():
+    return [
+        {"id": "1", "area": {"id": "1"}, "salary": {"from": 1000, "to": 2000, "currency": "RUR"}},
+        {"id": "2", "area": {"id": "2"}, "salary": {"from": 3000, "to": None, "currency": "USD"}},
+        {"id": "3", "area": {"id": "1"}, "salary": None},
+        {"id": "4", "area": {"id": "1"}, "salary": {"from": None, "to": 1500, "currency": "RUR"}},
+        {"id": "5", "area": {}, "salary": {"from": 500, "to": 5000, "currency": "RUR"}},
+    ]
+
+
+def ids(table, selection):
+    return [row["id"] for row in table.rows(selection)]
+
+
+def test_from_raw_columns(raw_items):
+    table = VacancyTable.from_raw(raw_items)
+    assert len(table) == 5
+    assert table.salary_from[0] == 1000 and np.isnan(table.salary_to[1])
+    assert list(table.area_id) == [1, 2, 1, 1, -1]
+    assert ids(table, table.currency_mask("USD")) == ["2"]
+
+
+def test_from_raw_converts_to_rubles(raw_items):
+    converter = CurrencyConverter(StaticRateProvider({"USD": 100.0}))
+    table = VacancyTable.from_raw(raw_items, converter=converter)
+    assert table.salary_from[1] == 300000
+    assert table.salary_to[0] == 2000
+
+
+def test_top_n_by_max_and_mid(raw_items):
+    table = VacancyTable.from_raw(raw_items)
+    # 3000 USD после пересчета в рубли дороже любой рублевой зарплаты
+    assert ids(table, table.top_n(2)) == ["2", "5"]
+    assert ids(table, table.top_n(10, rank="mid")) == ["2", "5", "1", "4"]
+    assert ids(table, table.top_n(0)) == []
+    with pytest.raises(ValueError):
+        table.top_n(1, rank="avg")
+
+
+def test_salary_range_masks(raw_items):
+    table = VacancyTable.from_raw(raw_items)
+    assert ids(table, table.salary_range_mask(1000, 2000)) == ["1", "4"]
+    assert ids(table, table.salary_range_mask(1800, 2500, mode="overlaps")) == ["1", "5"]
+    assert ids(table, table.salary_range_mask(1000, 2000) & table.area_mask(1)) == ["1", "4"]
+
+
+def test_from_vacancies(sample_vacancy, vacancy_data):
+    vacancies = [sample_vacancy, Vacancy(**vacancy_data), Vacancy(id=1, name="Dev", area={}, url="http://x", salary=0)]
+    table = VacancyTable.from_vacancies(vacancies)
+    assert [v.id for v in table.rows(table.top_n(5))] == [124, 123]
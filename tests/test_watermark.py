@@ -0,0 +1,38 @@
+from src.watermark import WatermarkStore, parse_published_at
+
+
+def test_parse_published_at():
+    assert parse_published_at("2024-01-15T10:30:00+0300").hour == 10
+    assert parse_published_at("") is None
+    assert parse_published_at("вчера") is None
+
+
+def test_watermark_store(tmp_path):
+    path = tmp_path / "data" / "watermarks.json"
+    store = WatermarkStore(str(path))
+    assert store.get("Python") is None
+    store.set("Python", None, "2024-01-15T10:30:00+0300")
+    store.set("Python", "1", "2024-01-16T10:30:00+0300")
+    # Более ранняя дата (с учетом часового пояса) отметку не сдвигает
+    store.set("Python", None, "2024-01-15T07:00:00+0000")
+    store.set("Python", None, "2024-01-15T09:00:00+0300")
+    assert WatermarkStore(str(path)).load() == {
+        "Python": "2024-01-15T10:30:00+0300",
+        "Python;1": "2024-01-16T10:30:00+0300",
+    }
+
+
+def test_watermark_store_corrupt_file(tmp_path):
+    path = tmp_path / "watermarks.json"
+    path.write_text("[", encoding="utf-8")
+    store = WatermarkStore(str(path))
+    assert store.load() == {}
+    store.set("Python", None, "2024-01-15T10:30:00+0300")
+    assert store.get("Python") == "2024-01-15T10:30:00+0300"
+
+
+def test_watermark_store_update(tmp_path):
+    store = WatermarkStore(str(tmp_path / "watermarks.json"))
+    store.set("Python", None, "2024-01-15T10:30:00+0300")
+    store.update({("Python", None): "2024-01-14T10:30:00+0300", ("Java", "2"): "2024-01-16T10:30:00+0300"})
+    assert store.load() == {"Python": "2024-01-15T10:30:00+0300", "Java;2": "2024-01-16T10:30:00+0300"}